@@ -0,0 +1,67 @@
+"""Compare the bencode scanner with the full decode + re-encode path it replaced.
+
+Usage (from the repository root, with the project dependencies installed):
+
+    python -m benchmarks.bench_bencode_scanner --files 2000 --runs 50
+"""
+import argparse
+import hashlib
+import os
+import timeit
+
+import bencodepy
+
+from stream_fusion.utils.torrent.bencode_scanner import scan_torrent
+
+
+def build_season_pack(file_count: int) -> bytes:
+    files = [
+        {
+            "length": 1_500_000_000 + index,
+            "path": [f"Season {index // 100 + 1:02d}", f"Show.S{index // 100 + 1:02d}E{index % 100 + 1:02d}.MULTi.1080p.WEB.x264-GRP.mkv"],
+        }
+        for index in range(file_count)
+    ]
+    piece_count = max(1, sum(entry["length"] for entry in files) // (16 * 1024 * 1024))
+    torrent = {
+        "announce": "https://tracker.example.org/announce",
+        "announce-list": [["https://tracker.example.org/announce"], ["udp://tracker.example.net:6969"]],
+        "info": {
+            "name": "Show.Complete.MULTi.1080p.WEB.x264-GRP",
+            "piece length": 16 * 1024 * 1024,
+            "pieces": os.urandom(20 * min(piece_count, 50_000)),
+            "files": files,
+        },
+    }
+    return bencodepy.encode(torrent)
+
+
+def legacy(data: bytes) -> str:
+    metadata = bencodepy.decode(data)
+    return hashlib.sha1(bencodepy.encode(metadata[b"info"])).hexdigest()
+
+
+def scanner(data: bytes) -> str:
+    return scan_torrent(data).info_hash
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="files in the synthetic season pack")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    data = build_season_pack(args.files)
+    assert legacy(data) == scanner(data), "info hashes differ"
+    print(f".torrent size: {len(data) / 1024:.0f} KiB, {args.files} files")
+
+    results = {}
+    for name, func in (("decode + re-encode", legacy), ("scanner", scanner)):
+        best = min(timeit.repeat(lambda: func(data), number=args.runs, repeat=5)) / args.runs
+        results[name] = best
+        print(f"{name:>20}: {best * 1000:8.2f} ms per torrent")
+    print(f"{'speedup':>20}: {results['decode + re-encode'] / results['scanner']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare scan_title and KeywordMatcher with the per-pattern regex loops they replaced.
+
+The corpus is synthetic: release names built from a pool of show names,
+language tags, qualities and French release groups, so that every pattern
+family gets hits and misses.
+
+Usage (from the repository root, with the project dependencies installed):
+
+    python -m benchmarks.bench_tag_scanner --titles 100000
+"""
+import argparse
+import random
+import re
+import time
+
+from stream_fusion.constants import FR_RELEASE_GROUPS, FRENCH_PATTERNS, LANGUAGE_PATTERNS
+from stream_fusion.utils.parser.tag_scanner import KeywordMatcher, scan_title
+
+SHOWS = ["The.Office", "Dark", "Les.Revenants", "Breaking.Bad", "Lupin", "Engrenages", "Kaamelott", "Severance"]
+LANGUAGES = ["MULTi", "FRENCH", "TRUEFRENCH", "VFF", "VFQ", "VF2", "VOSTFR", "ENG", "SUBFRENCH", "VOF", "DUAL", ""]
+QUALITIES = ["1080p.WEB", "2160p.BluRay", "720p.HDTV", "1080p.WEBRip", "480p.DVDRip", "2160p.WEB-DL.HDR"]
+GROUPS = ["QTZ", "Tsundere-Raws", "SHiNiGAMiUHD", "FRATERNiTY", "GHT", "EXTREME", "NoTag", "RARBG", "FLUX", "NTb"]
+KEYWORDS = ["CAM", "TeleSync", "HDTV", "3D", "SCREENER"]
+
+
+def build_corpus(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        season, episode = rng.randint(1, 9), rng.randint(1, 24)
+        parts = [rng.choice(SHOWS), f"S{season:02d}E{episode:02d}", rng.choice(LANGUAGES), rng.choice(QUALITIES)]
+        separator = rng.choice([".", " ", "."])
+        title = separator.join(part for part in parts if part)
+        titles.append(f"{title}-{rng.choice(GROUPS)}")
+    return titles
+
+
+def legacy_scan(title: str, keywords) -> tuple:
+    languages = [
+        language for language, pattern in LANGUAGE_PATTERNS.items()
+        if re.search(pattern, title, re.IGNORECASE)
+    ]
+    french_tag = None
+    for tag, pattern in FRENCH_PATTERNS.items():
+        if re.search(pattern, title, re.IGNORECASE):
+            french_tag = tag
+            break
+    group_match = re.search("|".join(FR_RELEASE_GROUPS), title)
+    title_upper = title.upper()
+    excluded = any(keyword in title_upper for keyword in keywords)
+    return tuple(languages), french_tag, group_match.group(0) if group_match else None, excluded
+
+
+def scanner_scan(title: str, matcher: KeywordMatcher) -> tuple:
+    tags = scan_title(title)
+    return tags.languages, tags.french_tag, tags.release_group, matcher.find(title) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100000, help="titles in the synthetic corpus")
+    args = parser.parse_args()
+
+    titles = build_corpus(args.titles)
+    keywords = {keyword.upper() for keyword in KEYWORDS}
+    matcher = KeywordMatcher(keywords)
+
+    results = {}
+    for name, scan in (("regex loops", lambda title: legacy_scan(title, keywords)),
+                       ("scanner", lambda title: scanner_scan(title, matcher))):
+        started = time.perf_counter()
+        results[name] = [scan(title) for title in titles]
+        elapsed = time.perf_counter() - started
+        print(f"{name:>12}: {elapsed:7.2f} s for {len(titles)} titles ({elapsed / len(titles) * 1e6:6.1f} us/title)")
+        results[f"{name} time"] = elapsed
+
+    assert results["regex loops"] == results["scanner"], "scanner and regex loops disagree"
+    print(f"{'speedup':>12}: {results['regex loops time'] / results['scanner time']:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
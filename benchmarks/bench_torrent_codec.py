@@ -0,0 +1,73 @@
+"""Compare the TorrentItem codec with the to_dict + jsonpickle path it replaced.
+
+The legacy decode rebuilds ParsedData with full pydantic validation, as
+from_dict did before the codec existed.
+
+Usage (from the repository root, with the project dependencies installed):
+
+    python -m benchmarks.bench_torrent_codec --items 500 --runs 20
+"""
+import argparse
+import timeit
+
+import jsonpickle
+from RTN import parse
+from RTN.models import ParsedData
+
+from stream_fusion.utils.torrent.torrent_codec import decode_items, encode_items
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+
+def build_items(count: int) -> list:
+    items = []
+    for index in range(count):
+        title = f"Show.Name.S{index % 6 + 1:02d}E{index % 24 + 1:02d}.MULTi.1080p.WEB.x264-GRP{index}"
+        item = TorrentItem(
+            raw_title=title, size=1_500_000_000, magnet=f"magnet:?xt=urn:btih:{index:040x}",
+            info_hash=f"{index:040x}", link=None, seeders=index % 50, languages=["multi"],
+            indexer="Jackett", privacy="public", type="series", parsed_data=parse(title),
+        )
+        item.trackers = ["udp://tracker.example.net:6969"]
+        items.append(item)
+    return items
+
+
+def legacy_encode(items) -> str:
+    return jsonpickle.encode([item.to_dict() for item in items])
+
+
+def legacy_decode(data: str) -> list:
+    items = []
+    for value in jsonpickle.decode(data):
+        item = TorrentItem.from_dict(value)
+        item.parsed_data = ParsedData(**value["parsed_data"])
+        items.append(item)
+    return items
+
+
+def best_of(func, runs: int) -> float:
+    return min(timeit.repeat(func, number=runs, repeat=5)) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500, help="items in the cached list")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    items = build_items(args.items)
+    legacy_data, codec_data = legacy_encode(items), encode_items(items)
+    assert [item.to_dict() for item in decode_items(codec_data)] == [item.to_dict() for item in items]
+    print(f"payload: jsonpickle {len(legacy_data) / 1024:.0f} KiB, codec {len(codec_data) / 1024:.0f} KiB")
+
+    for operation, legacy, codec in (
+        ("encode", lambda: legacy_encode(items), lambda: encode_items(items)),
+        ("decode", lambda: legacy_decode(legacy_data), lambda: decode_items(codec_data)),
+    ):
+        legacy_time, codec_time = best_of(legacy, args.runs), best_of(codec, args.runs)
+        print(f"{operation:>8}: jsonpickle {legacy_time * 1000:8.2f} ms, codec {codec_time * 1000:8.2f} ms "
+              f"({legacy_time / codec_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
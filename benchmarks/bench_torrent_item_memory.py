@@ -0,0 +1,124 @@
+"""Compare the peak RSS of a cold search with the __slots__ TorrentItem and the layout it replaced.
+
+Each variant runs in its own process so that peaks do not overlap. The
+simulated search builds the items, keeps the third of them that survive the
+season filter (the only ones whose parsed_data is read) and serialises all of
+them with to_dict() as the media cache does.
+
+Usage (from the repository root, with the project dependencies installed):
+
+    python -m benchmarks.bench_torrent_item_memory --items 2000
+"""
+import argparse
+import multiprocessing
+import resource
+
+from RTN import parse
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+
+class LegacyTorrentItem:
+    """TorrentItem as it was before __slots__: __dict__, logger, eager parse, list files."""
+
+    def __init__(self, raw_title, size, magnet, info_hash, link, seeders, languages, indexer,
+                 privacy, type=None, parsed_data=None, torrent_download=None, tmdb_id=None):
+        self.logger = logger
+        self.raw_title = raw_title
+        self.size = size
+        self.magnet = magnet
+        self.info_hash = info_hash
+        self.link = link
+        self.seeders = seeders
+        self.languages = languages
+        self.indexer = indexer
+        self.type = type
+        self.privacy = privacy
+        self.tmdb_id = tmdb_id
+        self.file_name = None
+        self.files = None
+        self.torrent_download = torrent_download
+        self.trackers = []
+        self.file_index = None
+        self.full_index = None
+        self.availability = False
+        self.parsed_data = parsed_data if parsed_data is not None else parse(raw_title)
+
+    def to_dict(self):
+        return {
+            **{key: value for key, value in self.__dict__.items() if key not in ("logger", "parsed_data")},
+            "parsed_data": self.parsed_data.model_dump(),
+        }
+
+
+def build_rows(count: int) -> list:
+    rows = []
+    for index in range(count):
+        season = index % 6 + 1
+        title = f"Show.Name.S{season:02d}E{index % 24 + 1:02d}.MULTi.1080p.WEB.x264-GRP{index}"
+        files = None
+        if index % 5 == 0:
+            # Un pack de saison sur cinq, avec son index de fichiers
+            title = f"Show.Name.S{season:02d}.MULTi.1080p.WEB.x264-GRP{index}"
+            files = [
+                {"path": [f"Show.Name.S{season:02d}E{episode:02d}.MULTi.1080p.WEB.x264-GRP{index}.mkv"],
+                 "length": 1_500_000_000 + episode}
+                for episode in range(1, 25)
+            ]
+        rows.append((title, season, files))
+    return rows
+
+
+def simulate_search(item_class, rows) -> int:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    items = []
+    for index, (title, season, files) in enumerate(rows):
+        item = item_class(
+            raw_title=title, size=1_500_000_000, magnet=f"magnet:?xt=urn:btih:{index:040x}",
+            info_hash=f"{index:040x}", link=None, seeders=index % 50, languages=["multi"],
+            indexer="Jackett", privacy="public", type="series",
+        )
+        if files is not None:
+            item.files = files
+            item.full_index = [
+                {"file_index": position, "file_name": entry["path"][-1], "full_path": entry["path"][-1],
+                 "size": entry["length"], "seasons": [season], "episodes": [position]}
+                for position, entry in enumerate(files, start=1)
+            ]
+        items.append(item)
+
+    kept = [item for item, (_, season, _) in zip(items, rows) if season in (1, 2)]
+    for item in kept:
+        item.parsed_data.resolution
+    blob = [item.to_dict() for item in items]
+    assert len(blob) == len(rows)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+def run(variant: str, count: int, queue) -> None:
+    rows = build_rows(count)
+    item_class = TorrentItem if variant == "slots" else LegacyTorrentItem
+    queue.put(simulate_search(item_class, rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000, help="results returned by the search")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for variant in ("legacy", "slots"):
+        queue = context.Queue()
+        process = context.Process(target=run, args=(variant, args.items, queue))
+        process.start()
+        results[variant] = queue.get()
+        process.join()
+        print(f"{variant:>8}: peak RSS +{results[variant] / 1024:7.1f} MiB for {args.items} items")
+    if results["slots"]:
+        print(f"{'ratio':>8}: {results['legacy'] / results['slots']:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
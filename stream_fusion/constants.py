@@ -119,6 +119,15 @@ FRENCH_PATTERNS = {
     "MULTI": r"\b(?:MULTI)\b",
 }
 
+# Langues détectées dans les titres. Comme FRENCH_PATTERNS, chaque motif ne doit
+# reconnaître que des mots entiers (\w+) : tag_scanner les teste mot par mot.
+LANGUAGE_PATTERNS = {
+    "fr": r"\b(?:FR(?:ench|a|e|anc[eê]s)?|V(?:O?F(?:F|I|i)?|O?Q)|TRUEFRENCH|VOST(?:FR)?|SUBFRENCH)\b",
+    "en": r"\b(?:EN(?:G(?:LISH)?)?|VOST(?:EN)?|SUBBED)\b",
+    "multi": r"\b(?:MULTI(?:LANG(?:UE)?)?|DUAL(?:AUDIO)?|VF2)\b",
+}
+
+
 class CustomException(Exception):
     def __init__(self, status_code: int, message: Any):
         self.status_code = status_code
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from fastapi import Depends
 from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone, timedelta
 
@@ -28,6 +30,56 @@ class TorrentItemDAO:
                 if "duplicate key value violates unique constraint" not in str(e):
                     logger.error(f"TorrentItemDAO: Error creating TorrentItem: {str(e)}")
 
+    async def create_torrent_items(self, items: List[tuple[str, TorrentItem]], chunk_size: int = 500) -> int:
+        """Insert (id, TorrentItem) pairs with INSERT ... ON CONFLICT DO NOTHING, returns the rows inserted."""
+        table = TorrentItemModel.__table__
+        # Un VALUES multi-lignes envoie NULL tel quel : on reprend nous-mêmes les défauts Python (trackers, availability)
+        defaults = {
+            column.name: column.default.arg for column in table.columns
+            if column.default is not None and column.default.is_scalar
+        }
+        required = [
+            column.name for column in table.columns
+            if not column.nullable and not column.primary_key
+        ]
+        rows = {}
+        for item_id, torrent_item in items:
+            model = TorrentItemModel.from_torrent_item(torrent_item)
+            model.id = item_id
+            row = {}
+            for column in table.columns:
+                value = getattr(model, column.name)
+                if value is None and column.name in defaults:
+                    value = defaults[column.name]
+                row[column.name] = value
+            missing = [name for name in required if row[name] is None]
+            if missing:
+                logger.debug(f"TorrentItemDAO: Skipping TorrentItem {item_id} without {', '.join(missing)}")
+                continue
+            rows.setdefault(item_id, row)
+        if not rows:
+            return 0
+
+        rows = list(rows.values())
+        inserted = 0
+        async with self.session.begin():
+            for start in range(0, len(rows), chunk_size):
+                query = (
+                    insert(TorrentItemModel)
+                    .values(rows[start:start + chunk_size])
+                    .on_conflict_do_nothing(index_elements=["id"])
+                )
+                # Un SAVEPOINT par chunk : un chunk en échec n'annule pas ceux déjà insérés
+                try:
+                    async with self.session.begin_nested():
+                        result = await self.session.execute(query)
+                except DBAPIError as e:
+                    logger.error(f"TorrentItemDAO: Error bulk creating {len(rows[start:start + chunk_size])} TorrentItems: {str(e)}")
+                    continue
+                inserted += max(result.rowcount, 0)
+        logger.debug(f"TorrentItemDAO: Inserted {inserted} of {len(rows)} TorrentItems")
+        return inserted
+
     async def get_all_torrent_items(self, limit: int, offset: int) -> List[TorrentItemModel]:
         async with self.session.begin():
             try:
@@ -55,6 +107,20 @@ class TorrentItemDAO:
                 logger.error(f"TorrentItemDAO: Error retrieving TorrentItem {item_id}: {str(e)}")
                 return None
 
+    async def get_torrent_items_by_ids(self, item_ids: List[str]) -> dict[str, TorrentItemModel]:
+        if not item_ids:
+            return {}
+        async with self.session.begin():
+            try:
+                query = select(TorrentItemModel).where(TorrentItemModel.id.in_(item_ids))
+                result = await self.session.execute(query)
+                items = {item.id: item for item in result.scalars().all()}
+                logger.debug(f"TorrentItemDAO: Retrieved {len(items)} of {len(item_ids)} TorrentItems by id")
+                return items
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error retrieving TorrentItems by id: {str(e)}")
+                return {}
+
     async def update_torrent_item(self, item_id: str, torrent_item: TorrentItem) -> TorrentItemModel:
         async with self.session.begin():
             try:
@@ -66,7 +132,7 @@ class TorrentItemDAO:
                     logger.warning(f"TorrentItemDAO: TorrentItem not found for update: {item_id}")
                     return None
 
-                for key, value in torrent_item.__dict__.items():
+                for key, value in torrent_item.attributes().items():
                     if key == 'size' and value is not None:
                         try:
                             value = int(value)
@@ -82,7 +82,7 @@ class TorrentItemModel(Base):
     @classmethod
     def from_torrent_item(cls, torrent_item: TorrentItem):
         model_dict = {}
-        for attr, value in torrent_item.__dict__.items():
+        for attr, value in torrent_item.attributes().items():
             if hasattr(cls, attr):
                 if attr == 'size':
                     model_dict[attr] = cls._parse_size(value)
@@ -120,7 +120,7 @@ class TorrentItemModel(Base):
 
     def to_torrent_item(self):
         from RTN.models import ParsedData
-        from RTN import parse
+        from stream_fusion.utils.parser.title_cache import parse_title
         from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
         torrent_item_dict = {}
@@ -140,10 +140,10 @@ class TorrentItemModel(Base):
                             torrent_item_dict[attr] = ParsedData(**value)
                         except Exception:
                             # If parsing dict fails, reparse from raw_title
-                            torrent_item_dict[attr] = parse(raw_title) if raw_title else None
+                            torrent_item_dict[attr] = parse_title(raw_title) if raw_title else None
                     else:
                         # If it's a string or other type, reparse from raw_title
-                        torrent_item_dict[attr] = parse(raw_title) if raw_title else None
+                        torrent_item_dict[attr] = parse_title(raw_title) if raw_title else None
                 else:
                     torrent_item_dict[attr] = value
 
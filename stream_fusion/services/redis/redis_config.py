@@ -24,6 +24,11 @@ def create_redis_cache():
 def get_redis_cache():
     return create_redis_cache()
 
+# Long-lived Redis cache for background jobs that outlive the request
+@lru_cache()
+def get_background_redis_cache():
+    return create_redis_cache()
+
 # Async generator for Redis cache dependency
 async def get_redis_cache_dependency():
     redis_cache = get_redis_cache()
@@ -144,6 +144,45 @@ class Settings(BaseSettings):
     redis_db: int = 5
     redis_expiration: int = 604800  # 7 jours
     redis_password: str | None = None
+    single_flight_lock_timeout: int = 60
+    single_flight_wait_timeout: float = 30.0
+
+    # DEBRID
+    debrid_availability_timeout: float = 15.0  # secondes accordées à chaque service pour sa vérification de disponibilité
+    debrid_availability_ttl: int = 3600  # hash en cache chez un service, partagé entre utilisateurs
+    debrid_availability_negative_ttl: int = 300  # hash absent du cache d'un service
+    debrid_client_idle_ttl: int = 1800  # client debrid d'un compte gardé en mémoire sans utilisation
+    debrid_client_max: int = 2000  # clients debrid gardés au maximum par worker
+    debrid_torrent_list_ttl: int = 30  # liste des torrents d'un compte réutilisée entre deux lectures
+    debrid_breaker_failures: int = 5  # échecs consécutifs avant de ne plus appeler un service
+    debrid_breaker_cooldown: int = 30  # secondes sans appeler le service une fois le circuit ouvert
+
+    # RATE LIMITING
+    rate_limit_max_wait: float = 10.0  # au-delà, la requête vers le service est abandonnée plutôt que mise en attente
+
+    # CACHE (stale-while-revalidate)
+    stream_cache_soft_ttl: int = 1200  # 20 minutes
+    stream_cache_stremthru_soft_ttl: int = 600
+    stream_cache_hard_ttl: int = 21600  # 6 heures
+    media_cache_soft_ttl: int = 86400  # 1 jour, le TTL dur reste redis_expiration
+    candidate_cache_soft_ttl: int = 3600  # candidats filtrés partagés entre utilisateurs
+    swr_refresh_lock_ttl: int = 180
+    metrics_flush_interval: int = 15
+    title_cache_size: int = 50000  # titres analysés gardés en mémoire par worker
+    title_cache_expiration: int = 2592000  # 30 jours dans Redis
+    title_match_cache_size: int = 100000  # comparaisons titre du média / titre d'un résultat gardées par worker
+
+    # PREFETCH
+    prefetch_enabled: bool = True
+    prefetch_workers: int = 2  # consommateurs par worker gunicorn
+    prefetch_cluster_concurrency: int = 8  # prefetchs simultanés sur tout le cluster
+    prefetch_queue_size: int = 200
+    prefetch_job_timeout: int = 60
+    prefetch_claim_ttl: int = 300
+    prefetch_max_loop_lag: float = 0.25  # secondes de retard de la boucle avant délestage
+    prefetch_max_lookahead: int = 4  # épisodes préchargés au maximum pendant un binge
+    prefetch_binge_window: int = 21600  # 6 heures d'historique de lecture
+    prefetch_binge_history_size: int = 20
 
     # TMDB
     tmdb_api_key: str | None = None
@@ -206,6 +245,29 @@ class Settings(BaseSettings):
     # PUBLIC_CACHE
     public_cache_url: str = "https://stremio-jackett-cacher.elfhosted.com/"
 
+    # SEARCH
+    search_time_budget: float = 15.0  # secondes pour interroger tous les indexeurs
+    search_partial_expiration: int = 900  # TTL Redis si des indexeurs ont été coupés
+    low_yield_backoff_base: int = 600  # 10 minutes, doublé à chaque recherche infructueuse
+    low_yield_backoff_max: int = 86400
+    torrent_download_host_concurrency: int = 4  # téléchargements .torrent simultanés par hôte
+    filter_offload_workers: int = 2  # processus de filtrage par worker gunicorn, 0 pour désactiver
+    filter_offload_threshold: int = 300  # en dessous, le filtrage reste sur la boucle asyncio
+    filter_offload_chunk_size: int = 250
+    result_batch_threshold: int = 100  # en dessous, le tri reste sur des listes (extra "columnar" requis)
+    filter_plan_cache_size: int = 128  # plans de filtrage compilés gardés par processus
+    filter_verdict_cache_size: int = 10000  # verdicts mémorisés par plan
+
+    # TORRENT FILES
+    torrent_blob_backend: str = "local"  # "local" ou "s3"
+    torrent_blob_dir: str = "/var/cache/torrents"
+    torrent_blob_max_mb: int = 2048  # au-delà, les .torrent les moins utilisés sont supprimés
+    torrent_blob_s3_endpoint: str | None = None  # ex: http://minio:9000
+    torrent_blob_s3_bucket: str = "stream-fusion"
+    torrent_blob_s3_access_key: str | None = None
+    torrent_blob_s3_secret_key: str | None = None
+    torrent_blob_s3_region: str = "us-east-1"
+
     # DEVELOPMENT
     debug: bool = False
     dev_host: str = "0.0.0.0"
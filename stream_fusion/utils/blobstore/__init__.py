@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from stream_fusion.settings import settings
+from stream_fusion.utils.blobstore.base import BlobStore
+from stream_fusion.utils.blobstore.local import LocalBlobStore
+from stream_fusion.utils.blobstore.s3 import S3BlobStore
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    if settings.torrent_blob_backend == "s3":
+        return S3BlobStore(
+            endpoint=settings.torrent_blob_s3_endpoint,
+            bucket=settings.torrent_blob_s3_bucket,
+            access_key=settings.torrent_blob_s3_access_key,
+            secret_key=settings.torrent_blob_s3_secret_key,
+            region=settings.torrent_blob_s3_region,
+        )
+    return LocalBlobStore(settings.torrent_blob_dir, settings.torrent_blob_max_mb * 1024 * 1024)
+
+
+__all__ = ["BlobStore", "LocalBlobStore", "S3BlobStore", "get_blob_store"]
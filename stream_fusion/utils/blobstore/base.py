@@ -0,0 +1,41 @@
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+INFO_HASH_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for .torrent files, keyed by info hash."""
+
+    chunk_size = 64 * 1024
+
+    @staticmethod
+    def normalize_key(info_hash: str) -> str:
+        key = (info_hash or "").lower()
+        if not INFO_HASH_PATTERN.match(key):
+            raise ValueError(f"Invalid info hash: {info_hash!r}")
+        return key
+
+    @abstractmethod
+    async def put(self, info_hash: str, data: bytes) -> None:
+        """Store data atomically, readers never see a partial file."""
+
+    @abstractmethod
+    async def exists(self, info_hash: str) -> bool:
+        pass
+
+    @abstractmethod
+    def stream(self, info_hash: str) -> AsyncIterator[bytes]:
+        """Yield the blob in chunks, nothing if it is not stored."""
+
+    @abstractmethod
+    def location(self, info_hash: str) -> str:
+        """Human readable location of the blob, for logs."""
+
+    async def get(self, info_hash: str) -> Optional[bytes]:
+        chunks = [chunk async for chunk in self.stream(info_hash)]
+        return b"".join(chunks) if chunks else None
+
+    async def close(self) -> None:
+        pass
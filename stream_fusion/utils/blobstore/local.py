@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import os
+import pathlib
+import tempfile
+from typing import AsyncIterator, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.blobstore.base import BlobStore
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs on local disk, sharded by the first bytes of the info hash.
+
+    ``ab/cd/abcd....torrent`` keeps directories small. Reads refresh the file
+    mtime, and once the store grows past ``max_bytes`` the least recently used
+    files are removed until it is back under 90% of the limit.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._evicting = False
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, info_hash: str) -> pathlib.Path:
+        key = self.normalize_key(info_hash)
+        return self.root / key[:2] / key[2:4] / f"{key}.torrent"
+
+    def location(self, info_hash: str) -> str:
+        return str(self._path(info_hash))
+
+    def _write(self, path: pathlib.Path, data: bytes) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous = path.stat().st_size if path.exists() else 0
+        # Écriture dans un fichier temporaire du même dossier puis renommage atomique
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+        return len(data) - previous
+
+    def _scan(self):
+        entries = []
+        for path in self.root.glob("*/*/*.torrent"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> int:
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                total -= size
+                removed += 1
+        logger.info(f"BlobStore: Evicted {removed} .torrent files, {total} bytes left")
+        return total
+
+    async def put(self, info_hash: str, data: bytes) -> None:
+        path = self._path(info_hash)
+        delta = await asyncio.to_thread(self._write, path, data)
+        if self._size is None:
+            self._size = sum(size for _, size, _ in await asyncio.to_thread(self._scan))
+        else:
+            self._size += delta
+        if self.max_bytes > 0 and self._size > self.max_bytes and not self._evicting:
+            self._evicting = True
+            try:
+                self._size = await asyncio.to_thread(self._evict)
+            finally:
+                self._evicting = False
+
+    async def exists(self, info_hash: str) -> bool:
+        return await asyncio.to_thread(self._path(info_hash).exists)
+
+    async def stream(self, info_hash: str) -> AsyncIterator[bytes]:
+        path = self._path(info_hash)
+        try:
+            f = await asyncio.to_thread(open, path, "rb")
+        except FileNotFoundError:
+            return
+        try:
+            # Marque le fichier comme récemment utilisé pour l'éviction LRU
+            await asyncio.to_thread(os.utime, path)
+            while True:
+                chunk = await asyncio.to_thread(f.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
@@ -0,0 +1,123 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from urllib.parse import quote, urlparse
+
+import aiohttp
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.blobstore.base import BlobStore
+
+EMPTY_PAYLOAD_HASH = hashlib.sha256(b"").hexdigest()
+
+
+class S3BlobStore(BlobStore):
+    """Blobs in an S3-compatible bucket (AWS, MinIO, Garage...), shared by every node.
+
+    Requests are signed with AWS Signature V4 and use path-style URLs, which
+    every S3-compatible server accepts. A PUT is atomic on the server side.
+    Eviction is left to the bucket's lifecycle rules.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        prefix: str = "torrents",
+    ):
+        self.endpoint = endpoint.rstrip("/")
+        self.host = urlparse(self.endpoint).netloc
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.prefix = prefix.strip("/")
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self._session
+
+    def _object_path(self, info_hash: str) -> str:
+        key = self.normalize_key(info_hash)
+        return f"/{self.bucket}/{self.prefix}/{key[:2]}/{key}.torrent"
+
+    def location(self, info_hash: str) -> str:
+        return f"s3:/{self._object_path(info_hash)}"
+
+    @staticmethod
+    def _hmac(key: bytes, message: str) -> bytes:
+        return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+    def _signed_headers(self, method: str, path: str, payload_hash: str) -> dict:
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+        canonical_uri = quote(path, safe="/")
+        headers = {
+            "host": self.host,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+        }
+        signed_headers = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+        canonical_request = "\n".join(
+            [method, canonical_uri, "", canonical_headers, signed_headers, payload_hash]
+        )
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+        signing_key = self._hmac(("AWS4" + self.secret_key).encode("utf-8"), date_stamp)
+        for part in (self.region, "s3", "aws4_request"):
+            signing_key = self._hmac(signing_key, part)
+        signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        headers["Authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        del headers["host"]
+        return headers
+
+    def _request(self, method: str, info_hash: str, data: bytes = None):
+        path = self._object_path(info_hash)
+        payload_hash = hashlib.sha256(data).hexdigest() if data is not None else EMPTY_PAYLOAD_HASH
+        headers = self._signed_headers(method, path, payload_hash)
+        return self._get_session().request(
+            method, f"{self.endpoint}{quote(path, safe='/')}", headers=headers, data=data
+        )
+
+    async def put(self, info_hash: str, data: bytes) -> None:
+        async with self._request("PUT", info_hash, data) as response:
+            if response.status >= 300:
+                body = await response.text()
+                raise RuntimeError(f"S3 PUT failed with {response.status}: {body[:200]}")
+
+    async def exists(self, info_hash: str) -> bool:
+        async with self._request("HEAD", info_hash) as response:
+            return response.status == 200
+
+    async def stream(self, info_hash: str) -> AsyncIterator[bytes]:
+        async with self._request("GET", info_hash) as response:
+            if response.status == 404:
+                return
+            if response.status >= 300:
+                logger.warning(f"BlobStore: S3 GET of {info_hash} failed with {response.status}")
+                return
+            async for chunk in response.content.iter_chunked(self.chunk_size):
+                yield chunk
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.rate_limiter import RateLimit, rate_limiter, retry_after_seconds
 
 
 class C411RawResult:
@@ -21,6 +22,7 @@ class C411RawResult:
 
 class C411API:
     TORZNAB_NS = {"torznab": "http://torznab.com/schemas/2015/feed"}
+    RATE_LIMIT = RateLimit(capacity=10, per_second=2)
 
     def __init__(self, session: Optional[aiohttp.ClientSession] = None, api_key: Optional[str] = None):
         self.base_url = settings.c411_url.rstrip("/") + "/api"
@@ -41,12 +43,18 @@ class C411API:
             return None
         # Torznab standard : apikey en query param (pas Bearer header)
         params["apikey"] = self.api_key
+        if not await rate_limiter.acquire("c411", self.api_key, self.RATE_LIMIT):
+            return None
         session = await self._get_session()
         try:
             async with session.get(
                 self.base_url, params=params, allow_redirects=True,
                 timeout=aiohttp.ClientTimeout(sock_read=2, total=5)
             ) as response:
+                if response.status == 429:
+                    await rate_limiter.penalize(
+                        "c411", self.api_key, self.RATE_LIMIT, retry_after_seconds(response.headers, 5)
+                    )
                 response.raise_for_status()
                 return await response.text()
         except aiohttp.ClientError as e:
@@ -7,6 +7,7 @@ from stream_fusion.utils.c411.c411_api import C411API
 from stream_fusion.utils.c411.c411_result import C411Result
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.parser.title_cache import title_cache
 
 
 class C411Service:
@@ -40,6 +41,7 @@ class C411Service:
 
         raw = await self.api.search_movie(tmdb_id=tmdb_id)
         logger.info(f"C411: {len(raw)} raw results for movie '{media.titles[0]}'")
+        await title_cache.warm(getattr(item, "raw_title", None) for item in raw or [])
         return self._build_results(raw, media)
 
     async def _search_series(self, media: Series) -> List[C411Result]:
@@ -52,6 +54,7 @@ class C411Service:
         # Recherche globale (sans saison/épisode) pour tout stocker en Postgres
         raw = await self.api.search_series(tmdb_id=tmdb_id)
         logger.info(f"C411: {len(raw)} raw results for '{media.titles[0]}' (global)")
+        await title_cache.warm(getattr(item, "raw_title", None) for item in raw or [])
         return self._build_results(raw, media)
 
     def _build_results(self, raw_results, media) -> List[C411Result]:
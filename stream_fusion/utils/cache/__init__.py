@@ -1,4 +1,7 @@
 from stream_fusion.utils.cache.cache_base import CacheBase
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.low_yield import LowYieldTracker
+from stream_fusion.utils.cache.single_flight import SingleFlight
+from stream_fusion.utils.cache.swr import BackgroundRefresher
 
-__all__ = ["CacheBase", "RedisCache"]
\ No newline at end of file
+__all__ = ["CacheBase", "RedisCache", "LowYieldTracker", "SingleFlight", "BackgroundRefresher"]
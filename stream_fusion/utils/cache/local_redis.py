@@ -5,7 +5,9 @@ import time
 from typing import Any, List
 import hashlib
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
 from stream_fusion.utils.cache.cache_base import CacheBase
@@ -188,6 +190,106 @@ class RedisCache(CacheBase):
 
         await self.execute_with_retry(set_operation)
 
+    async def get_swr(self, key: str, metric: str | None = "cache", raw: bool = False) -> tuple[Any, bool]:
+        """
+        Retrieve a value stored with set_swr.
+        Args:
+            key (str): The cache key.
+            metric (str | None): Prefix of the fresh/stale/miss counters, None to skip them.
+            raw (bool): Return the stored bytes instead of decoding them with jsonpickle.
+        Returns:
+            tuple[Any, bool]: The cached value (None on miss) and whether it is past its soft TTL.
+        """
+        async def get_swr_operation():
+            client = await self.get_redis_client()
+            try:
+                data, fresh_until = await client.hmget(key, "data", "fresh_until")
+            except ResponseError:
+                # Entry written before soft TTLs existed: serve it but refresh it
+                data, fresh_until = await client.get(key), 0
+            if not data:
+                return None, False
+            return data if raw else jsonpickle.decode(data), time.time() >= float(fresh_until or 0)
+
+        value, is_stale = await self.execute_with_retry(get_swr_operation)
+        if metric is None:
+            pass
+        elif value is None:
+            metrics.incr(f"{metric}.miss")
+        else:
+            metrics.incr(f"{metric}.stale" if is_stale else f"{metric}.fresh")
+        return value, is_stale
+
+    async def set_swr(self, key: str, value: Any, soft_ttl: int, hard_ttl: int, raw: bool = False) -> None:
+        """
+        Store a value that is served fresh for soft_ttl seconds, then stale until hard_ttl.
+        Args:
+            key (str): The cache key.
+            value (Any): The value to cache.
+            soft_ttl (int): Seconds after which the value should be refreshed.
+            hard_ttl (int): Seconds after which the value is evicted.
+            raw (bool): Store value, already encoded bytes, as is instead of using jsonpickle.
+        """
+        async def set_swr_operation():
+            client = await self.get_redis_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping={
+                    "data": value if raw else jsonpickle.encode(value),
+                    "fresh_until": time.time() + soft_ttl,
+                })
+                pipe.expire(key, max(hard_ttl, soft_ttl))
+                return await pipe.execute()
+
+        await self.execute_with_retry(set_swr_operation)
+
+    async def get_fields(self, key: str, fields: List[str]) -> dict:
+        """
+        Retrieve several fields of a hash written with set_fields.
+        Args:
+            key (str): The cache key.
+            fields (List[str]): The fields to read.
+        Returns:
+            dict: The decoded values of the fields that exist.
+        """
+        if not fields:
+            return {}
+
+        async def get_fields_operation():
+            client = await self.get_redis_client()
+            values = await client.hmget(key, fields)
+            return {
+                field: jsonpickle.decode(value)
+                for field, value in zip(fields, values)
+                if value is not None
+            }
+
+        return await self.execute_with_retry(get_fields_operation)
+
+    async def set_fields(self, key: str, mapping: dict, expiration: int = None) -> None:
+        """
+        Store several fields of a hash and reset its expiration.
+        Args:
+            key (str): The cache key.
+            mapping (dict): Field names and the values to cache.
+            expiration (int): Seconds before the whole hash is evicted.
+        """
+        if not mapping:
+            return
+        if expiration is None:
+            expiration = self.media_expiration
+
+        async def set_fields_operation():
+            client = await self.get_redis_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={
+                    field: jsonpickle.encode(value) for field, value in mapping.items()
+                })
+                pipe.expire(key, expiration)
+                return await pipe.execute()
+
+        await self.execute_with_retry(set_fields_operation)
+
     async def delete(self, key: str) -> bool:
         async def delete_operation():
             client = await self.get_redis_client()
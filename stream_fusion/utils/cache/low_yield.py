@@ -0,0 +1,104 @@
+import time
+from typing import List, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.metrics import metrics
+
+
+class LowYieldTracker:
+    """Exponential backoff for media whose searches keep returning too few results.
+
+    Each low-yield search is remembered as "searched at T, got K results"; the
+    indexers are not swept again for that media until the backoff expires. The
+    backoff doubles with every unsuccessful attempt, up to
+    ``low_yield_backoff_max``, and is forgotten as soon as a search is good enough.
+    """
+
+    KEY = "low_yield:{}:{}"
+
+    def __init__(self, redis_cache: RedisCache):
+        self.redis_cache = redis_cache
+
+    @classmethod
+    def key(cls, media_id: str, cache_key: str) -> str:
+        return cls.KEY.format(media_id, cache_key)
+
+    @staticmethod
+    def backoff(attempts: int) -> int:
+        return min(
+            settings.low_yield_backoff_base * 2 ** max(attempts - 1, 0),
+            settings.low_yield_backoff_max,
+        )
+
+    async def get(self, media_id: str, cache_key: str) -> Optional[dict]:
+        return await self.redis_cache.get(self.key(media_id, cache_key))
+
+    async def should_retry(self, media_id: str, cache_key: str) -> bool:
+        record = await self.get(media_id, cache_key)
+        if record is None or time.time() >= record["retry_at"]:
+            metrics.incr("low_yield.retried")
+            return True
+        metrics.incr("low_yield.skipped")
+        logger.info(
+            f"Search: Skipping re-search of {media_id}, {record['results']} results at last attempt "
+            f"({record['attempts']} attempts, retry in {record['retry_at'] - time.time():.0f}s)"
+        )
+        return False
+
+    async def record(self, media_id: str, cache_key: str, results: int, min_results: int) -> None:
+        key = self.key(media_id, cache_key)
+        if results >= min_results:
+            await self.redis_cache.delete(key)
+            return
+
+        now = time.time()
+        record = await self.redis_cache.get(key)
+        if record is not None and now < record["retry_at"]:
+            # Un autre worker vient déjà d'enregistrer cette recherche
+            return
+        attempts = record["attempts"] + 1 if record else 1
+        backoff = self.backoff(attempts)
+        await self.redis_cache.set(
+            key,
+            {
+                "media_id": media_id,
+                "cache_key": cache_key,
+                "searched_at": now,
+                "results": results,
+                "attempts": attempts,
+                "retry_at": now + backoff,
+            },
+            expiration=settings.low_yield_backoff_max * 2,
+        )
+        logger.info(
+            f"Search: Low yield for {media_id} ({results} < {min_results}), next search in {backoff}s"
+        )
+
+    async def list_records(self, media_id: str = "") -> List[dict]:
+        client = await self.redis_cache.get_redis_client()
+        pattern = self.KEY.format(media_id, "*") if media_id else self.KEY.format("*", "*")
+        records = []
+        async for key in client.scan_iter(match=pattern, count=500):
+            record = await self.redis_cache.get(key)
+            if record is not None:
+                records.append(record)
+        return records
+
+    async def force_refresh(self, media_id: str) -> List[str]:
+        """Forget the backoff of media_id (and its episodes) and drop the cached results.
+
+        The next request for the media then runs a full indexer search.
+        """
+        client = await self.redis_cache.get_redis_client()
+        refreshed = []
+        for record in await self.list_records(media_id):
+            cache_key = record["cache_key"]
+            keys = [self.key(record["media_id"], cache_key), cache_key]
+            async for candidate_key in client.scan_iter(match=f"candidates:{cache_key}:*", count=500):
+                keys.append(candidate_key)
+            await client.delete(*keys)
+            refreshed.append(record["media_id"])
+        logger.info(f"Search: Forced refresh of low-yield media {refreshed}")
+        return refreshed
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.exceptions import LockError
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+
+
+class SingleFlight:
+    """Cross-worker coalescing of identical expensive computations.
+
+    The first worker to take the Redis lock for a key runs ``compute`` (which is
+    expected to populate the cache itself). The other workers wait for the
+    leader's notification on a pub/sub channel and then read the result back
+    through ``load``. If the leader fails or the wait times out, followers fall
+    back to computing on their own.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        lock_timeout: int = None,
+        wait_timeout: float = None,
+    ):
+        self.redis_cache = redis_cache
+        self.lock_timeout = lock_timeout or settings.single_flight_lock_timeout
+        self.wait_timeout = wait_timeout or settings.single_flight_wait_timeout
+
+    @staticmethod
+    def _lock_name(key: str) -> str:
+        return f"lock:flight:{key}"
+
+    @staticmethod
+    def _channel(key: str) -> str:
+        return f"flight:done:{key}"
+
+    async def do(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        load: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Any:
+        try:
+            client = await self.redis_cache.get_redis_client()
+            lock = client.lock(self._lock_name(key), timeout=self.lock_timeout)
+            acquired = await lock.acquire(blocking=False)
+        except Exception as e:
+            logger.warning(f"SingleFlight: Redis unavailable for {key}, computing directly: {e}")
+            return await compute()
+
+        if acquired:
+            logger.debug(f"SingleFlight: Leading computation for {key}")
+            try:
+                return await compute()
+            finally:
+                # Release before publishing so a follower that sees no lock
+                # after subscribing knows the result is already stored.
+                try:
+                    await lock.release()
+                except LockError:
+                    logger.warning(f"SingleFlight: Lock for {key} expired before release")
+                try:
+                    await client.publish(self._channel(key), "done")
+                except Exception as e:
+                    logger.warning(f"SingleFlight: Failed to notify followers for {key}: {e}")
+
+        logger.info(f"SingleFlight: Waiting for another worker computing {key}")
+        if await self._wait_for_leader(client, key):
+            result = await load()
+            if result is not None:
+                logger.info(f"SingleFlight: Reusing result computed by another worker for {key}")
+                return result
+        logger.warning(f"SingleFlight: No shared result for {key}, computing locally")
+        return await compute()
+
+    async def _wait_for_leader(self, client, key: str) -> bool:
+        lock_name = self._lock_name(key)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(key))
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_timeout
+            while True:
+                # The lock disappears once the leader is done (or has crashed
+                # and the lock expired), in both cases stop waiting.
+                if not await client.exists(lock_name):
+                    return True
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=min(1.0, remaining)
+                )
+                if message is not None:
+                    return True
+        except Exception as e:
+            logger.warning(f"SingleFlight: Error while waiting for {key}: {e}")
+            return False
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except Exception:
+                pass
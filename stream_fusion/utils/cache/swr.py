@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.metrics import metrics
+
+
+class BackgroundRefresher:
+    """Deduplicated background refresh of stale cache entries.
+
+    A refresh is only started when no task for the same key is running in this
+    worker and no other worker holds the Redis refresh claim for it.
+    """
+
+    _tasks: Dict[str, asyncio.Task] = {}
+
+    def __init__(self, redis_cache: RedisCache):
+        self.redis_cache = redis_cache
+
+    @staticmethod
+    def _claim_key(key: str) -> str:
+        return f"lock:refresh:{key}"
+
+    async def schedule(self, key: str, refresh: Callable[[], Awaitable[None]]) -> bool:
+        if key in self._tasks:
+            metrics.incr("swr.refresh_deduplicated")
+            return False
+        try:
+            client = await self.redis_cache.get_redis_client()
+            claimed = await client.set(
+                self._claim_key(key), "1", nx=True, ex=settings.swr_refresh_lock_ttl
+            )
+        except Exception as e:
+            logger.warning(f"SWR: Unable to claim refresh for {key}: {e}")
+            return False
+        if not claimed:
+            metrics.incr("swr.refresh_deduplicated")
+            return False
+
+        logger.info(f"SWR: Serving stale entry {key}, refreshing in background")
+        self._tasks[key] = asyncio.create_task(self._run(key, refresh))
+        return True
+
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[None]]) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await refresh()
+            metrics.incr("swr.refresh_ok")
+            logger.debug(f"SWR: Refreshed {key} in {loop.time() - start:.2f}s")
+        except Exception as e:
+            metrics.incr("swr.refresh_failed")
+            logger.warning(f"SWR: Background refresh of {key} failed: {e}")
+        finally:
+            self._tasks.pop(key, None)
+            try:
+                await self.redis_cache.delete(self._claim_key(key))
+            except Exception:
+                # The claim expires on its own after swr_refresh_lock_ttl
+                pass
@@ -6,7 +6,7 @@ from urllib.parse import unquote
 from fastapi import HTTPException
 
 from stream_fusion.utils.debrid.base_debrid import BaseDebrid
-from stream_fusion.utils.general import season_episode_in_filename
+from stream_fusion.utils.general import get_info_hash_from_magnet, season_episode_in_filename
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
@@ -51,6 +51,9 @@ class AllDebrid(BaseDebrid):
         else:
             return {"Authorization": f"Bearer {self.config.get('ADToken')}"}
 
+    def rate_limit_account(self):
+        return settings.ad_token if settings.ad_unique_account else self.config.get("ADToken")
+
     async def add_magnet(self, magnet, ip=None):
         url = f"{self.base_url}magnet/upload?agent={self.agent}"
         data = {"magnets[]": magnet}
@@ -255,7 +258,9 @@ class AllDebrid(BaseDebrid):
         if torrent_download is not None:
             logger.info(f"AllDebrid: Downloading and adding .torrent file")
             try:
-                torrent_file = await self.download_torrent_file(torrent_download)
+                torrent_file = await self.download_torrent_file(
+                    torrent_download, get_info_hash_from_magnet(magnet) if magnet else None
+                )
                 upload_response = await self.add_torrent(torrent_file, ip)
 
                 if upload_response and upload_response.get("status") == "success":
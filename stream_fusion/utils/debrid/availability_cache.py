@@ -0,0 +1,153 @@
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+import orjson
+from redis.asyncio import Redis
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+
+# Valeur Redis d'un hash absent du cache du service
+NOT_CACHED = b"0"
+
+_UNKNOWN = object()
+# Le service n'a pas répondu pour le hash : ni en cache ni absent
+_FAILED = object()
+
+
+class AvailabilityCache:
+    """Instant availability of info hashes per debrid service, shared by every user.
+
+    Whether a hash is cached depends on the service, not on the account, so
+    the entries of get_availability_bulk responses are kept in Redis under
+    (service, info hash): cached hashes with the file lists the
+    TorrentSmartContainer needs, hashes that are not cached for a shorter
+    time. Only the hashes missing from Redis are sent to the service, and a
+    hash another request of this worker is already checking is awaited
+    instead of being asked again. Hashes the service did not answer are
+    neither written nor reported as not cached: the lookup returns them
+    apart, and answers None when no hash got an answer.
+    """
+
+    KEY = "debrid_availability:{}:{}"
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._client: Redis | None = None
+
+    def get_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+        return self._client
+
+    async def _read(self, service: str, hashes: List[str]) -> Dict[str, Optional[dict]]:
+        if not hashes:
+            return {}
+        try:
+            values = await self.get_client().mget([self.KEY.format(service, info_hash) for info_hash in hashes])
+        except Exception as e:
+            logger.warning(f"Debrid: Failed to read {len(hashes)} {service} availabilities from Redis: {e}")
+            return {}
+        return {
+            info_hash: None if value == NOT_CACHED else orjson.loads(value)
+            for info_hash, value in zip(hashes, values)
+            if value is not None
+        }
+
+    async def _write(self, service: str, entries: Dict[str, Optional[dict]]) -> None:
+        if not entries:
+            return
+        try:
+            async with self.get_client().pipeline(transaction=False) as pipe:
+                for info_hash, entry in entries.items():
+                    key = self.KEY.format(service, info_hash)
+                    if entry is None:
+                        pipe.set(key, NOT_CACHED, ex=settings.debrid_availability_negative_ttl)
+                    else:
+                        pipe.set(key, orjson.dumps(entry), ex=settings.debrid_availability_ttl)
+                await pipe.execute()
+        except Exception as e:
+            # Pas de nouvelle tentative : au pire le hash sera redemandé au service
+            logger.warning(f"Debrid: Failed to write {len(entries)} {service} availabilities to Redis: {e}")
+
+    async def _resolve(self, debrid, service: str, hashes: List[str], ip) -> Optional[Dict[str, Optional[dict]]]:
+        entries = await self._read(service, hashes)
+        missing = [info_hash for info_hash in hashes if info_hash not in entries]
+        metrics.incr("debrid_availability.hit", len(entries))
+        metrics.incr("debrid_availability.miss", len(missing))
+        if missing:
+            response = await debrid.get_availability_bulk(missing, ip)
+            if response is None:
+                metrics.incr("debrid_availability.failed")
+                return None
+            checked = debrid.split_availability(response, missing)
+            await self._write(service, checked)
+            entries.update(checked)
+            unanswered = debrid.unanswered_hashes(response)
+            entries.update({info_hash: _FAILED for info_hash in missing if info_hash.lower() in unanswered})
+        return entries
+
+    async def get_availability_bulk(self, debrid, hashes: List[str], ip=None) -> Tuple[object, Set[str]]:
+        """debrid.get_availability_bulk(hashes, ip), answered from the cache where possible.
+
+        Returns:
+            tuple: The response, None if no hash got an answer, and the hashes without an answer.
+        """
+        service = debrid.availability_cache_name()
+        if service is None:
+            response = await debrid.get_availability_bulk(hashes, ip)
+            if response is None:
+                return None, set(hashes)
+            unanswered = debrid.unanswered_hashes(response)
+            return response, {info_hash for info_hash in hashes if info_hash.lower() in unanswered}
+
+        loop = asyncio.get_running_loop()
+        owned, waiting = {}, {}
+        for info_hash in dict.fromkeys(hashes):
+            future = self._inflight.get((service, info_hash))
+            if future is None:
+                future = owned[info_hash] = self._inflight[(service, info_hash)] = loop.create_future()
+            else:
+                waiting[info_hash] = future
+        metrics.incr("debrid_availability.coalesced", len(waiting))
+
+        entries = None
+        try:
+            entries = await self._resolve(debrid, service, list(owned), ip)
+        finally:
+            # Même en cas d'erreur ou d'annulation, les requêtes qui attendent ces hashes sont libérées
+            for info_hash, future in owned.items():
+                self._inflight.pop((service, info_hash), None)
+                if not future.done():
+                    future.set_result(_FAILED if entries is None else entries.get(info_hash, _UNKNOWN))
+        if entries is None:
+            return None, set(hashes)
+
+        for info_hash, future in waiting.items():
+            # shield : un délai dépassé ici ne doit pas annuler la vérification d'une autre requête
+            entries[info_hash] = await asyncio.shield(future)
+        unanswered = {info_hash for info_hash, entry in entries.items() if entry is _FAILED}
+        if unanswered and len(unanswered) == len(entries):
+            return None, unanswered
+        if unanswered:
+            metrics.incr("debrid_availability.partial")
+
+        response = debrid.join_availability({
+            info_hash: entry for info_hash, entry in entries.items()
+            if entry is not None and entry is not _UNKNOWN and entry is not _FAILED
+        })
+        return response, unanswered
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+availability_cache = AvailabilityCache()
@@ -1,4 +1,3 @@
-from collections import deque
 import asyncio
 import time
 
@@ -7,6 +6,9 @@ from aiohttp_socks import ProxyConnector
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.blobstore import get_blob_store
+from stream_fusion.utils.debrid.circuit_breaker import CircuitBreaker
+from stream_fusion.utils.rate_limiter import RateLimit, rate_limiter, retry_after_seconds
 
 
 class BaseDebrid:
@@ -16,14 +18,14 @@ class BaseDebrid:
         self._external_session = session is not None
         self._session = session
 
-        # Rate limiters
-        self.global_limit = 250
-        self.global_period = 60
-        self.torrent_limit = 1
-        self.torrent_period = 1
+        # Limites partagées entre workers et requêtes, par service et par compte
+        self.global_limit = RateLimit(capacity=250, per_second=250 / 60)
+        self.torrent_limit = RateLimit(capacity=1, per_second=1)
 
-        self.global_requests = deque()
-        self.torrent_requests = deque()
+        # État gardé d'une requête à l'autre, le client étant partagé par debrid_clients
+        self.circuit_breaker = CircuitBreaker(self.rate_limit_name)
+        self._torrent_list = None
+        self._torrent_list_expires = 0.0
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session with optional proxy support."""
@@ -45,37 +47,63 @@ class BaseDebrid:
         if self._session and not self._external_session and not self._session.closed:
             await self._session.close()
 
-    async def _rate_limit(self, requests_queue, limit, period):
-        """Async rate limiter using asyncio.sleep."""
-        current_time = time.time()
+    @property
+    def rate_limit_name(self) -> str:
+        return self.__class__.__name__.lower()
 
-        while requests_queue and requests_queue[0] <= current_time - period:
-            requests_queue.popleft()
+    def rate_limit_account(self):
+        """What identifies the account in the shared rate limits, None to share one bucket per service."""
+        return getattr(self, "token", None) or getattr(self, "api_key", None)
 
-        if len(requests_queue) >= limit:
-            sleep_time = requests_queue[0] - (current_time - period)
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+    async def _global_rate_limit(self) -> bool:
+        return await rate_limiter.acquire(self.rate_limit_name, self.rate_limit_account(), self.global_limit)
 
-        requests_queue.append(time.time())
-
-    async def _global_rate_limit(self):
-        await self._rate_limit(self.global_requests, self.global_limit, self.global_period)
+    async def _torrent_rate_limit(self) -> bool:
+        return await rate_limiter.acquire(
+            f"{self.rate_limit_name}.torrents", self.rate_limit_account(), self.torrent_limit
+        )
 
-    async def _torrent_rate_limit(self):
-        await self._rate_limit(self.torrent_requests, self.torrent_limit, self.torrent_period)
+    async def _cached_torrent_list(self, fetch):
+        """The account's torrent list, fetched at most once per debrid_torrent_list_ttl."""
+        if self._torrent_list is not None and time.monotonic() < self._torrent_list_expires:
+            return self._torrent_list
+        torrents = await fetch()
+        if torrents is not None:
+            self._torrent_list = torrents
+            self._torrent_list_expires = time.monotonic() + settings.debrid_torrent_list_ttl
+        return torrents
+
+    def _forget_torrent_list(self):
+        # À appeler après un ajout ou une suppression sur le compte
+        self._torrent_list = None
+
+    async def _rate_limited(self, headers, default: float) -> bool:
+        """Hold this account's requests after a 429, for the Retry-After delay when the service gives one.
+
+        Returns:
+            bool: False when the hold could not be recorded in Redis.
+        """
+        return await rate_limiter.penalize(
+            self.rate_limit_name, self.rate_limit_account(), self.global_limit,
+            retry_after_seconds(headers, default),
+        )
 
     async def json_response(self, url, method="get", data=None, headers=None, files=None, timeout=30, retry_on_429=True):
         """Make an async HTTP request and return JSON response."""
-        await self._global_rate_limit()
-        if "torrents" in url:
-            await self._torrent_rate_limit()
-
         session = await self._get_session()
         request_timeout = aiohttp.ClientTimeout(total=timeout)
         max_attempts = 5
 
         for attempt in range(max_attempts):
+            if not self.circuit_breaker.allow():
+                self.logger.warning(f"BaseDebrid: {self.rate_limit_name} circuit is open, skipping request")
+                return None
+            # Chaque tentative prend un jeton, et attend la fin du blocage après un 429
+            if not await self._global_rate_limit():
+                return None
+            if "torrents" in url and not await self._torrent_rate_limit():
+                return None
+
             try:
                 # Prepare request kwargs
                 kwargs = {
@@ -124,14 +152,16 @@ class BaseDebrid:
             except aiohttp.ClientResponseError as e:
                 status_code = e.status
                 if status_code == 429:
+                    wait_time = 2**attempt + 1
+                    recorded = await self._rate_limited(e.headers, wait_time)
                     if not retry_on_429:
                         self.logger.warning("BaseDebrid: Rate limit exceeded. No retry configured, returning None immediately.")
                         return None
-                    wait_time = 2**attempt + 1
                     self.logger.warning(
-                        f"BaseDebrid: Rate limit exceeded. Attempt {attempt + 1}/{max_attempts}. Waiting for {wait_time} seconds."
+                        f"BaseDebrid: Rate limit exceeded. Attempt {attempt + 1}/{max_attempts}."
                     )
-                    await asyncio.sleep(wait_time)
+                    if not recorded:
+                        await asyncio.sleep(wait_time)
                 elif 400 <= status_code < 500:
                     self.logger.error(
                         f"BaseDebrid: Client error occurred: {e}. Status code: {status_code}"
@@ -156,6 +186,7 @@ class BaseDebrid:
                     return None
 
             except aiohttp.ClientConnectorError as e:
+                self.circuit_breaker.record_failure()
                 self.logger.error(f"BaseDebrid: Connection error occurred: {e}")
                 if attempt < max_attempts - 1:
                     wait_time = 2**attempt + 1
@@ -165,6 +196,7 @@ class BaseDebrid:
                     return None
 
             except asyncio.TimeoutError:
+                self.circuit_breaker.record_failure()
                 self.logger.error(f"BaseDebrid: Request timed out")
                 if attempt < max_attempts - 1:
                     wait_time = 2**attempt + 1
@@ -184,6 +216,10 @@ class BaseDebrid:
 
     async def _log_and_raise(self, response):
         """Log response body and headers on error before raising."""
+        if response.status >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
         if response.status >= 400:
             try:
                 body = await response.text()
@@ -221,13 +257,30 @@ class BaseDebrid:
         self.logger.info(f"BaseDebrid: Waiting timed out.")
         return False
 
-    async def download_torrent_file(self, download_url):
-        """Async download of torrent file."""
+    async def download_torrent_file(self, download_url, info_hash=None):
+        """Async download of torrent file, served from the blob store when already cached."""
+        blob_store = get_blob_store()
+        if info_hash:
+            try:
+                torrent_file = await blob_store.get(info_hash)
+                if torrent_file:
+                    self.logger.debug(f"BaseDebrid: Using cached .torrent {blob_store.location(info_hash)}")
+                    return torrent_file
+            except Exception as e:
+                self.logger.warning(f"BaseDebrid: Unable to read cached .torrent for {info_hash}: {e}")
+
         session = await self._get_session()
         timeout = aiohttp.ClientTimeout(total=30)
         async with session.get(download_url, timeout=timeout) as response:
             response.raise_for_status()
-            return await response.read()
+            torrent_file = await response.read()
+
+        if info_hash:
+            try:
+                await blob_store.put(info_hash, torrent_file)
+            except Exception as e:
+                self.logger.warning(f"BaseDebrid: Unable to cache .torrent for {info_hash}: {e}")
+        return torrent_file
 
     async def get_stream_link(self, query, ip=None):
         raise NotImplementedError
@@ -240,3 +293,22 @@ class BaseDebrid:
 
     async def get_availability_bulk(self, hashes_or_magnets, ip=None):
         raise NotImplementedError
+
+    def availability_cache_name(self):
+        """Name of this service in the shared availability cache, None to always ask the service."""
+        return None
+
+    def split_availability(self, response, hashes):
+        """Cut a get_availability_bulk response into one entry per hash, None for a hash not cached.
+
+        Hashes whose state the response does not tell are left out.
+        """
+        raise NotImplementedError
+
+    def unanswered_hashes(self, response):
+        """Lowercased hashes of a partial get_availability_bulk response that the service did not check."""
+        return set()
+
+    def join_availability(self, entries):
+        """Rebuild a get_availability_bulk response from the entries of the cached hashes."""
+        raise NotImplementedError
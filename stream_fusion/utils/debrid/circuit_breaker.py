@@ -0,0 +1,45 @@
+import time
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+
+
+class CircuitBreaker:
+    """Stops calling a debrid service for a while after consecutive failures.
+
+    Server errors, timeouts and connection errors count as failures, any
+    other answer closes the circuit again. Once the cooldown is over, requests
+    go through again but a single new failure reopens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None, cooldown: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.debrid_breaker_failures
+        self.cooldown = cooldown or settings.debrid_breaker_cooldown
+        self.failures = 0
+        self.opened_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.opened_until
+
+    def allow(self) -> bool:
+        if self.is_open:
+            metrics.incr(f"debrid.{self.name}.circuit_rejected")
+            return False
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures < self.failure_threshold:
+            return
+        self.opened_until = time.monotonic() + self.cooldown
+        # Après le délai, un seul nouvel échec suffit à rouvrir le circuit
+        self.failures = self.failure_threshold - 1
+        metrics.incr(f"debrid.{self.name}.circuit_opened")
+        logger.warning(f"BaseDebrid: {self.name} circuit opened for {self.cooldown}s after repeated failures")
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Callable, List, Tuple
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.debrid.base_debrid import BaseDebrid
+from stream_fusion.utils.metrics import metrics
+
+# Options de la config lues par les clients debrid : deux configs qui ont les mêmes partagent un client
+CLIENT_CONFIG_KEYS = (
+    "apiKey",
+    "stremthru",
+    "RDToken",
+    "ADToken",
+    "TBToken",
+    "PMToken",
+    "DLToken",
+    "EDToken",
+    "OCCredentials",
+    "PPCredentials",
+    "debridlink_api_key",
+    "easydebrid_api_key",
+    "offcloud_credentials",
+    "pikpak_credentials",
+)
+
+
+def credential_fingerprint(config: dict) -> str:
+    credentials = {key: config.get(key) for key in CLIENT_CONFIG_KEYS}
+    key_string = json.dumps(credentials, sort_keys=True, default=str)
+    return hashlib.sha256(key_string.encode("utf-8")).hexdigest()[:16]
+
+
+class DebridClientRegistry:
+    """Long-lived debrid clients of this worker, one per service and account.
+
+    A client keeps what it learnt between requests: the Real-Debrid token
+    manager and its connection, the account's torrent list, its circuit
+    breaker. Clients unused for ``idle_ttl`` seconds are evicted by
+    ``run_evictor``, the least recently used ones when there are more than
+    ``max_clients``.
+    """
+
+    def __init__(self, idle_ttl: int, max_clients: int):
+        self.idle_ttl = idle_ttl
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[Tuple[str, str], Tuple[BaseDebrid, float]]" = OrderedDict()
+
+    def get(self, kind: str, config: dict, build: Callable[[], BaseDebrid]) -> BaseDebrid:
+        """The client of this kind of service for the account of config, built on first use."""
+        key = (kind, credential_fingerprint(config))
+        entry = self._clients.get(key)
+        if entry is None:
+            metrics.incr("debrid_clients.miss")
+            client = build()
+        else:
+            metrics.incr("debrid_clients.hit")
+            client = entry[0]
+        self._clients[key] = (client, time.monotonic())
+        self._clients.move_to_end(key)
+
+        while len(self._clients) > self.max_clients:
+            _, (evicted, _) = self._clients.popitem(last=False)
+            self._close_later(evicted)
+        return client
+
+    def evict_idle(self) -> List[BaseDebrid]:
+        deadline = time.monotonic() - self.idle_ttl
+        idle = [key for key, (_, last_used) in self._clients.items() if last_used < deadline]
+        return [self._clients.pop(key)[0] for key in idle]
+
+    @staticmethod
+    def _close_later(client: BaseDebrid) -> None:
+        try:
+            asyncio.get_running_loop().create_task(client.close())
+        except RuntimeError:
+            pass
+
+    async def run_evictor(self) -> None:
+        while True:
+            await asyncio.sleep(settings.metrics_flush_interval)
+            evicted = self.evict_idle()
+            if evicted:
+                logger.debug(f"BaseDebrid: Evicted {len(evicted)} idle debrid clients")
+                metrics.incr("debrid_clients.evicted", len(evicted))
+            for client in evicted:
+                await client.close()
+
+    async def close(self) -> None:
+        clients = [client for client, _ in self._clients.values()]
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+
+
+debrid_clients = DebridClientRegistry(settings.debrid_client_idle_ttl, settings.debrid_client_max)
@@ -2,6 +2,7 @@ import aiohttp
 from fastapi.exceptions import HTTPException
 
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
+from stream_fusion.utils.debrid.client_registry import debrid_clients
 from stream_fusion.utils.debrid.realdebrid import RealDebrid
 from stream_fusion.utils.debrid.torbox import Torbox
 from stream_fusion.utils.debrid.premiumize import Premiumize
@@ -13,6 +14,46 @@ from stream_fusion.utils.debrid.stremthru import StremThru
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
+DEBRID_CLASSES = {
+    "Real-Debrid": RealDebrid,
+    "AllDebrid": AllDebrid,
+    "TorBox": Torbox,
+    "Premiumize": Premiumize,
+    "Debrid-Link": DebridLink,
+    "EasyDebrid": EasyDebrid,
+    "Offcloud": Offcloud,
+    "PikPak": PikPak,
+}
+
+# Store StremThru, clé de la config qui porte le jeton, code du service
+STREMTHRU_STORES = {
+    "Real-Debrid": ("realdebrid", "RDToken", "RD"),
+    "AllDebrid": ("alldebrid", "ADToken", "AD"),
+    "TorBox": ("torbox", "TBToken", "TB"),
+    "Premiumize": ("premiumize", "PMToken", "PM"),
+    "Debrid-Link": ("debridlink", "DLToken", "DL"),
+    "EasyDebrid": ("easydebrid", "EDToken", "ED"),
+    "Offcloud": ("offcloud", "OCCredentials", "OC"),
+    "PikPak": ("pikpak", "PPCredentials", "PP"),
+}
+
+SERVICE_CODES = {code: service for service, (_, _, code) in STREMTHRU_STORES.items()}
+
+
+def get_client(config, service, session: aiohttp.ClientSession = None):
+    """The shared client of a debrid service ("Real-Debrid", "TorBox"...) for the account of config."""
+    if config.get('stremthru', False):
+        store_name, token_key, code = STREMTHRU_STORES[service]
+
+        def build():
+            st = StremThru(config, session)
+            st.set_store_credentials(store_name, config.get(token_key, ""))
+            st.extension = f"ST:{code}"
+            return st
+
+        return debrid_clients.get(f"StremThru:{store_name}", config, build)
+    return debrid_clients.get(service, config, lambda: DEBRID_CLASSES[service](config, session))
+
 
 def get_all_debrid_services(config, session: aiohttp.ClientSession = None):
     services = config['service']
@@ -24,93 +65,13 @@ def get_all_debrid_services(config, session: aiohttp.ClientSession = None):
     use_stremthru = config.get('stremthru', False)
 
     for service in services:
-        if service == "Real-Debrid":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("realdebrid", config.get("RDToken", ""))
-                st.extension = "ST:RD"
-                debrid_service.append(st)
-                logger.debug("Real-Debrid (via StremThru): service added to be use")
-            else:
-                debrid_service.append(RealDebrid(config, session))
-                logger.debug("Real-Debrid: service added to be use")
-
-        if service == "AllDebrid":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("alldebrid", config.get("ADToken", ""))
-                st.extension = "ST:AD"
-                debrid_service.append(st)
-                logger.debug("AllDebrid (via StremThru): service added to be use")
-            else:
-                debrid_service.append(AllDebrid(config, session))
-                logger.debug("AllDebrid: service added to be use")
-
-        if service == "TorBox":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("torbox", config.get("TBToken", ""))
-                st.extension = "ST:TB"
-                debrid_service.append(st)
-                logger.debug("TorBox (via StremThru): service added to be use")
-            else:
-                debrid_service.append(Torbox(config, session))
-                logger.debug("TorBox: service added to be use")
-
-        if service == "Premiumize":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("premiumize", config.get("PMToken", ""))
-                st.extension = "ST:PM"
-                debrid_service.append(st)
-                logger.debug("Premiumize (via StremThru): service added to be use")
-            else:
-                debrid_service.append(Premiumize(config, session))
-                logger.debug("Premiumize: service added to be use")
-
-        if service == "Debrid-Link":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("debridlink", config.get("DLToken", ""))
-                st.extension = "ST:DL"
-                debrid_service.append(st)
-                logger.debug("Debrid-Link (via StremThru): service added to be use")
-            else:
-                debrid_service.append(DebridLink(config, session))
-                logger.debug("Debrid-Link: service added to be use")
-
-        if service == "EasyDebrid":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("easydebrid", config.get("EDToken", ""))
-                st.extension = "ST:ED"
-                debrid_service.append(st)
-                logger.debug("EasyDebrid (via StremThru): service added to be use")
-            else:
-                debrid_service.append(EasyDebrid(config, session))
-                logger.debug("EasyDebrid: service added to be use")
-
-        if service == "Offcloud":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("offcloud", config.get("OCCredentials", ""))
-                st.extension = "ST:OC"
-                debrid_service.append(st)
-                logger.debug("Offcloud (via StremThru): service added to be use")
-            else:
-                debrid_service.append(Offcloud(config, session))
-                logger.debug("Offcloud: service added to be use")
-
-        if service == "PikPak":
-            if use_stremthru:
-                st = StremThru(config, session)
-                st.set_store_credentials("pikpak", config.get("PPCredentials", ""))
-                st.extension = "ST:PP"
-                debrid_service.append(st)
-                logger.debug("PikPak (via StremThru): service added to be use")
-            else:
-                debrid_service.append(PikPak(config, session))
-                logger.debug("PikPak: service added to be use")
+        if service not in DEBRID_CLASSES:
+            continue
+        debrid_service.append(get_client(config, service, session))
+        if use_stremthru:
+            logger.debug(f"{service} (via StremThru): service added to be use")
+        else:
+            logger.debug(f"{service}: service added to be use")
 
     if not debrid_service:
         raise HTTPException(status_code=500, detail="Invalid service configuration.")
@@ -136,118 +97,21 @@ def get_download_service(config, session: aiohttp.ClientSession = None):
     else:
         service = settings.download_service
 
-    use_stremthru = config.get('stremthru', False)
-
-    if service == "Real-Debrid":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("realdebrid", config.get("RDToken", ""))
-            return st
-        return RealDebrid(config, session)
-    elif service == "AllDebrid":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("alldebrid", config.get("ADToken", ""))
-            return st
-        return AllDebrid(config, session)
-    elif service == "TorBox":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("torbox", config.get("TBToken", ""))
-            return st
-        return Torbox(config, session)
-    elif service == "Premiumize":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("premiumize", config.get("PMToken", ""))
-            return st
-        return Premiumize(config, session)
-    elif service == "Debrid-Link":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("debridlink", config.get("DLToken", ""))
-            return st
-        return DebridLink(config, session)
-    elif service == "EasyDebrid":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("easydebrid", config.get("EDToken", ""))
-            return st
-        return EasyDebrid(config, session)
-    elif service == "Offcloud":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("offcloud", config.get("OCCredentials", ""))
-            return st
-        return Offcloud(config, session)
-    elif service == "PikPak":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("pikpak", config.get("PPCredentials", ""))
-            return st
-        return PikPak(config, session)
-    else:
-        logger.error(f"Invalid download service: {service}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Invalid download service: {service}. Please select a valid download service in the web interface."
-        )
+    if service in DEBRID_CLASSES:
+        return get_client(config, service, session)
+    logger.error(f"Invalid download service: {service}")
+    raise HTTPException(
+        status_code=500,
+        detail=f"Invalid download service: {service}. Please select a valid download service in the web interface."
+    )
 
 
 def get_debrid_service(config, service, session: aiohttp.ClientSession = None):
     if not service:
         service = settings.download_service
 
-    use_stremthru = config.get('stremthru', False)
-
-    if service == "RD":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("realdebrid", config.get("RDToken", ""))
-            return st
-        return RealDebrid(config, session)
-    elif service == "AD":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("alldebrid", config.get("ADToken", ""))
-            return st
-        return AllDebrid(config, session)
-    elif service == "TB":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("torbox", config.get("TBToken", ""))
-            return st
-        return Torbox(config, session)
-    elif service == "PM":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("premiumize", config.get("PMToken", ""))
-            return st
-        return Premiumize(config, session)
-    elif service == "DL":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("debridlink", config.get("DLToken", ""))
-            return st
-        return DebridLink(config, session)
-    elif service == "ED":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("easydebrid", config.get("EDToken", ""))
-            return st
-        return EasyDebrid(config, session)
-    elif service == "OC":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("offcloud", config.get("OCCredentials", ""))
-            return st
-        return Offcloud(config, session)
-    elif service == "PP":
-        if use_stremthru:
-            st = StremThru(config, session)
-            st.set_store_credentials("pikpak", config.get("PPCredentials", ""))
-            return st
-        return PikPak(config, session)
+    if service in SERVICE_CODES:
+        return get_client(config, SERVICE_CODES[service], session)
     elif service == "ST":
         return get_download_service(config, session)
     else:
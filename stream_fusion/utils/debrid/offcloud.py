@@ -17,7 +17,7 @@ class Offcloud(StremThru):
     async def get_availability_bulk(self, hashes_or_magnets, ip=None):
         """Vérifie la disponibilité des torrents en masse via StremThru"""
         results = await super().get_availability_bulk(hashes_or_magnets, ip)
-        logger.debug(f"Offcloud (via StremThru): {len(results)} torrents en cache trouvés")
+        logger.debug(f"Offcloud (via StremThru): {len(results or [])} torrents en cache trouvés")
         # Note: Pour Offcloud, la liste des fichiers est toujours vide selon la documentation StremThru
         return results
 
@@ -17,7 +17,7 @@ class PikPak(StremThru):
     async def get_availability_bulk(self, hashes_or_magnets, ip=None):
         """Vérifie la disponibilité des torrents en masse via StremThru"""
         results = await super().get_availability_bulk(hashes_or_magnets, ip)
-        logger.debug(f"PikPak (via StremThru): {len(results)} torrents en cache trouvés")
+        logger.debug(f"PikPak (via StremThru): {len(results or [])} torrents en cache trouvés")
         return results
 
     async def add_magnet(self, magnet, ip=None):
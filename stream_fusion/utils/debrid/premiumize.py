@@ -226,6 +226,21 @@ class Premiumize(BaseDebrid):
         logger.info(f"Got availability for {len(result)} items")
         return result
 
+    def availability_cache_name(self):
+        return "premiumize"
+
+    def split_availability(self, response, hashes):
+        # get_availability_bulk renvoie {} quand l'API est en erreur
+        if not response:
+            return {}
+        return {
+            info_hash: status if status.get("transcoded") else None
+            for info_hash, status in response.items()
+        }
+
+    def join_availability(self, entries):
+        return dict(entries)
+
     async def start_background_caching(self, magnet, query=None):
         """Start caching a magnet link in the background."""
         await self._ensure_token_checked()
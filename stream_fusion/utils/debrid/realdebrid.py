@@ -47,10 +47,18 @@ class RealDebrid(BaseDebrid):
         else:
             return {"Authorization": f"Bearer {self.token_manager.get_access_token()}"}
 
+    def rate_limit_account(self):
+        if settings.rd_unique_account:
+            return settings.rd_token
+        token = self.config.get("RDToken")
+        # Le jeton d'accès change, le refresh token identifie le compte
+        return token.get("refresh_token") if isinstance(token, dict) else token
+
     async def add_magnet(self, magnet, ip=None):
         url = f"{self.base_url}torrents/addMagnet"
         data = {"magnet": magnet}
         logger.info(f"Real-Debrid: Adding magnet: {magnet}")
+        self._forget_torrent_list()
         try:
             return await self.json_response(
                 url, method="post", headers=self.get_headers(), data=data
@@ -63,6 +71,7 @@ class RealDebrid(BaseDebrid):
 
     async def add_torrent(self, torrent_file):
         url = f"{self.base_url}torrents/addTorrent"
+        self._forget_torrent_list()
         try:
             return await self.json_response(
                 url, method="put", headers=self.get_headers(), data=torrent_file
@@ -75,6 +84,7 @@ class RealDebrid(BaseDebrid):
 
     async def delete_torrent(self, id):
         url = f"{self.base_url}torrents/delete/{id}"
+        self._forget_torrent_list()
         return await self.json_response(url, method="delete", headers=self.get_headers())
 
     async def get_torrent_info(self, torrent_id):
@@ -89,7 +99,8 @@ class RealDebrid(BaseDebrid):
         logger.info(
             f"Real-Debrid: Selecting file(s): {file_id} for torrent ID: {torrent_id}"
         )
-        await self._torrent_rate_limit()
+        if not await self._torrent_rate_limit():
+            return
         url = f"{self.base_url}torrents/selectFiles/{torrent_id}"
         data = {"files": str(file_id)}
         session = await self._get_session()
@@ -123,7 +134,7 @@ class RealDebrid(BaseDebrid):
     async def is_already_added(self, magnet):
         hash = magnet.split("urn:btih:")[1].split("&")[0].lower()
         url = f"{self.base_url}torrents"
-        torrents = await self.json_response(url, headers=self.get_headers())
+        torrents = await self._cached_torrent_list(lambda: self.json_response(url, headers=self.get_headers()))
         for torrent in torrents:
             if torrent["hash"].lower() == hash:
                 return torrent["id"]
@@ -144,13 +155,26 @@ class RealDebrid(BaseDebrid):
         return None
 
     async def get_availability_bulk(self, hashes_or_magnets, ip=None):
-        await self._torrent_rate_limit()
         if len(hashes_or_magnets) == 0:
             logger.info("Real-Debrid: No hashes to be sent.")
             return dict()
         url = f"{self.base_url}torrents/instantAvailability/{'/'.join(hashes_or_magnets)}"
         return await self.json_response(url, headers=self.get_headers())
 
+    def availability_cache_name(self):
+        return "realdebrid"
+
+    def split_availability(self, response, hashes):
+        if not isinstance(response, dict) or "error" in response:
+            return {}
+        return {
+            info_hash: details if isinstance(details, dict) and details.get("rd") else None
+            for info_hash, details in response.items()
+        }
+
+    def join_availability(self, entries):
+        return dict(entries)
+
     async def get_stream_link(self, query, config=None, ip=None):
         # Extract query parameters
         magnet = query["magnet"]
@@ -207,9 +231,8 @@ class RealDebrid(BaseDebrid):
         return unrestrict_response["download"]
 
     async def _get_cached_torrent_ids(self, info_hash):
-        await self._torrent_rate_limit()
         url = f"{self.base_url}torrents"
-        torrents = await self.json_response(url, headers=self.get_headers())
+        torrents = await self._cached_torrent_list(lambda: self.json_response(url, headers=self.get_headers()))
 
         logger.info(f"Real-Debrid: Searching user's downloads for hash: {info_hash}")
         torrent_ids = [
@@ -267,7 +290,9 @@ class RealDebrid(BaseDebrid):
             torrent_id = magnet_response["id"]
         else:
             logger.info("Real-Debrid: Downloading and adding torrent file")
-            torrent_file = await self.download_torrent_file(torrent_download)
+            torrent_file = await self.download_torrent_file(
+                torrent_download, get_info_hash_from_magnet(magnet) if magnet else None
+            )
             upload_response = await self.add_torrent(torrent_file)
             logger.info(f"Real-Debrid: Add torrent file response: {upload_response}")
 
@@ -10,6 +10,14 @@ from stream_fusion.settings import settings
 from stream_fusion.utils.general import season_episode_in_filename, smart_episode_fallback, is_video_file
 
 
+class StremThruAvailability(list):
+    """Cached magnets of a check, with the hashes of the chunks StremThru did not answer."""
+
+    def __init__(self, results=(), unanswered=()):
+        super().__init__(results)
+        self.unanswered = set(unanswered)
+
+
 class StremThru(BaseDebrid):
     def __init__(self, config, session: aiohttp.ClientSession = None):
         super().__init__(config, session)
@@ -96,11 +104,17 @@ class StremThru(BaseDebrid):
         return False
 
     async def get_availability_bulk(self, hashes_or_magnets, ip=None):
-        """Vérifie la disponibilité des torrents avec l'API StremThru"""
+        """Vérifie la disponibilité des torrents avec l'API StremThru
+
+        Les hashes des lots sans réponse sont gardés dans unanswered : on ne
+        sait pas s'ils sont en cache ou non. Renvoie None si aucun lot n'a eu
+        de réponse.
+        """
         if not hashes_or_magnets:
-            return []
+            return StremThruAvailability()
 
         results = []
+        unanswered = set()
         session = await self._get_session()
         timeout = aiohttp.ClientTimeout(total=5)
 
@@ -126,8 +140,21 @@ class StremThru(BaseDebrid):
 
                 logger.debug(f"Vérification de {len(magnets)} magnets sur StremThru-{self.store_name}")
 
+                if not self.circuit_breaker.allow() or not await self._global_rate_limit():
+                    # Ce lot et les suivants ne sont pas envoyés
+                    unanswered.update(hash_or_magnet.lower() for hash_or_magnet in hashes_or_magnets[i:])
+                    break
                 async with session.get(url, headers=self._headers, timeout=timeout) as response:
-                    if response.status == 200:
+                    if response.status >= 500:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                    if response.status == 429:
+                        await self._rate_limited(response.headers, 5)
+                    if response.status != 200:
+                        unanswered.update(hash_or_magnet.lower() for hash_or_magnet in chunk)
+                        logger.warning(f"Vérification des magnets sur StremThru-{self.store_name} en erreur: {response.status}")
+                    else:
                         try:
                             json_data = await response.json()
                             if json_data and "data" in json_data and "items" in json_data["data"]:
@@ -142,12 +169,44 @@ class StremThru(BaseDebrid):
                                             "debrid": StremThru.get_underlying_debrid_code(self.store_name)
                                         })
                                         logger.debug(f"Magnet caché trouvé sur StremThru-{self.store_name}: {hash_value}")
+                            else:
+                                unanswered.update(hash_or_magnet.lower() for hash_or_magnet in chunk)
                         except Exception as json_e:
+                            unanswered.update(hash_or_magnet.lower() for hash_or_magnet in chunk)
                             logger.warning(f"Erreur lors du parsing JSON: {json_e}")
             except Exception as e:
+                unanswered.update(hash_or_magnet.lower() for hash_or_magnet in chunk)
+                self.circuit_breaker.record_failure()
                 logger.warning(f"Erreur lors de la vérification des magnets sur StremThru-{self.store_name}: {e}")
 
-        return results
+        if len(unanswered) >= len({hash_or_magnet.lower() for hash_or_magnet in hashes_or_magnets}):
+            return None
+        if unanswered:
+            logger.warning(f"StremThru-{self.store_name}: {len(unanswered)} hashes sans réponse, résultats partiels")
+        return StremThruAvailability(results, unanswered)
+
+    def availability_cache_name(self):
+        return f"stremthru-{self.store_name}" if self.store_name else None
+
+    def split_availability(self, response, hashes):
+        # Sans réponse pour tous les lots, aucun hash absent ne peut être marqué comme non caché
+        if response is None:
+            return {}
+        # Seuls les magnets en cache sont renvoyés : les autres hashes des lots qui ont répondu ne le sont pas
+        unanswered = self.unanswered_hashes(response)
+        entries = {
+            info_hash.lower(): None for info_hash in hashes
+            if not info_hash.startswith("magnet:") and info_hash.lower() not in unanswered
+        }
+        for result in response:
+            entries[result["hash"]] = result
+        return entries
+
+    def unanswered_hashes(self, response):
+        return set(response.unanswered) if isinstance(response, StremThruAvailability) else set()
+
+    def join_availability(self, entries):
+        return list(entries.values())
 
     async def add_magnet(self, magnet, ip=None, torrent_file_content=None):
         """Ajoute un magnet à StremThru"""
@@ -156,6 +215,8 @@ class StremThru(BaseDebrid):
             url = f"{self.base_url}/magnets{client_ip_param}"
             session = await self._get_session()
             timeout = aiohttp.ClientTimeout(total=30)
+            if not await self._global_rate_limit():
+                return None
 
             # PRIORITE 1: Si on a le fichier .torrent, l'envoyer en multipart/form-data
             if torrent_file_content:
@@ -238,6 +299,8 @@ class StremThru(BaseDebrid):
             url = f"{self.base_url}/magnets/{magnet_id}{client_ip_param}"
             session = await self._get_session()
             timeout = aiohttp.ClientTimeout(total=30)
+            if not await self._global_rate_limit():
+                return None
 
             logger.debug(f"Récupération des informations du magnet {magnet_id} sur StremThru-{self.store_name}")
 
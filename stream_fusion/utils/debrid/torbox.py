@@ -40,6 +40,7 @@ class Torbox(BaseDebrid):
             "seed": seed,
             "allow_zip": "false"
         }
+        self._forget_torrent_list()
         response = await self.json_response(url, method='post', headers=self.get_headers(), data=data, retry_on_429=False)
         logger.info(f"Torbox: Add magnet response: {response}")
         return response
@@ -55,6 +56,7 @@ class Torbox(BaseDebrid):
         files = {
             "file": (str(uuid.uuid4()) + ".torrent", torrent_file, 'application/x-bittorrent')
         }
+        self._forget_torrent_list()
         response = await self.json_response(url, method='post', headers=self.get_headers(), data=data, files=files, retry_on_429=False)
         logger.info(f"Torbox: Add torrent file response: {response}")
         return response
@@ -172,10 +174,10 @@ class Torbox(BaseDebrid):
             url = f"{self.base_url}/torrents/checkcached?hash={','.join(batch)}&format=list&list_files=true"
             response = await self.json_response(url, headers=self.get_headers())
 
-            if response and response.get("success") and response["data"]:
-                all_results.extend(response["data"])
+            if response and response.get("success"):
+                all_results.extend(response["data"] or [])
             else:
-                logger.debug(f"Torbox: No cached availability for batch {i//50 + 1}")
+                logger.debug(f"Torbox: Availability check failed for batch {i//50 + 1}")
                 return None
 
         logger.info(f"Torbox: Availability check completed for all {len(hashes_or_magnets)} hashes/magnets")
@@ -185,9 +187,30 @@ class Torbox(BaseDebrid):
             "data": all_results
         }
 
+    def availability_cache_name(self):
+        return "torbox"
+
+    def split_availability(self, response, hashes):
+        # Sans réponse on ne sait pas si aucun hash n'est en cache ou si l'appel a échoué
+        if not response or not response.get("success"):
+            return {}
+        entries = dict.fromkeys(hashes)
+        for data in response["data"]:
+            entries[data["hash"]] = data
+        return entries
+
+    def join_availability(self, entries):
+        return {
+            "success": True,
+            "detail": "Torrent cache status retrieved successfully.",
+            "data": list(entries.values()),
+        }
+
     async def _find_existing_torrent(self, info_hash):
         logger.info(f"Torbox: Searching for existing torrent with hash: {info_hash}")
-        torrents = await self.json_response(f"{self.base_url}/torrents/mylist", headers=self.get_headers())
+        torrents = await self._cached_torrent_list(
+            lambda: self.json_response(f"{self.base_url}/torrents/mylist", headers=self.get_headers())
+        )
         if torrents and "data" in torrents:
             for torrent in torrents["data"]:
                 if torrent["hash"].lower() == info_hash.lower():
@@ -0,0 +1,157 @@
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from RTN.models import ParsedData
+
+from stream_fusion.logging_config import format_console, logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.filter.filter_plan import FilterPlan, Verdict, compile_plan
+from stream_fusion.utils.filter.result_batch import rank_results
+from stream_fusion.utils.filter.title_matcher import TitleMatcher, title_match_cache
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+# (raw_title, size, seeders, languages, indexer, privacy, type, parsed_data)
+Row = tuple
+
+
+def to_row(item: TorrentItem) -> Row:
+    return (
+        item.raw_title, item.size, item.seeders, item.languages,
+        item.indexer, item.privacy, item.type, item.parsed_data_if_loaded,
+    )
+
+
+def evaluate_chunk(
+    plan: FilterPlan, rows: List[Row], title_matches: Dict[str, bool]
+) -> Tuple[List[Verdict], List[Optional[ParsedData]], Dict[str, Dict[str, bool]], float]:
+    """Judge a chunk of rows with the compiled plan; executed in a pool process.
+
+    The title matches already known by the event loop are passed along, and
+    the ones computed here are returned so that it can share them. The parsed
+    titles of the kept rows come back too, so that ranking does not parse them again.
+    """
+    started = time.perf_counter()
+    items = [
+        TorrentItem(
+            raw_title=raw_title, size=size, magnet=None, info_hash=None, link=None,
+            seeders=seeders, languages=list(languages or []), indexer=indexer,
+            privacy=privacy, type=type, parsed_data=parsed_data,
+        )
+        for raw_title, size, seeders, languages, indexer, privacy, type, parsed_data in rows
+    ]
+    compiled = compile_plan(plan)
+    title_match_cache.preload(compiled.title_matcher.digest, title_matches)
+    verdicts = [compiled.verdict(item) for item in items]
+    # Seuls les items retenus seront classés : inutile de renvoyer le parse des autres
+    parsed = [
+        item.parsed_data_if_loaded if verdict is not None else None
+        for item, verdict in zip(items, verdicts)
+    ]
+    return verdicts, parsed, title_match_cache.take_pending(), time.perf_counter() - started
+
+
+def _init_worker() -> None:
+    # Les processus du pool ne passent pas par configure_logging()
+    logger.remove()
+    logger.add(sys.stdout, format=format_console, level=settings.log_level.value)
+
+
+class FilterPool:
+    """Process pool that takes large filtering batches off the event loop."""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.filter_offload_workers > 0
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn plutôt que fork : le worker gunicorn a déjà des threads et une boucle asyncio
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.filter_offload_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def evaluate(self, items: List[TorrentItem], plan: FilterPlan, title_matcher: TitleMatcher) -> List[Verdict]:
+        """The verdicts of the plan for each item, computed in the pool.
+
+        The kept items receive the parsed data computed by the pool.
+        """
+        loop = asyncio.get_running_loop()
+        chunk_size = settings.filter_offload_chunk_size
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+        started = time.perf_counter()
+        futures = [
+            loop.run_in_executor(
+                self.get_executor(), evaluate_chunk, plan, [to_row(item) for item in chunk],
+                title_match_cache.known(title_matcher.digest, title_matcher.item_titles(chunk)),
+            )
+            for chunk in chunks
+        ]
+        submitted = time.perf_counter() - started
+        results = await asyncio.gather(*futures)
+
+        verdicts = []
+        worker_seconds = 0.0
+        for chunk, (chunk_verdicts, chunk_parsed, title_matches, seconds) in zip(chunks, results):
+            worker_seconds += seconds
+            verdicts.extend(chunk_verdicts)
+            title_match_cache.record(title_matches)
+            for item, parsed_data in zip(chunk, chunk_parsed):
+                if parsed_data is not None and item.parsed_data_if_loaded is None:
+                    item.parsed_data = parsed_data
+
+        metrics.incr("filter.offload.items", len(items))
+        metrics.observe("filter.offload.worker", worker_seconds)
+        # Temps que la boucle aurait passé à filtrer, moins celui passé à sérialiser les lignes
+        metrics.observe("filter.offload.loop_saved", max(worker_seconds - submitted, 0.0))
+        logger.debug(
+            f"Filters: Offloaded {len(items)} items in {len(chunks)} chunks "
+            f"({worker_seconds:.3f}s of filtering, {submitted:.3f}s on the event loop)"
+        )
+        return verdicts
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+filter_pool = FilterPool()
+
+
+async def filter_items_batched(items, media, config, skip_resolution=False):
+    """The items that match the media and the user's filters, ranked.
+
+    Items without a memoised verdict are judged in the process pool when
+    there are enough of them, on the event loop otherwise.
+    """
+    plan = FilterPlan.from_media(media, config, skip_resolution=skip_resolution)
+    compiled = compile_plan(plan)
+    unknown = [item for item in items if not compiled.is_known(item)]
+    if unknown:
+        await compiled.title_matcher.warm(unknown)
+    if filter_pool.enabled and len(unknown) >= settings.filter_offload_threshold:
+        try:
+            for item, verdict in zip(unknown, await filter_pool.evaluate(unknown, plan, compiled.title_matcher)):
+                compiled.remember(item, verdict)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                filter_pool.close()
+            logger.error(f"Filters: Offloaded filtering failed, filtering on the event loop: {e}")
+
+    started = time.perf_counter()
+    selected = compiled.select(items)
+    metrics.observe("filter.inline", time.perf_counter() - started)
+    return rank_results(selected, config, compiled.language_priority_filter)
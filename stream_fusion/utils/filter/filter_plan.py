@@ -0,0 +1,185 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.filter.language_priority_filter import LanguagePriorityFilter
+from stream_fusion.utils.filter.title_matcher import TitleMatcher
+from stream_fusion.utils.filter_results import compile_year_pattern, series_matches, user_filters
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+# Options de la config lues par les filtres de l'utilisateur
+PLAN_CONFIG_KEYS = ("languages", "maxSize", "exclusionKeywords", "exclusion")
+
+# Langues retenues par LanguageFilter, ou None si l'item est écarté
+Verdict = Optional[Tuple[str, ...]]
+
+_UNKNOWN = object()
+
+
+@dataclass(frozen=True)
+class FilterPlan:
+    """Everything CompiledPlan needs to judge a title, in a picklable form.
+
+    The plan stands in for the media object, so it exposes the same ``type``,
+    ``titles``, ``year``, ``season`` and ``episode`` attributes.
+    """
+
+    type: str
+    titles: Tuple[str, ...]
+    year: Optional[str] = None
+    season: Optional[str] = None
+    episode: Optional[str] = None
+    config: dict = field(default_factory=dict)
+    skip_resolution: bool = False
+
+    @classmethod
+    def from_media(cls, media, config: dict, skip_resolution: bool = False) -> "FilterPlan":
+        return cls(
+            type=media.type,
+            titles=tuple(media.titles),
+            year=getattr(media, "year", None),
+            season=getattr(media, "season", None),
+            episode=getattr(media, "episode", None),
+            config={key: config[key] for key in PLAN_CONFIG_KEYS if key in config},
+            skip_resolution=skip_resolution,
+        )
+
+    @property
+    def key(self) -> str:
+        config = {
+            key: sorted(value, key=str) if isinstance(value, list) else value
+            for key, value in self.config.items()
+        }
+        return json.dumps(
+            [self.type, self.titles, self.year, self.season, self.episode, config, self.skip_resolution],
+            sort_keys=True,
+            default=str,
+        )
+
+
+class CompiledPlan:
+    """A FilterPlan with its filters built and its patterns compiled once.
+
+    ``verdict`` runs every predicate on one item (the user's filters, the
+    year or season and episode, the title), cheapest first, and stops at the
+    first one that rejects it. Verdicts are memoised
+    by the item fields they depend on, so filtering results that were already
+    seen (external_results after all_results) only looks them up.
+    """
+
+    def __init__(self, plan: FilterPlan):
+        self.plan = plan
+        filters = {
+            name: filter_instance
+            for name, filter_instance in user_filters(plan, plan.config, plan.skip_resolution).items()
+            if filter_instance.config is not None and filter_instance.can_filter()
+        }
+        self.language_filter = filters.get("languages")
+        self.max_size_bytes = filters["maxSize"].max_size_bytes if "maxSize" in filters else None
+        self.keyword_filter = filters.get("exclusionKeywords")
+        self.quality_filter = filters.get("exclusion")
+        self.year_pattern = compile_year_pattern(plan.year) if plan.type == "movie" else None
+        self.season = self.episode = None
+        if plan.type == "series":
+            self.season = int(plan.season.replace("S", ""))
+            self.episode = int(plan.episode.replace("E", ""))
+        self.title_matcher = TitleMatcher(plan.titles)
+        self.language_priority_filter = LanguagePriorityFilter(plan.config)
+        self._verdicts: LRUCache = LRUCache(maxsize=settings.filter_verdict_cache_size)
+
+    @staticmethod
+    def verdict_key(item: TorrentItem, languages=None) -> tuple:
+        if languages is None:
+            languages = item.languages
+        return item.raw_title, item.indexer, item.size, tuple(languages or ())
+
+    def _passes_user_filter(self, name: str, predicate, item: TorrentItem) -> bool:
+        try:
+            return predicate(item)
+        except Exception as e:
+            # Un filtre en erreur n'écarte rien
+            logger.error(f"Filters: Error while applying {name} filter to {item.raw_title}", exc_info=e)
+            return True
+
+    def _size_allowed(self, item: TorrentItem) -> bool:
+        size = int(item.size) if isinstance(item.size, str) else item.size
+        return size <= self.max_size_bytes
+
+    def evaluate(self, item: TorrentItem) -> Verdict:
+        """Judge one item without the memo."""
+        if self.max_size_bytes is not None and not self._passes_user_filter("maxSize", self._size_allowed, item):
+            return None
+        if self.keyword_filter is not None and not self._passes_user_filter(
+            "exclusionKeywords", self.keyword_filter._should_include_stream, item
+        ):
+            return None
+
+        languages = item.languages
+        if self.language_filter is not None:
+            try:
+                languages = self.language_filter.kept_languages(item)
+            except Exception as e:
+                logger.error(f"Filters: Error while applying languages filter to {item.raw_title}", exc_info=e)
+            if languages is None:
+                return None
+
+        if self.year_pattern is not None and not self.year_pattern.search(item.raw_title):
+            return None
+        if self.season is not None and not series_matches(item, self.season, self.episode):
+            return None
+        if not self.title_matcher.matches(item):
+            return None
+        if self.quality_filter is not None and not self._passes_user_filter(
+            "exclusion", self.quality_filter._is_stream_allowed, item
+        ):
+            return None
+        return tuple(languages or ())
+
+    def is_known(self, item: TorrentItem) -> bool:
+        return self.verdict_key(item) in self._verdicts
+
+    def remember(self, item: TorrentItem, verdict: Verdict) -> None:
+        self._verdicts[self.verdict_key(item)] = verdict
+        if verdict is not None and self.language_filter is not None:
+            # L'item garde ces langues une fois sélectionné : un second passage doit le retrouver
+            self._verdicts[self.verdict_key(item, verdict)] = verdict
+
+    def verdict(self, item: TorrentItem) -> Verdict:
+        verdict = self._verdicts.get(self.verdict_key(item), _UNKNOWN)
+        if verdict is not _UNKNOWN:
+            metrics.incr("filter.verdict.hit")
+            return verdict
+        metrics.incr("filter.verdict.miss")
+        verdict = self.evaluate(item)
+        self.remember(item, verdict)
+        return verdict
+
+    def select(self, items: List[TorrentItem]) -> List[TorrentItem]:
+        """The items that match the media and the user's filters, in a single pass with the memoised verdicts."""
+        selected = []
+        for item in items:
+            verdict = self.verdict(item)
+            if verdict is None:
+                continue
+            if self.language_filter is not None:
+                item.languages = list(verdict)
+            selected.append(item)
+        logger.success(f"Filters: {len(selected)} items kept out of {len(items)} for media: {self.plan.titles[0]}")
+        return selected
+
+
+_compiled_plans: LRUCache = LRUCache(maxsize=settings.filter_plan_cache_size)
+
+
+def compile_plan(plan: FilterPlan) -> CompiledPlan:
+    """The CompiledPlan of a FilterPlan, shared by every call with the same media and options."""
+    key = plan.key
+    compiled = _compiled_plans.get(key)
+    if compiled is None:
+        compiled = _compiled_plans[key] = CompiledPlan(plan)
+    return compiled
@@ -1,10 +1,9 @@
-import re
 from typing import List, Dict
 
 from RTN import ParsedData, title_match
-from stream_fusion.constants import FRENCH_PATTERNS
 from stream_fusion.utils.filter.base_filter import BaseFilter
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.parser.tag_scanner import scan_title
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
 
@@ -110,12 +109,8 @@ class LanguagePriorityFilter(BaseFilter):
         """
         if not title:
             return None
-            
-        for language, pattern in FRENCH_PATTERNS.items():
-            if re.search(pattern, title, re.IGNORECASE):
-                return language
-        
-        return None
+
+        return scan_title(title).french_tag
         
     def _convert_language_code(self, lang_code: str) -> str:
         """
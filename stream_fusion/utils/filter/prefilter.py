@@ -0,0 +1,78 @@
+import re
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.filter_results import compile_year_pattern
+from stream_fusion.utils.metrics import metrics
+
+T = TypeVar("T")
+
+# Un seul épisode, sans plage (S01E01-E03) ni double épisode (S01E01E02)
+SINGLE_EPISODE_PATTERN = re.compile(r"\bS(\d{1,2})[ .]?E(\d{1,3})\b(?![-.]?E\d|-\d)", re.IGNORECASE)
+SEASON_TOKEN_PATTERN = re.compile(r"\bS\d{1,2}", re.IGNORECASE)
+INTEGRALE_PATTERN = re.compile(r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE)
+
+
+class RawPrefilter:
+    """Reject obvious season, episode or year mismatches before a title is parsed.
+
+    Only items that the year or season and episode checks of CompiledPlan
+    would drop after parsing are rejected, so the final results are unchanged:
+    anything ambiguous (season packs, ranges, titles without markers) is kept.
+    """
+
+    def __init__(self, media):
+        self.year_pattern = None
+        self.season = None
+        self.episode = None
+        if media.type == "movie" and getattr(media, "year", None):
+            self.year_pattern = compile_year_pattern(media.year)
+        elif media.type == "series" and getattr(media, "season", None) and getattr(media, "episode", None):
+            self.season = int(media.season.replace("S", ""))
+            self.episode = int(media.episode.replace("E", ""))
+
+    def keep(self, raw_title: Optional[str], seasons: Iterable[int] = (), episodes: Iterable[int] = ()) -> bool:
+        if not raw_title:
+            return True
+        if self.year_pattern is not None:
+            return self.year_pattern.search(raw_title) is not None
+        if self.season is None:
+            return True
+
+        seasons, episodes = list(seasons or ()), list(episodes or ())
+        if seasons:
+            # Saisons et épisodes déjà analysés par l'indexeur (Zilean)
+            if self.season not in seasons:
+                return False
+            return not episodes or self.episode in episodes
+
+        if INTEGRALE_PATTERN.search(raw_title) or len(SEASON_TOKEN_PATTERN.findall(raw_title)) != 1:
+            return True
+        match = SINGLE_EPISODE_PATTERN.search(raw_title)
+        if match is None:
+            return True
+        return int(match.group(1)) == self.season and int(match.group(2)) == self.episode
+
+    def select(
+        self,
+        entries: List[T],
+        title: Callable[[T], Optional[str]],
+        seasons: Optional[Callable[[T], Iterable[int]]] = None,
+        episodes: Optional[Callable[[T], Iterable[int]]] = None,
+        source: str = "",
+    ) -> List[T]:
+        if not entries or (self.year_pattern is None and self.season is None):
+            return entries
+        kept = [
+            entry for entry in entries
+            if self.keep(
+                title(entry),
+                seasons(entry) if seasons else (),
+                episodes(entry) if episodes else (),
+            )
+        ]
+        saved = len(entries) - len(kept)
+        if saved:
+            metrics.incr("prefilter.parses_saved", saved)
+            logger.debug(f"Filters: Pre-filter dropped {saved}/{len(entries)} {source} results before parsing")
+        return kept
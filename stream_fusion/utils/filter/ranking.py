@@ -0,0 +1,146 @@
+import heapq
+from typing import Callable, Dict, List, Tuple
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.filter_results import (
+    INDEXER_PRIORITY,
+    TORBOX_INDEXER_PRIORITY,
+    get_item_hdr_priority,
+    indexer_name,
+    is_torbox_config,
+    sort_quality,
+)
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+# Largeur en bits de chaque composante de la clé de tri
+LANGUAGE_BITS = 10
+RESOLUTION_BITS = 4
+SIZE_BITS = 50
+INDEXER_BITS = 10
+HDR_BITS = 7
+SEEDERS_BITS = 24
+
+# (valeur, largeur en bits), de la plus à la moins significative
+KeyPart = Tuple[int, int]
+KeyBuilder = Callable[[TorrentItem, "RankingEngine"], List[KeyPart]]
+
+SORT_KEY_BUILDERS: Dict[str, KeyBuilder] = {}
+
+
+def sort_key_builder(sort_method: str):
+    """Register the key builder of a sort method (the ``sort`` option of the config)."""
+    def register(builder: KeyBuilder) -> KeyBuilder:
+        SORT_KEY_BUILDERS[sort_method] = builder
+        return builder
+    return register
+
+
+def pack(parts: List[KeyPart]) -> int:
+    key = 0
+    for value, bits in parts:
+        key = (key << bits) | min(max(int(value), 0), (1 << bits) - 1)
+    return key
+
+
+def resolution_parts(item: TorrentItem) -> List[KeyPart]:
+    priority, unknown = sort_quality(item)
+    # Une résolution inconnue (inf) passe après toutes les autres
+    if priority == float("inf"):
+        priority = (1 << RESOLUTION_BITS) - 1
+    return [(priority, RESOLUTION_BITS), (int(unknown), 1)]
+
+
+def size_part(item: TorrentItem, descending: bool = False) -> KeyPart:
+    size = int(item.size)
+    return ((1 << SIZE_BITS) - 1 - size if descending else size), SIZE_BITS
+
+
+def tie_breaker_parts(item: TorrentItem, engine: "RankingEngine") -> List[KeyPart]:
+    return [
+        (engine.indexer_priority(item.indexer), INDEXER_BITS),
+        (get_item_hdr_priority(item), HDR_BITS),
+        (getattr(item, "language_priority", 999), LANGUAGE_BITS),
+        ((1 << SEEDERS_BITS) - 1 - int(item.seeders or 0), SEEDERS_BITS),
+    ]
+
+
+@sort_key_builder("quality")
+def quality_key(item, engine):
+    return [*resolution_parts(item), *tie_breaker_parts(item, engine)]
+
+
+@sort_key_builder("sizeasc")
+def size_ascending_key(item, engine):
+    return [size_part(item), *tie_breaker_parts(item, engine)]
+
+
+@sort_key_builder("sizedesc")
+def size_descending_key(item, engine):
+    return [size_part(item, descending=True), *tie_breaker_parts(item, engine)]
+
+
+@sort_key_builder("qualitythensize")
+def quality_then_size_key(item, engine):
+    return [*resolution_parts(item), size_part(item, descending=True), *tie_breaker_parts(item, engine)]
+
+
+class RankingEngine:
+    """Orders TorrentItems by the user's sort method, with one integer key per item.
+
+    The key packs the components of the sort tuple into a single int,
+    most significant first, so that comparing keys compares the tuples. It is
+    computed once and kept on the item until its size, its language priority
+    or the ranking options change.
+
+    With ``by_language``, items are first grouped by language priority.
+    """
+
+    def __init__(self, config: dict, by_language: bool = False):
+        self.sort_method = config.get("sort")
+        self.key_builder = SORT_KEY_BUILDERS.get(self.sort_method)
+        self.by_language = by_language
+        torbox = is_torbox_config(config)
+        self.indexer_priorities = TORBOX_INDEXER_PRIORITY if torbox else INDEXER_PRIORITY
+        self.signature = (self.sort_method, by_language, torbox)
+
+    def indexer_priority(self, indexer) -> int:
+        return self.indexer_priorities.get(indexer_name(indexer), 999)
+
+    def rank_key(self, item: TorrentItem) -> int:
+        language_priority = getattr(item, "language_priority", 999)
+        signature = (self.signature, item.size, language_priority)
+        if item._rank_key is not None and item._rank_key[0] == signature:
+            return item._rank_key[1]
+
+        parts = [(language_priority, LANGUAGE_BITS)] if self.by_language else []
+        if self.key_builder is not None:
+            parts.extend(self.key_builder(item, self))
+        key = pack(parts)
+        item._rank_key = (signature, key)
+        return key
+
+    def _can_sort(self) -> bool:
+        if self.sort_method is None:
+            logger.info("Filters: No sorting specified, keeping items in their original order")
+        elif self.key_builder is None:
+            logger.warning(f"Filters: Unrecognized sort method: {self.sort_method}. No sorting applied.")
+        return self.key_builder is not None or self.by_language
+
+    def sort(self, items: List[TorrentItem]) -> List[TorrentItem]:
+        if not self._can_sort():
+            return items
+        return sorted(items, key=self.rank_key)
+
+    def top(self, items: List[TorrentItem], count: int) -> List[TorrentItem]:
+        """The ``count`` first items of sort(items), without sorting the others."""
+        if not self._can_sort():
+            return items[:count]
+        if count >= len(items):
+            return sorted(items, key=self.rank_key)
+        return heapq.nsmallest(count, items, key=self.rank_key)
+
+    def rank(self, items: List[TorrentItem], language_priority_filter) -> List[TorrentItem]:
+        """Set the language priority of the items, then sort them."""
+        for item in items:
+            item.language_priority = language_priority_filter._get_language_priority(item)
+        return self.sort(items)
@@ -0,0 +1,122 @@
+from functools import cached_property
+from typing import List
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.filter.language_priority_filter import LanguagePriorityFilter
+from stream_fusion.utils.filter.ranking import RankingEngine
+from stream_fusion.utils.filter_results import get_item_hdr_priority, sort_quality
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+try:
+    import numpy as np
+except ImportError:  # extra "columnar" : sans numpy, RankingEngine trie les listes
+    np = None
+
+
+class ResultBatch:
+    """Struct-of-arrays view of TorrentItems for the final sort.
+
+    Each column is computed once per item, the first time it is needed, and
+    the ranking is a single lexsort. TorrentItems are only touched again to
+    return them in order.
+
+    Raises:
+        ValueError, TypeError: When a size or seeders count is not a number,
+            in which case callers fall back to the list implementation.
+    """
+
+    def __init__(self, items: List[TorrentItem], config: dict, language_priority_filter=None):
+        self.items = items
+        self.config = config
+        self.language_priority_filter = language_priority_filter or LanguagePriorityFilter(config)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _column(self, values, dtype):
+        return np.fromiter(values, dtype=dtype, count=len(self.items))
+
+    @cached_property
+    def size(self):
+        return self._column((int(item.size) for item in self.items), np.int64)
+
+    @cached_property
+    def seeders(self):
+        return self._column((int(item.seeders or 0) for item in self.items), np.int64)
+
+    @cached_property
+    def _sort_quality(self):
+        return [sort_quality(item) for item in self.items]
+
+    @cached_property
+    def resolution_rank(self):
+        # inf pour une résolution inconnue, comme sort_quality
+        return self._column((priority for priority, _ in self._sort_quality), np.float64)
+
+    @cached_property
+    def resolution_missing(self):
+        return self._column((missing for _, missing in self._sort_quality), np.bool_)
+
+    @cached_property
+    def hdr_rank(self):
+        return self._column((get_item_hdr_priority(item) for item in self.items), np.int16)
+
+    @cached_property
+    def indexer_rank(self):
+        ranking_engine = RankingEngine(self.config)
+        return self._column((ranking_engine.indexer_priority(item.indexer) for item in self.items), np.int16)
+
+    @cached_property
+    def language_priority(self):
+        priorities = [self.language_priority_filter._get_language_priority(item) for item in self.items]
+        for item, priority in zip(self.items, priorities):
+            item.language_priority = priority
+        return np.array(priorities, dtype=np.int16)
+
+    def order(self, sort_method):
+        """Indices of the items by language priority, then by the user's sort."""
+        if sort_method == "quality":
+            keys = [self.resolution_rank, self.resolution_missing]
+        elif sort_method == "sizeasc":
+            keys = [self.size]
+        elif sort_method == "sizedesc":
+            keys = [-self.size]
+        elif sort_method == "qualitythensize":
+            keys = [self.resolution_rank, self.resolution_missing, -self.size]
+        else:
+            logger.warning(f"Filters: Unrecognized sort method: {sort_method}. No sorting applied.")
+            keys = None
+        if keys is not None:
+            keys += [self.indexer_rank, self.hdr_rank, -self.seeders]
+        else:
+            keys = []
+        # lexsort trie d'abord sur la dernière clé, et il est stable comme sorted()
+        return np.lexsort([*reversed(keys), self.language_priority])
+
+    def rank(self) -> List[TorrentItem]:
+        return [self.items[index] for index in self.order(self.config.get("sort"))]
+
+
+def batch_enabled(items) -> bool:
+    return np is not None and len(items) >= settings.result_batch_threshold
+
+
+def rank_results(items, config, language_priority_filter=None):
+    """Rank by language priority then by the user's sort, on a ResultBatch for large batches and with a RankingEngine otherwise."""
+    language_priority_filter = language_priority_filter or LanguagePriorityFilter(config)
+    logger.info(f"Filters: Ranking {len(items)} items by language priority, then by {config.get('sort')}")
+    ranked = None
+    if batch_enabled(items):
+        try:
+            ranked = ResultBatch(items, config, language_priority_filter).rank()
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Filters: Cannot batch {len(items)} items, ranking them one by one: {e}")
+    if ranked is None:
+        try:
+            ranked = RankingEngine(config, by_language=True).rank(items, language_priority_filter)
+        except Exception as e:
+            logger.error("Filters: Error while applying language priority filter", exc_info=e)
+            ranked = items
+    logger.success(f"Filters: Filtering complete. Final item count: {len(ranked)}")
+    return ranked
@@ -1,11 +1,13 @@
 from stream_fusion.utils.filter.base_filter import BaseFilter
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.parser.tag_scanner import KeywordMatcher
 
 
 class TitleExclusionFilter(BaseFilter):
     def __init__(self, config):
         super().__init__(config)
         self.excluded_keywords = {keyword.upper() for keyword in self.config.get('exclusionKeywords', [])}
+        self.keyword_matcher = KeywordMatcher(self.excluded_keywords)
 
     def filter(self, data):
         filtered_items = []
@@ -18,11 +20,10 @@ class TitleExclusionFilter(BaseFilter):
 
     def _should_include_stream(self, stream):
         try:
-            title_upper = stream.raw_title.upper()
-            for keyword in self.excluded_keywords:
-                if keyword in title_upper:
-                    logger.trace(f"Excluded stream: {stream.raw_title} (keyword: {keyword})")
-                    return False
+            keyword = self.keyword_matcher.find(stream.raw_title)
+            if keyword is not None:
+                logger.trace(f"Excluded stream: {stream.raw_title} (keyword: {keyword})")
+                return False
             return True
         except AttributeError:
             logger.warning(f"Stream has no title attribute: {stream}")
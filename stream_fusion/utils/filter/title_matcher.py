@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from cachetools import LRUCache
+from redis.asyncio import Redis
+from RTN import title_match
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+
+INTEGRALE_PATTERN = re.compile(r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE)
+
+# Au-delà, les nouveaux verdicts restent en mémoire mais ne sont plus poussés vers Redis
+MAX_PENDING = 20000
+
+
+def clean_tmdb_title(title):
+    # Dictionary of characters to filter, grouped by category
+    characters_to_filter = {
+        "punctuation": r'<>"/\\|?*',
+        "control": r"\x00-\x1F",
+        "symbols": r"\u2122\u00AE\u00A9\u2120\u00A1\u00BF\u2013\u2014\u2018\u2019\u201C\u201D\u2022\u2026",
+        "spaces": r"\s+",
+    }
+
+    filter_pattern = "".join([f"[{chars}]" for chars in characters_to_filter.values()])
+    cleaned_title = re.sub(r":(\S)", r" \1", title)
+    cleaned_title = re.sub(r"\s*:\s*", " ", cleaned_title)
+    cleaned_title = re.sub(filter_pattern, " ", cleaned_title)
+    cleaned_title = cleaned_title.strip()
+    cleaned_title = re.sub(characters_to_filter["spaces"], " ", cleaned_title)
+
+    return cleaned_title
+
+
+@lru_cache(maxsize=65536)
+def title_words(title: str) -> Tuple[str, ...]:
+    return tuple(title.lower().split())
+
+
+def is_ordered_subset(subset_words: Tuple[str, ...], full_set_words: Tuple[str, ...]) -> bool:
+    subset_index = 0
+    for word in full_set_words:
+        if subset_index < len(subset_words) and word == subset_words[subset_index]:
+            subset_index += 1
+    return subset_index == len(subset_words)
+
+
+class TitleMatchCache:
+    """Verdicts of TitleMatcher, shared by every worker through Redis.
+
+    Lookups only hit an in-process LRU. New verdicts are written behind to one
+    Redis hash per set of media titles, and ``warm`` loads the verdicts of
+    other workers before a batch of items is matched.
+    """
+
+    KEY = "titlematch:{}"
+
+    def __init__(self, maxsize: int):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._pending: Dict[str, Dict[str, bool]] = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._client: Redis | None = None
+
+    def get_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+        return self._client
+
+    def get(self, digest: str, item_title: str) -> Optional[bool]:
+        with self._lock:
+            return self._entries.get((digest, item_title))
+
+    def put(self, digest: str, item_title: str, verdict: bool) -> None:
+        with self._lock:
+            self._entries[(digest, item_title)] = verdict
+            if self._pending_count < MAX_PENDING:
+                self._pending.setdefault(digest, {})[item_title] = verdict
+                self._pending_count += 1
+
+    def known(self, digest: str, item_titles: Iterable[str]) -> Dict[str, bool]:
+        with self._lock:
+            return {
+                title: self._entries[(digest, title)]
+                for title in item_titles
+                if (digest, title) in self._entries
+            }
+
+    def preload(self, digest: str, verdicts: Dict[str, bool]) -> None:
+        """Add verdicts computed elsewhere, without writing them back to Redis."""
+        with self._lock:
+            for title, verdict in verdicts.items():
+                self._entries[(digest, title)] = verdict
+
+    def take_pending(self) -> Dict[str, Dict[str, bool]]:
+        with self._lock:
+            pending, self._pending, self._pending_count = self._pending, {}, 0
+        return pending
+
+    def record(self, pending: Dict[str, Dict[str, bool]]) -> None:
+        """Add the verdicts computed by a pool process, as if computed here."""
+        for digest, verdicts in pending.items():
+            for title, verdict in verdicts.items():
+                self.put(digest, title, verdict)
+
+    async def warm(self, digest: str, item_titles: Iterable[str]) -> int:
+        """Load from Redis the verdicts of item titles missing from the LRU.
+
+        Returns:
+            int: The number of verdicts found in Redis.
+        """
+        with self._lock:
+            missing = list({title for title in item_titles if (digest, title) not in self._entries})
+        if not missing:
+            return 0
+
+        try:
+            values = await self.get_client().hmget(self.KEY.format(digest), missing)
+        except Exception as e:
+            logger.warning(f"Filters: Failed to read {len(missing)} title matches from Redis: {e}")
+            return 0
+
+        loaded = {title: value == b"1" for title, value in zip(missing, values) if value is not None}
+        self.preload(digest, loaded)
+        metrics.incr("title_match.redis_hit", len(loaded))
+        metrics.incr("title_match.redis_miss", len(missing) - len(loaded))
+        return len(loaded)
+
+    async def flush(self) -> None:
+        pending = self.take_pending()
+        if not pending:
+            return
+        try:
+            async with self.get_client().pipeline(transaction=False) as pipe:
+                for digest, verdicts in pending.items():
+                    key = self.KEY.format(digest)
+                    pipe.hset(key, mapping={title: int(verdict) for title, verdict in verdicts.items()})
+                    pipe.expire(key, settings.title_cache_expiration)
+                await pipe.execute()
+        except Exception as e:
+            # Pas de nouvelle tentative : au pire le titre sera comparé à nouveau ailleurs
+            logger.warning(f"Filters: Failed to write title matches to Redis: {e}")
+
+    async def run_flusher(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(settings.metrics_flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+title_match_cache = TitleMatchCache(settings.title_match_cache_size)
+
+
+class TitleMatcher:
+    """Tells whether an item is one of the titles of a media.
+
+    The media titles are cleaned and tokenised once. Verdicts are memoised in
+    title_match_cache by (media titles, cleaned item title), so an item title
+    only goes through the fuzzy title_match once for a given media.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        cleaned_titles = [clean_tmdb_title(title) for title in titles]
+        self.titles: List[str] = [INTEGRALE_PATTERN.sub("", title).strip() for title in cleaned_titles]
+        self._title_words = [title_words(title) for title in self.titles]
+        self.digest = hashlib.sha1("\n".join(sorted(set(self.titles))).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def item_title(item) -> str:
+        # If parsed_data is None or invalid, use raw_title as fallback
+        if item.parsed_data and hasattr(item.parsed_data, 'parsed_title'):
+            return INTEGRALE_PATTERN.sub("", item.parsed_data.parsed_title).strip()
+        return INTEGRALE_PATTERN.sub("", item.raw_title).strip()
+
+    @staticmethod
+    def always_matches(item) -> bool:
+        # Les résultats YggFlix sont déjà associés au média par son id TMDB
+        return bool(item.indexer and "Yggtorrent" in item.indexer)
+
+    def matches_title(self, item_title: str) -> bool:
+        verdict = title_match_cache.get(self.digest, item_title)
+        if verdict is not None:
+            metrics.incr("title_match.hit")
+            return verdict
+
+        metrics.incr("title_match.miss")
+        verdict = self._compare(item_title)
+        title_match_cache.put(self.digest, item_title, verdict)
+        return verdict
+
+    def _compare(self, item_title: str) -> bool:
+        item_words = title_words(item_title)
+        for title, words in zip(self.titles, self._title_words):
+            if is_ordered_subset(item_words, words) or is_ordered_subset(words, item_words):
+                logger.trace(f"Filters: Ordered subset match found. Item accepted: {item_title}")
+                return True
+            if title_match(title, item_title):
+                logger.trace(f"Filters: title_match() succeeded with {title}. Item accepted: {item_title}")
+                return True
+        logger.trace(f"Filters: No match found, item skipped: {item_title}")
+        return False
+
+    def matches(self, item) -> bool:
+        if self.always_matches(item):
+            logger.debug(f"Filters: YggFlix item detected, accepting: {item.raw_title}")
+            return True
+        return self.matches_title(self.item_title(item))
+
+    def item_titles(self, items) -> List[str]:
+        """The titles matches_title will be asked about for the items already parsed.
+
+        Items not parsed yet are left out: they are parsed where they are
+        judged, and only once they have passed the cheap checks of the plan.
+        """
+        return [
+            self.item_title(item)
+            for item in items
+            if item.parsed_data_if_loaded is not None and not self.always_matches(item)
+        ]
+
+    async def warm(self, items) -> int:
+        return await title_match_cache.warm(self.digest, self.item_titles(items))
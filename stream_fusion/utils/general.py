@@ -1,9 +1,9 @@
 from datetime import datetime, timezone
 from typing import Optional, List, Dict
-from RTN import parse
 import re
 
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.parser.title_cache import parse_title
 
 video_formats = {".mkv", ".mp4", ".avi", ".mov", ".flv", ".wmv", ".webm", ".mpg", ".mpeg", ".m4v", ".3gp", ".3g2",
                  ".ogv",
@@ -16,7 +16,7 @@ def season_episode_in_filename(filename, season, episode):
     if not is_video_file(filename):
         return False
 
-    parsed_name = parse(filename)
+    parsed_name = parse_title(filename)
 
     return season in parsed_name.seasons and episode in parsed_name.episodes
 
@@ -1,4 +1,4 @@
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import parse_title
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
@@ -45,7 +45,7 @@ class JackettResult:
         if len(self.info_hash) != 40:
             raise ValueError(f"The hash '{self.info_hash}' does not have the expected length of 40 characters.")
         
-        parsed_result = parse(cached_item['title'])
+        parsed_result = parse_title(cached_item['title'])
 
         self.raw_title = cached_item['title']
         self.indexer = "Public - Cache"  # Cache doesn't return an indexer sadly (It stores it tho)
@@ -4,13 +4,13 @@ import aiohttp
 import xml.etree.ElementTree as ET
 from typing import List, Optional
 
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title, title_cache
 
+from stream_fusion.utils.filter.prefilter import RawPrefilter
 from stream_fusion.utils.jackett.jackett_indexer import JackettIndexer
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
-from stream_fusion.utils.detection import detect_languages
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
@@ -68,6 +68,9 @@ class JackettService:
                     if sublist:
                         results.extend(sublist)
 
+        # Les résultats hors saison, épisode ou année ne sont jamais analysés
+        results = RawPrefilter(media).select(results, lambda result: result.raw_title, source="Jackett")
+        await title_cache.warm(result.raw_title for result in results)
         return self.__post_process_results(results, media)
 
     async def __search_indexer_wrapper(self, media, indexer, search_func):
@@ -304,10 +307,10 @@ class JackettService:
 
     def __post_process_results(self, results: List[JackettResult], media) -> List[JackettResult]:
         for result in results:
-            parsed_result = parse(result.raw_title)
+            parsed_result = parse_title(result.raw_title)
 
             result.parsed_data = parsed_result
-            result.languages = detect_languages(result.raw_title)
+            result.languages = analyze_title(result.raw_title).detected_languages()
             result.type = media.type
 
             if isinstance(media, Series):
@@ -66,3 +66,29 @@ class TMDB(MetadataProvider):
 
         self.logger.info("Got metadata for " + type + " with id " + id)
         return result
+
+    async def get_season_episode_counts(self, tmdb_id) -> dict:
+        """Return {season_number: aired episode count} for a TV show, specials excluded."""
+        session = await self._get_session()
+        url = f"https://api.themoviedb.org/3/tv/{tmdb_id}?api_key={settings.tmdb_api_key}"
+
+        # Appelé hors requête par le pre-fetch : on borne l'attente même si la session partagée n'a pas de timeout
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            if response.status != 200:
+                raise ValueError(f"TMDB returned status {response.status} for series {tmdb_id}")
+            data = await response.json()
+
+        counts = {
+            int(season["season_number"]): int(season.get("episode_count") or 0)
+            for season in data.get("seasons", [])
+            if season.get("season_number")
+        }
+
+        # La saison en cours de diffusion ne compte que les épisodes déjà sortis
+        last_aired = data.get("last_episode_to_air") or {}
+        if last_aired.get("season_number") in counts:
+            last_season = int(last_aired["season_number"])
+            counts[last_season] = int(last_aired.get("episode_number") or counts[last_season])
+            counts = {season: count for season, count in counts.items() if season <= last_season}
+
+        return counts
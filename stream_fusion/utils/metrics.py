@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Dict
+
+from redis.asyncio import Redis
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+
+class Metrics:
+    """Lightweight counters shared by all gunicorn workers.
+
+    Increments are cheap in-memory operations usable from sync code; each worker
+    periodically flushes its pending counters into a single Redis hash so the
+    monitoring endpoint can report cluster-wide totals.
+    """
+
+    REDIS_KEY = "metrics:counters"
+
+    def __init__(self):
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._client: Redis | None = None
+
+    def get_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+        return self._client
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._pending[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration as a ``.count`` / ``.seconds`` counter pair."""
+        with self._lock:
+            self._pending[f"{name}.count"] += 1
+            self._pending[f"{name}.seconds"] += seconds
+
+    def _drain(self) -> Dict[str, float]:
+        with self._lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+        return pending
+
+    async def flush(self) -> None:
+        pending = self._drain()
+        if not pending:
+            return
+        try:
+            client = self.get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for name, value in pending.items():
+                    if isinstance(value, float) and not value.is_integer():
+                        pipe.hincrbyfloat(self.REDIS_KEY, name, value)
+                    else:
+                        pipe.hincrby(self.REDIS_KEY, name, int(value))
+                await pipe.execute()
+        except Exception as e:
+            # Put the counters back so they are retried on the next flush
+            with self._lock:
+                self._pending.update(pending)
+            logger.warning(f"Metrics: Failed to flush counters to Redis: {e}")
+
+    async def snapshot(self) -> Dict[str, float]:
+        await self.flush()
+        raw = await self.get_client().hgetall(self.REDIS_KEY)
+        counters = {}
+        for name, value in raw.items():
+            name = name.decode() if isinstance(name, bytes) else name
+            value = float(value)
+            counters[name] = int(value) if value.is_integer() else round(value, 3)
+        return dict(sorted(counters.items()))
+
+    async def run_flusher(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(settings.metrics_flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+metrics = Metrics()
@@ -8,9 +8,8 @@ from stream_fusion.utils.models.media import Media
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.utils.string_encoding import encodeb64
 
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title, title_cache
 from stream_fusion.utils.parser.parser_utils import (
-    detect_french_language,
-    extract_release_group,
     filter_by_availability,
     filter_by_direct_torrent,
     get_emoji,
@@ -32,6 +31,7 @@ class StreamParser:
 
         # Limite le nombre de résultats
         limited_items = torrent_items[: int(self.config["maxResults"])]
+        await title_cache.warm(item.raw_title for item in limited_items)
 
         # Créer des tâches async pour chaque torrent_item
         tasks = [
@@ -86,11 +86,9 @@ class StreamParser:
     ) -> List[Dict]:
         """Version synchrone du parsing (CPU-bound)"""
         # Ensure parsed_data is valid ParsedData object, not string or dict
-        from RTN import parse
-
         # Force reparsing if not ParsedData
         if torrent_item.parsed_data is None or not isinstance(torrent_item.parsed_data, ParsedData):
-            torrent_item.parsed_data = parse(torrent_item.raw_title)
+            torrent_item.parsed_data = parse_title(torrent_item.raw_title)
 
         parsed_data: ParsedData = torrent_item.parsed_data
         name = self._create_stream_name(torrent_item, parsed_data)
@@ -135,7 +133,7 @@ class StreamParser:
             resolution = torrent_item.parsed_data.resolution if torrent_item.parsed_data.resolution else "Unknown"
 
             # Ajouter la team si disponible pour une meilleure granularité
-            team = extract_release_group(torrent_item.raw_title) or torrent_item.parsed_data.group
+            team = analyze_title(torrent_item.raw_title).release_group or torrent_item.parsed_data.group
             if team:
                 return f"stream-fusion-{series_id}-{resolution}-{team}"
             else:
@@ -191,11 +189,11 @@ class StreamParser:
             else "🌐"
         )
 
-        lang_type = detect_french_language(torrent_item.raw_title)
-        if lang_type:
-            info += f"  ✔ {lang_type} "
+        analysis = analyze_title(torrent_item.raw_title)
+        if analysis.french_tag:
+            info += f"  ✔ {analysis.french_tag} "
 
-        group = extract_release_group(torrent_item.raw_title) or parsed_data.group
+        group = analysis.release_group or parsed_data.group
         if group:
             info += f"  ☠️ {group}"
 
@@ -0,0 +1,81 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+from stream_fusion.constants import FR_RELEASE_GROUPS, FRENCH_PATTERNS, LANGUAGE_PATTERNS
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def compile_release_groups(patterns) -> re.Pattern:
+    """One regex for all the release group patterns; the group name is in the ``group`` group."""
+    before, after = r"(?<=[.\s\-\[])", r"(?=[.\s\-$$]|$)"
+    if all(pattern.startswith(before) and pattern.endswith(after) for pattern in patterns):
+        # Même contexte pour tous les motifs : le séparateur est cherché une seule fois par
+        # position, et re saute directement aux caractères qui peuvent le précéder
+        names = "|".join(pattern[len(before):-len(after)] for pattern in patterns)
+        return re.compile(rf"[.\s\-\[](?P<group>{names}){after}")
+    return re.compile(f"(?P<group>{'|'.join(patterns)})")
+
+
+RELEASE_GROUP_PATTERN = compile_release_groups(FR_RELEASE_GROUPS)
+
+_LANGUAGE_REGEXES = [(language, re.compile(pattern, re.IGNORECASE)) for language, pattern in LANGUAGE_PATTERNS.items()]
+_FRENCH_REGEXES = [(tag, re.compile(pattern, re.IGNORECASE)) for tag, pattern in FRENCH_PATTERNS.items()]
+
+
+@dataclass(frozen=True)
+class TitleTags:
+    """What a single scan of a raw title finds in it."""
+
+    languages: Tuple[str, ...]  # dans l'ordre de LANGUAGE_PATTERNS, comme find_languages
+    french_tag: Optional[str]  # premier tag de FRENCH_PATTERNS présent, comme detect_french_language
+    release_group: Optional[str]  # premier groupe FR_RELEASE_GROUPS trouvé, comme extract_release_group
+
+
+@lru_cache(maxsize=65536)
+def word_tags(word: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """The languages and French tags a single word of a title stands for."""
+    # Les motifs sont entourés de \b et ne reconnaissent que des mots entiers :
+    # les tester sur chaque mot revient à les chercher dans tout le titre
+    return (
+        frozenset(language for language, regex in _LANGUAGE_REGEXES if regex.fullmatch(word)),
+        frozenset(tag for tag, regex in _FRENCH_REGEXES if regex.fullmatch(word)),
+    )
+
+
+def scan_title(title: str) -> TitleTags:
+    """Find the languages, French tag and release group of a title in one pass over its words."""
+    languages, french_tags = set(), set()
+    for word in set(WORD_PATTERN.findall(title)):
+        word_languages, word_french_tags = word_tags(word)
+        languages |= word_languages
+        french_tags |= word_french_tags
+
+    group_match = RELEASE_GROUP_PATTERN.search(title)
+    return TitleTags(
+        languages=tuple(language for language in LANGUAGE_PATTERNS if language in languages),
+        french_tag=next((tag for tag in FRENCH_PATTERNS if tag in french_tags), None),
+        release_group=group_match.group("group") if group_match else None,
+    )
+
+
+class KeywordMatcher:
+    """Case-insensitive substring search for a set of keywords, compiled once per config."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = {keyword.upper() for keyword in keywords if keyword}
+        # Les plus longs d'abord, pour rapporter le mot-clé le plus précis
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, alternatives))) if alternatives else None
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def find(self, title: str) -> Optional[str]:
+        """The first keyword found in the title, or None."""
+        if self._regex is None:
+            return None
+        match = self._regex.search(title.upper())
+        return match.group(0) if match else None
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import LRUCache
+from redis.asyncio import Redis
+from RTN import parse
+from RTN.models import ParsedData
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.parser.tag_scanner import scan_title
+
+# Au-delà, les nouveaux titres restent en mémoire mais ne sont plus poussés vers Redis
+MAX_PENDING = 20000
+
+
+@dataclass
+class TitleAnalysis:
+    """The RTN parse of a raw title and the facts we derive from it."""
+
+    parsed: ParsedData
+    languages: List[str] = field(default_factory=list)  # sans la langue par défaut
+    french_tag: Optional[str] = None
+    release_group: Optional[str] = None
+
+    @classmethod
+    def from_title(cls, raw_title: str) -> "TitleAnalysis":
+        parsed = parse(raw_title)
+        tags = scan_title(raw_title)
+        return cls(
+            parsed=parsed,
+            languages=list(tags.languages),
+            french_tag=tags.french_tag,
+            release_group=tags.release_group or parsed.group,
+        )
+
+    def detected_languages(self, default_language: str = "en") -> List[str]:
+        return list(self.languages) or [default_language]
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "parsed": self.parsed.model_dump(mode="json"),
+            "languages": self.languages,
+            "french_tag": self.french_tag,
+            "release_group": self.release_group,
+        })
+
+    @classmethod
+    def from_json(cls, data) -> "TitleAnalysis":
+        value = json.loads(data)
+        return cls(
+            parsed=ParsedData(**value["parsed"]),
+            languages=value["languages"],
+            french_tag=value["french_tag"],
+            release_group=value["release_group"],
+        )
+
+
+class TitleCache:
+    """Two-tier cache of title analyses, shared by every RTN.parse call site.
+
+    Lookups are synchronous and only hit a bounded in-process LRU, so they can be
+    used from the parsing code as is. Titles parsed by this worker are written
+    behind to Redis, and ``warm`` loads the analyses computed by other workers
+    before a batch of titles is parsed.
+    """
+
+    KEY = "title:{}"
+
+    def __init__(self, maxsize: int):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._pending: Dict[str, TitleAnalysis] = {}
+        self._lock = threading.Lock()
+        self._client: Redis | None = None
+
+    @classmethod
+    def key(cls, raw_title: str) -> str:
+        return cls.KEY.format(hashlib.sha1(raw_title.encode("utf-8")).hexdigest())
+
+    def get_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+        return self._client
+
+    def analyze(self, raw_title: str) -> TitleAnalysis:
+        key = self.key(raw_title)
+        with self._lock:
+            analysis = self._entries.get(key)
+        if analysis is not None:
+            metrics.incr("title_cache.hit")
+            return analysis
+
+        metrics.incr("title_cache.miss")
+        analysis = TitleAnalysis.from_title(raw_title)
+        with self._lock:
+            self._entries[key] = analysis
+            if len(self._pending) < MAX_PENDING:
+                self._pending[key] = analysis
+        return analysis
+
+    def parse(self, raw_title: str) -> ParsedData:
+        return self.analyze(raw_title).parsed
+
+    async def warm(self, titles: Iterable[Optional[str]]) -> int:
+        """Load from Redis the analyses of titles missing from the LRU.
+
+        Returns:
+            int: The number of titles found in Redis.
+        """
+        missing = {}
+        with self._lock:
+            for title in titles:
+                if not title:
+                    continue
+                key = self.key(title)
+                if key not in self._entries:
+                    missing[key] = title
+        if not missing:
+            return 0
+
+        try:
+            values = await self.get_client().mget(list(missing))
+        except Exception as e:
+            logger.warning(f"TitleCache: Failed to read {len(missing)} titles from Redis: {e}")
+            return 0
+
+        loaded = {}
+        for key, value in zip(missing, values):
+            if value is None:
+                continue
+            try:
+                loaded[key] = TitleAnalysis.from_json(value)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.debug(f"TitleCache: Ignoring unreadable entry for {missing[key]!r}: {e}")
+        with self._lock:
+            self._entries.update(loaded)
+
+        metrics.incr("title_cache.redis_hit", len(loaded))
+        metrics.incr("title_cache.redis_miss", len(missing) - len(loaded))
+        return len(loaded)
+
+    async def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            async with self.get_client().pipeline(transaction=False) as pipe:
+                for key, analysis in pending.items():
+                    pipe.set(key, analysis.to_json(), ex=settings.title_cache_expiration, nx=True)
+                await pipe.execute()
+        except Exception as e:
+            # Pas de nouvelle tentative : au pire le titre sera analysé à nouveau ailleurs
+            logger.warning(f"TitleCache: Failed to write {len(pending)} titles to Redis: {e}")
+
+    async def run_flusher(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(settings.metrics_flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+title_cache = TitleCache(settings.title_cache_size)
+
+
+def parse_title(raw_title: str) -> ParsedData:
+    """Drop-in replacement for RTN.parse backed by the title cache."""
+    return title_cache.parse(raw_title)
+
+
+def analyze_title(raw_title: str) -> TitleAnalysis:
+    return title_cache.analyze(raw_title)
@@ -0,0 +1,4 @@
+from stream_fusion.utils.prefetch.lookahead import BingeLookahead, LookaheadPlan, PreferredSource
+from stream_fusion.utils.prefetch.scheduler import PrefetchJob, PrefetchScheduler
+
+__all__ = ["BingeLookahead", "LookaheadPlan", "PreferredSource", "PrefetchJob", "PrefetchScheduler"]
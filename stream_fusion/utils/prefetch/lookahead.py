@@ -0,0 +1,177 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.general import get_info_hash_from_magnet
+from stream_fusion.utils.metdata.tmdb import TMDB
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.parser.parser_utils import extract_release_group
+from stream_fusion.utils.parser.title_cache import analyze_title
+
+BINGE_HISTORY_KEY = "binge:{}:{}"
+SEASON_COUNTS_KEY = "tmdb:seasons:{}"
+
+
+async def record_playback(redis_cache: RedisCache, user_identifier: str, stream_id: str, service: str) -> None:
+    """Index a series playback next to its current_source entry so binges can be detected."""
+    try:
+        series_id, season, episode = stream_id.split(":")
+        key = BINGE_HISTORY_KEY.format(user_identifier, series_id)
+        client = await redis_cache.get_redis_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {f"{int(season)}:{int(episode)}:{service or ''}": time.time()})
+            pipe.zremrangebyrank(key, 0, -(settings.prefetch_binge_history_size + 1))
+            pipe.expire(key, settings.prefetch_binge_window)
+            await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Pre-fetch: Unable to record playback of {stream_id}: {str(e)}")
+
+
+@dataclass
+class PreferredSource:
+    """The torrent the viewer is currently watching the series from."""
+
+    info_hash: Optional[str]
+    release_group: Optional[str]
+
+    def promote(self, items: list) -> list:
+        """Move the same season pack, then the same release group, ahead of the rest.
+
+        Keeping them first means ResultsPerQualityFilter never cuts them, so the
+        next episodes are served from the torrent already in use.
+        """
+        same_pack, same_group, others = [], [], []
+        for item in items:
+            if self.info_hash and (item.info_hash or "").lower() == self.info_hash:
+                same_pack.append(item)
+            elif self.release_group and self._group_of(item) == self.release_group:
+                same_group.append(item)
+            else:
+                others.append(item)
+        if same_pack or same_group:
+            logger.debug(
+                f"Pre-fetch: Promoted {len(same_pack)} same-pack and {len(same_group)} same-group results"
+            )
+        return same_pack + same_group + others
+
+    @staticmethod
+    def _group_of(item) -> Optional[str]:
+        group = extract_release_group(item.raw_title)
+        if not group and item.parsed_data is not None:
+            group = getattr(item.parsed_data, "group", None)
+        return group.lower() if group else None
+
+
+@dataclass
+class LookaheadPlan:
+    episode_ids: List[str]
+    preferred: Optional[PreferredSource]
+
+
+class BingeLookahead:
+    """Decide how many episodes to prefetch from the viewer's recent playbacks.
+
+    A viewer who just watched k consecutive episodes gets k episodes prefetched
+    (capped by ``prefetch_max_lookahead``), crossing season boundaries with the
+    TMDB episode counts when they are available.
+    """
+
+    def __init__(self, redis_cache: RedisCache, search):
+        self.redis_cache = redis_cache
+        self.search = search
+
+    async def plan(self, media: Series) -> LookaheadPlan:
+        series_id = media.id.split(":")[0]
+        history = await self._history(series_id)
+        depth = min(settings.prefetch_max_lookahead, max(1, self._streak(history)))
+        season_counts = await self._season_counts(media)
+        episode_ids = self._following_episodes(media, depth, season_counts)
+        preferred = await self._preferred_source(series_id, history)
+        logger.debug(
+            f"Pre-fetch: Lookahead for {media.id}: depth {depth}, episodes {episode_ids}, "
+            f"preferred {preferred}"
+        )
+        return LookaheadPlan(episode_ids, preferred)
+
+    async def _history(self, series_id: str) -> List[Tuple[int, int, str]]:
+        """Recent playbacks as (season, episode, service), most recent first."""
+        client = await self.redis_cache.get_redis_client()
+        key = BINGE_HISTORY_KEY.format(self.search.user_identifier, series_id)
+        since = time.time() - settings.prefetch_binge_window
+        members = await client.zrevrangebyscore(key, "+inf", since)
+        history = []
+        for member in members:
+            member = member.decode() if isinstance(member, bytes) else member
+            season, episode, service = member.split(":", 2)
+            history.append((int(season), int(episode), service))
+        return history
+
+    @staticmethod
+    def _streak(history: List[Tuple[int, int, str]]) -> int:
+        """Number of consecutive episodes at the end of the viewing history."""
+        if not history:
+            return 0
+        streak = 1
+        season, episode, _ = history[0]
+        for previous_season, previous_episode, _ in history[1:]:
+            same_season = previous_season == season and previous_episode == episode - 1
+            season_change = previous_season == season - 1 and episode == 1
+            if not (same_season or season_change):
+                break
+            streak += 1
+            season, episode = previous_season, previous_episode
+        return streak
+
+    async def _season_counts(self, media: Series) -> Dict[int, int]:
+        if not (settings.tmdb_api_key and media.tmdb_id):
+            return {}
+        key = SEASON_COUNTS_KEY.format(media.tmdb_id)
+        counts = await self.redis_cache.get(key)
+        if counts is None:
+            try:
+                tmdb = TMDB(self.search.config, session=self.search.http_session)
+                counts = await tmdb.get_season_episode_counts(media.tmdb_id)
+                await self.redis_cache.set(key, counts, expiration=86400)
+            except Exception as e:
+                logger.debug(f"Pre-fetch: Unable to get TMDB season counts for {media.tmdb_id}: {str(e)}")
+                return {}
+        return {int(season): count for season, count in counts.items()}
+
+    @staticmethod
+    def _following_episodes(media: Series, depth: int, season_counts: Dict[int, int]) -> List[str]:
+        series_id = media.id.split(":")[0]
+        season = media.get_season_number()
+        episode = media.get_episode_number()
+        episode_ids = []
+        for _ in range(depth):
+            episode += 1
+            if season in season_counts and episode > season_counts[season]:
+                if season + 1 not in season_counts:
+                    break
+                season, episode = season + 1, 1
+            episode_ids.append(f"{series_id}:{season}:{episode}")
+        return episode_ids
+
+    async def _preferred_source(self, series_id: str, history) -> Optional[PreferredSource]:
+        if not history:
+            return None
+        season, episode, service = history[0]
+        source_key = f"current_source:{self.search.user_identifier}:{series_id}:{season}:{episode}:{service}"
+        source = await self.redis_cache.get(source_key)
+        if not source or not source.get("magnet"):
+            return None
+
+        magnet = source["magnet"]
+        info_hash = source.get("info_hash") or get_info_hash_from_magnet(magnet)
+        name = parse_qs(urlparse(magnet).query).get("dn", [source.get("raw_title") or ""])[0]
+        release_group = None
+        if name:
+            release_group = analyze_title(name).release_group
+        return PreferredSource(
+            info_hash=info_hash.lower() if info_hash else None,
+            release_group=release_group.lower() if release_group else None,
+        )
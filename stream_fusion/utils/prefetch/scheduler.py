@@ -0,0 +1,242 @@
+import asyncio
+import itertools
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Set
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.redis.redis_config import get_background_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.prefetch.lookahead import BingeLookahead, PreferredSource
+
+# Sémaphore distribuée : les baux expirés sont purgés avant de compter les places
+ACQUIRE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+@dataclass(order=True)
+class PrefetchJob:
+    priority: float
+    distance: int
+    sequence: int
+    key: str = field(compare=False)
+    media_id: str = field(compare=False)
+    media_type: str = field(compare=False)
+    search: object = field(compare=False)
+    preferred: Optional[PreferredSource] = field(default=None, compare=False)
+
+
+def episode_media(media: Series, episode_id: str) -> Series:
+    """Build a Series sharing media's titles for the given stremio episode id."""
+    _, season, episode = episode_id.split(":")
+    return Series(
+        id=episode_id,
+        tmdb_id=media.tmdb_id,
+        titles=media.titles,
+        season=f"S{int(season):02d}",
+        episode=f"E{int(episode):02d}",
+        languages=media.languages,
+    )
+
+
+class PrefetchScheduler:
+    """Per-worker prefetch queue with cluster-wide deduplication and concurrency.
+
+    Jobs are ordered by series popularity, deduplicated locally and through a
+    Redis claim, and run by a fixed number of consumers. Each running job holds
+    a lease in a Redis sorted set so the whole cluster never runs more than
+    ``prefetch_cluster_concurrency`` prefetches at once. Prefetching is the first
+    thing dropped when the event loop falls behind or the queue is full.
+    """
+
+    POPULARITY_KEY = "prefetch:popularity:{}"
+    CLAIM_KEY = "lock:prefetch:{}"
+    SLOTS_KEY = "prefetch:slots"
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=settings.prefetch_queue_size)
+        self._queued: Set[str] = set()
+        self._sequence = itertools.count()
+        self._consumers: list[asyncio.Task] = []
+        self._lag_monitor: Optional[asyncio.Task] = None
+        self._planning: Set[asyncio.Task] = set()
+        self._acquire_slot = None
+        self.loop_lag = 0.0
+
+    @property
+    def overloaded(self) -> bool:
+        return self.loop_lag > settings.prefetch_max_loop_lag
+
+    async def _redis(self):
+        return await get_background_redis_cache().get_redis_client()
+
+    def start(self) -> None:
+        if not settings.prefetch_enabled:
+            logger.info("Pre-fetch: Scheduler disabled")
+            return
+        self._lag_monitor = asyncio.create_task(self._monitor_loop_lag())
+        self._consumers = [
+            asyncio.create_task(self._consume(index))
+            for index in range(settings.prefetch_workers)
+        ]
+        logger.info(f"Pre-fetch: Scheduler started with {settings.prefetch_workers} consumers")
+
+    async def stop(self) -> None:
+        tasks = self._consumers + list(self._planning) + ([self._lag_monitor] if self._lag_monitor else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._consumers = []
+        self._planning.clear()
+        self._lag_monitor = None
+
+    async def _monitor_loop_lag(self) -> None:
+        interval = 0.5
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(interval)
+            # Moyenne glissante pour ne pas réagir à un pic isolé
+            lag = max(0.0, loop.time() - before - interval)
+            self.loop_lag = 0.7 * self.loop_lag + 0.3 * lag
+
+    async def _popularity(self, client, series_id: str) -> float:
+        key = self.POPULARITY_KEY.format(series_id)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, 86400)
+            count, _ = await pipe.execute()
+        return float(count)
+
+    async def submit(
+        self,
+        search,
+        media: Series,
+        episode_id: str,
+        popularity: float,
+        distance: int = 1,
+        preferred: Optional[PreferredSource] = None,
+    ) -> bool:
+        """Queue a prefetch of episode_id for the user behind search."""
+        if not self._consumers:
+            return False
+        key = search.stream_cache_key(episode_media(media, episode_id))
+        if key in self._queued:
+            metrics.incr("prefetch.deduplicated")
+            return False
+        if self.overloaded or self._queue.full():
+            metrics.incr("prefetch.shed")
+            logger.debug(f"Pre-fetch: Shedding {episode_id} (loop lag {self.loop_lag:.3f}s, queue {self._queue.qsize()})")
+            return False
+
+        client = await self._redis()
+        claimed = await client.set(self.CLAIM_KEY.format(key), "1", nx=True, ex=settings.prefetch_claim_ttl)
+        if not claimed:
+            metrics.incr("prefetch.deduplicated")
+            return False
+
+        job = PrefetchJob(
+            -popularity, distance, next(self._sequence), key, episode_id, "series", search, preferred
+        )
+        self._queued.add(key)
+        self._queue.put_nowait(job)
+        metrics.incr("prefetch.queued")
+        logger.debug(f"Pre-fetch: Queued {episode_id} (popularity {popularity:.0f}, distance {distance}, queue {self._queue.qsize()})")
+        return True
+
+    def schedule_lookahead(self, search, media: Series) -> None:
+        """Plan the lookahead for media in the background, without delaying the response."""
+        if not self._consumers:
+            return
+        # Référence gardée jusqu'à la fin : la boucle ne garde qu'une référence faible sur les tâches
+        task = asyncio.create_task(self.submit_lookahead(search, media))
+        self._planning.add(task)
+        task.add_done_callback(self._planning.discard)
+
+    async def submit_lookahead(self, search, media: Series) -> None:
+        """Queue the episodes the viewer is likely to watch after media."""
+        if not self._consumers:
+            return
+        try:
+            client = await self._redis()
+            popularity = await self._popularity(client, media.id.split(":")[0])
+            plan = await BingeLookahead(get_background_redis_cache(), search).plan(media)
+            for distance, episode_id in enumerate(plan.episode_ids, start=1):
+                await self.submit(search, media, episode_id, popularity, distance, plan.preferred)
+        except Exception as e:
+            logger.debug(f"Pre-fetch: Unable to schedule episodes after {media.id}: {str(e)}")
+
+    async def _take_slot(self, client, token: str) -> bool:
+        if self._acquire_slot is None:
+            self._acquire_slot = client.register_script(ACQUIRE_SLOT_SCRIPT)
+        deadline = time.time() + settings.prefetch_job_timeout
+        while time.time() < deadline:
+            now = time.time()
+            lease_expiry = now + settings.prefetch_job_timeout
+            acquired = await self._acquire_slot(
+                keys=[self.SLOTS_KEY],
+                args=[now, lease_expiry, settings.prefetch_cluster_concurrency, token],
+                client=client,
+            )
+            if acquired:
+                return True
+            await asyncio.sleep(1.0)
+        return False
+
+    async def _consume(self, index: int) -> None:
+        while True:
+            job: PrefetchJob = await self._queue.get()
+            try:
+                if self.overloaded:
+                    metrics.incr("prefetch.shed")
+                    logger.debug(f"Pre-fetch: Dropping {job.media_id}, worker overloaded")
+                    continue
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.incr("prefetch.failed")
+                logger.debug(f"Pre-fetch: Error while prefetching {job.media_id}: {str(e)}")
+            finally:
+                self._queued.discard(job.key)
+                self._queue.task_done()
+
+    async def _run(self, job: PrefetchJob) -> None:
+        client = await self._redis()
+        token = uuid.uuid4().hex
+        if not await self._take_slot(client, token):
+            metrics.incr("prefetch.shed")
+            logger.debug(f"Pre-fetch: No cluster slot for {job.media_id}, dropping")
+            return
+
+        start = time.time()
+        try:
+            await asyncio.wait_for(self._prefetch(job), timeout=settings.prefetch_job_timeout)
+        except asyncio.TimeoutError:
+            metrics.incr("prefetch.timeout")
+            logger.debug(f"Pre-fetch: Timeout while prefetching {job.media_id}")
+        finally:
+            metrics.observe("prefetch.job", time.time() - start)
+            await client.zrem(self.SLOTS_KEY, token)
+
+    async def _prefetch(self, job: PrefetchJob) -> None:
+        async with job.search.background() as search:
+            next_media = await search.get_media(job.media_id, job.media_type)
+            cached, is_stale = await search.get_cached_streams(next_media, metric=None)
+            if cached is not None and not is_stale:
+                metrics.incr("prefetch.already_cached")
+                logger.debug(f"Pre-fetch: Episode {job.media_id} already cached")
+                return
+            logger.debug(f"Pre-fetch: Starting background search for episode {job.media_id}")
+            streams = await search.compute_streams(next_media, allow_stale=False, preferred=job.preferred)
+            metrics.incr("prefetch.completed")
+            logger.success(f"Pre-fetch: Successfully background pre-cached {len(streams)} streams for episode {job.media_id}")
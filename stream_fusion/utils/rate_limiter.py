@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.metrics import metrics
+
+# Seau à jetons : KEYS[1] = seau, ARGV = capacité, jetons par seconde, attente maximale (ms),
+# blocage après un 429 (ms, 0 pour prendre un jeton). Renvoie l'attente en ms, négative si refusée.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local penalty = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate / 1000)
+local wait = 0
+if penalty > 0 then
+  tokens = math.min(tokens, -penalty * rate / 1000)
+else
+  wait = math.ceil(math.max(0, 1 - tokens) * 1000 / rate)
+  if wait > max_wait then
+    return -wait
+  end
+  tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) * 1000 / rate) + 1000)
+return wait
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: ``capacity`` requests at once, then ``per_second`` requests per second."""
+
+    capacity: int
+    per_second: float
+
+
+def retry_after_seconds(headers, default: float) -> float:
+    """The delay asked by the Retry-After header of a 429 response, in seconds or as an HTTP date."""
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Token buckets shared by every worker, one per upstream API and account.
+
+    Each request takes a token through an atomic Lua script, so the limit
+    holds across gunicorn workers, each with its own clients for the same
+    account. A 429 empties the bucket for the delay the upstream asked for. When Redis is unavailable, requests go through
+    unlimited rather than failing.
+    """
+
+    KEY = "ratelimit:{}:{}"
+
+    def __init__(self):
+        self._client: Redis | None = None
+        self._script = None
+
+    def get_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+            self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._client
+
+    @staticmethod
+    def _account_key(account: Optional[str]) -> str:
+        # Le jeton du compte n'apparaît pas en clair dans Redis
+        if not account:
+            return "shared"
+        return hashlib.sha256(str(account).encode("utf-8")).hexdigest()[:16]
+
+    async def _run(self, upstream: str, account: Optional[str], limit: RateLimit, penalty_ms: int) -> int:
+        self.get_client()
+        return await self._script(
+            keys=[self.KEY.format(upstream, self._account_key(account))],
+            args=[limit.capacity, limit.per_second, int(settings.rate_limit_max_wait * 1000), penalty_ms],
+        )
+
+    async def acquire(self, upstream: str, account: Optional[str], limit: RateLimit) -> bool:
+        """Wait for a token of the bucket of this upstream and account.
+
+        Returns:
+            bool: False when the wait would exceed rate_limit_max_wait; no token is taken then.
+        """
+        try:
+            wait_ms = await self._run(upstream, account, limit, 0)
+        except Exception as e:
+            logger.debug(f"RateLimiter: Redis unavailable, {upstream} request not limited: {e}")
+            return True
+
+        if wait_ms < 0:
+            metrics.incr(f"rate_limit.{upstream}.rejected")
+            logger.warning(f"RateLimiter: {upstream} request dropped, it would wait {-wait_ms / 1000:.1f}s")
+            return False
+        if wait_ms > 0:
+            metrics.observe(f"rate_limit.{upstream}.wait", wait_ms / 1000)
+            await asyncio.sleep(wait_ms / 1000)
+        return True
+
+    async def penalize(self, upstream: str, account: Optional[str], limit: RateLimit, retry_after: float) -> bool:
+        """Hold every request of this upstream and account for ``retry_after`` seconds after a 429.
+
+        Returns:
+            bool: False when the hold could not be recorded in Redis.
+        """
+        metrics.incr(f"rate_limit.{upstream}.throttled")
+        logger.warning(f"RateLimiter: {upstream} answered 429, holding its requests for {retry_after:.1f}s")
+        try:
+            await self._run(upstream, account, limit, max(int(retry_after * 1000), 1))
+        except Exception as e:
+            logger.debug(f"RateLimiter: Redis unavailable, {upstream} 429 not recorded: {e}")
+            return False
+        return True
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._script = None
+
+
+rate_limiter = RateLimiter()
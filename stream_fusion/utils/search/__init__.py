@@ -0,0 +1,3 @@
+from stream_fusion.utils.search.fanout import FanOutOutcome, SearchFanOut, SearchSource
+
+__all__ = ["FanOutOutcome", "SearchFanOut", "SearchSource"]
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+from stream_fusion.logging_config import logger
+
+
+@dataclass
+class SearchSource:
+    """An indexer taking part in a fan-out search.
+
+    Essential sources (private trackers) are always awaited until the deadline,
+    the others are cancelled as soon as enough results have been merged.
+    """
+
+    name: str
+    fetch: Callable[[], Awaitable[List[Any]]]
+    essential: bool = False
+
+
+@dataclass
+class FanOutOutcome:
+    """Summary of a fan-out run, kept so callers know how complete the results are."""
+
+    completed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    short_circuited: List[str] = field(default_factory=list)
+    cut_off: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        """True when at least one source was still running when the budget ran out."""
+        return bool(self.cut_off)
+
+
+class SearchFanOut:
+    """Launches every enabled source at once under a shared time budget.
+
+    Results are handed to ``on_result`` one source at a time, in completion order,
+    so the callback can safely use the request database session. The callback
+    returns the number of merged results, which drives the ``minCachedResults``
+    short-circuit.
+    """
+
+    def __init__(self, budget: float, min_results: int):
+        self.budget = budget
+        self.min_results = min_results
+
+    async def run(
+        self,
+        sources: List[SearchSource],
+        on_result: Callable[[str, List[Any]], Awaitable[int]],
+    ) -> FanOutOutcome:
+        outcome = FanOutOutcome()
+        if not sources:
+            return outcome
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.budget
+        tasks = {
+            asyncio.create_task(self._fetch(source, outcome), name=f"search:{source.name}"): source
+            for source in sources
+        }
+        pending = set(tasks)
+        total = 0
+
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                source = tasks[task]
+                items = task.result()
+                if items is None:
+                    outcome.failed.append(source.name)
+                    continue
+                outcome.completed.append(source.name)
+                if items:
+                    try:
+                        total = await on_result(source.name, items)
+                    except Exception as e:
+                        logger.warning(f"Search: Failed to process {source.name} results: {str(e)}")
+
+            if pending and total >= self.min_results and not any(
+                tasks[task].essential for task in pending
+            ):
+                outcome.short_circuited = await self._cancel(pending, tasks)
+                logger.info(
+                    f"Search: {total} results reached the minimum ({self.min_results}), "
+                    f"cancelled {', '.join(outcome.short_circuited)}"
+                )
+                pending = set()
+
+        if pending:
+            outcome.cut_off = await self._cancel(pending, tasks)
+            logger.warning(
+                f"Search: Time budget of {self.budget:.1f}s exhausted, "
+                f"cut off {', '.join(outcome.cut_off)}"
+            )
+
+        outcome.elapsed = loop.time() - started
+        logger.debug(
+            f"Search: Fan-out finished in {outcome.elapsed:.2f}s "
+            f"(completed={outcome.completed}, failed={outcome.failed}, "
+            f"short_circuited={outcome.short_circuited}, cut_off={outcome.cut_off})"
+        )
+        return outcome
+
+    @staticmethod
+    async def _fetch(source: SearchSource, outcome: FanOutOutcome):
+        start = time.time()
+        try:
+            return await source.fetch() or []
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Search: {source.name} search failed, skipping: {str(e)}")
+            return None
+        finally:
+            outcome.timings[source.name] = round(time.time() - start, 3)
+
+    @staticmethod
+    async def _cancel(pending, tasks) -> List[str]:
+        names = sorted(tasks[task].name for task in pending)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return names
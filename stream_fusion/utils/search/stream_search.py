@@ -0,0 +1,616 @@
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
+from stream_fusion.services.redis.redis_config import get_background_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.cache import search_public
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.low_yield import LowYieldTracker
+from stream_fusion.utils.cache.single_flight import SingleFlight
+from stream_fusion.utils.cache.swr import BackgroundRefresher
+from stream_fusion.utils.c411.c411_result import C411Result as C411SearchResult
+from stream_fusion.utils.c411.c411_service import C411Service
+from stream_fusion.utils.debrid.availability_cache import availability_cache
+from stream_fusion.utils.filter.results_per_quality_filter import ResultsPerQualityFilter
+from stream_fusion.utils.filter.batch_filter import filter_items_batched
+from stream_fusion.utils.filter.ranking import RankingEngine
+from stream_fusion.utils.filter.prefilter import RawPrefilter
+from stream_fusion.utils.filter_results import merge_items
+from stream_fusion.utils.jackett.jackett_result import JackettResult
+from stream_fusion.utils.jackett.jackett_service import JackettService
+from stream_fusion.utils.metdata.cinemeta import Cinemeta
+from stream_fusion.utils.metdata.tmdb import TMDB
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.models.movie import Movie
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.parser.parser_service import StreamParser
+from stream_fusion.utils.parser.title_cache import title_cache
+from stream_fusion.utils.search.fanout import FanOutOutcome, SearchFanOut, SearchSource
+from stream_fusion.utils.sharewood.sharewood_service import SharewoodService
+from stream_fusion.utils.torr9.torr9_result import Torr9Result as Torr9SearchResult
+from stream_fusion.utils.torr9.torr9_service import Torr9Service
+from stream_fusion.utils.torrent.torrent_codec import decode_items, encode_items
+from stream_fusion.utils.torrent.torrent_service import TorrentService
+from stream_fusion.utils.torrent.torrent_smart_container import AVAILABILITY_STATE_FIELDS, TorrentSmartContainer
+from stream_fusion.utils.yggfilx.yggflix_service import YggflixService
+from stream_fusion.utils.zilean.zilean_result import ZileanResult
+from stream_fusion.utils.zilean.zilean_service import ZileanService
+
+# Options de la config qui changent le résultat de filter_items_batched et ResultsPerQualityFilter
+FILTER_CONFIG_KEYS = (
+    "languages",
+    "maxSize",
+    "exclusionKeywords",
+    "exclusion",
+    "resultsPerQuality",
+    "sort",
+    "minCachedResults",
+    "metadataProvider",
+)
+
+DEBRID_CREDENTIAL_KEYS = {
+    "Real-Debrid": "RDToken",
+    "AllDebrid": "ADToken",
+    "TorBox": "TBToken",
+    "Premiumize": "PMToken",
+    "Debrid-Link": "DLToken",
+    "EasyDebrid": "EDToken",
+    "Offcloud": "OCCredentials",
+    "PikPak": "PPCredentials",
+}
+
+
+class StreamSearch:
+    """Search pipeline behind the stream endpoint.
+
+    Indexers -> filters -> debrid availability -> Stremio streams, with the Redis
+    caches in between. The request handler and the background jobs (stale
+    refreshes, prefetch) share this class; background jobs get their own
+    database session through ``background()``.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        redis_cache: RedisCache,
+        torrent_dao: TorrentItemDAO,
+        session_factory,
+        http_session,
+        debrid_services: list,
+        client_ip: str,
+    ):
+        self.config = config
+        self.redis_cache = redis_cache
+        self.torrent_dao = torrent_dao
+        self.session_factory = session_factory
+        self.http_session = http_session
+        self.debrid_services = debrid_services
+        self.client_ip = client_ip
+        self.user_identifier = config.get("apiKey") or client_ip
+        self.single_flight = SingleFlight(redis_cache)
+
+    @asynccontextmanager
+    async def background(self):
+        """Yield a copy of this search bound to its own database session."""
+        session = self.session_factory()
+        try:
+            yield StreamSearch(
+                self.config,
+                get_background_redis_cache(),
+                TorrentItemDAO(session),
+                self.session_factory,
+                self.http_session,
+                self.debrid_services,
+                self.client_ip,
+            )
+            await session.commit()
+        finally:
+            await session.close()
+
+    async def _schedule_refresh(self, key: str, action) -> bool:
+        async def refresh():
+            async with self.background() as search:
+                await action(search)
+
+        return await BackgroundRefresher(get_background_redis_cache()).schedule(key, refresh)
+
+    async def get_metadata(self, episode_id, media_type):
+        logger.info(f"Search: Fetching metadata from {self.config['metadataProvider']}")
+        if self.config["metadataProvider"] == "tmdb" and settings.tmdb_api_key:
+            try:
+                metadata_provider = TMDB(self.config, session=self.http_session)
+                return await metadata_provider.get_metadata(episode_id, media_type)
+            except (ValueError, IndexError, KeyError) as e:
+                logger.warning(f"Search: TMDB metadata fetch failed ({str(e)}), falling back to Cinemeta")
+
+        metadata_provider = Cinemeta(self.config, session=self.http_session)
+        return await metadata_provider.get_metadata(episode_id, media_type)
+
+    async def get_media(self, media_id: str, media_type: str):
+        return await self.redis_cache.get_or_set(
+            self.get_metadata, media_id, media_type, self.config["metadataProvider"]
+        )
+
+    def stream_cache_key(self, media) -> str:
+        if isinstance(media, Movie):
+            key_string = f"stream:{self.user_identifier}:{media.titles[0]}:{media.year}:{media.languages[0]}"
+        elif isinstance(media, Series):
+            key_string = f"stream:{self.user_identifier}:{media.titles[0]}:{media.languages[0]}:{media.season}{media.episode}"
+        else:
+            logger.error("Search: Only Movie and Series are allowed as media!")
+            raise TypeError("Only Movie and Series are allowed as media!")
+        hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+        return hashed_key[:16]
+
+    @staticmethod
+    def media_cache_key(media) -> str:
+        if isinstance(media, Movie):
+            key_string = f"media:{media.titles[0]}:{media.year}:{media.languages[0]}"
+        elif isinstance(media, Series):
+            key_string = f"media:{media.titles[0]}:{media.languages[0]}:{media.season}{media.episode}"
+        else:
+            raise TypeError("Only Movie and Series are allowed as media!")
+        hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+        return hashed_key[:16]
+
+    def filter_fingerprint(self) -> str:
+        """Hash of the config options that shape the candidate set, independent of the user."""
+        canonical = {}
+        for key in FILTER_CONFIG_KEYS:
+            value = self.config.get(key)
+            canonical[key] = sorted(value, key=str) if isinstance(value, list) else value
+        # Seule la priorité TorBox des indexeurs dépend des services configurés
+        canonical["torboxPriority"] = (
+            self.config.get("debridDownloader") == "TorBox"
+            or "TorBox" in (self.config.get("service") or [])
+        )
+        key_string = json.dumps(canonical, sort_keys=True, default=str)
+        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()[:16]
+
+    def candidate_cache_key(self, media) -> str:
+        return f"candidates:{self.media_cache_key(media)}:{self.filter_fingerprint()}"
+
+    def debrid_account_fingerprint(self) -> str:
+        """Hash of the debrid services and credentials whose availability is checked."""
+        accounts = []
+        for service in sorted(self.config.get("service") or []):
+            credentials = self.config.get(DEBRID_CREDENTIAL_KEYS.get(service, ""))
+            if isinstance(credentials, dict):
+                # Le token d'accès Real-Debrid change, le refresh token identifie le compte
+                credentials = credentials.get("refresh_token") or json.dumps(credentials, sort_keys=True)
+            accounts.append(f"{service}:{credentials}")
+        key_string = f"{bool(self.config.get('stremthru'))}|{'|'.join(accounts)}"
+        return hashlib.sha256(key_string.encode("utf-8")).hexdigest()[:16]
+
+    def availability_cache_key(self, media) -> str:
+        return f"availability:{self.debrid_account_fingerprint()}:{self.media_cache_key(media)}"
+
+    def stream_cache_soft_ttl(self) -> int:
+        has_stremthru = any(
+            type(debrid).__name__ == "StremThru" or hasattr(debrid, 'store_name')
+            for debrid in self.debrid_services
+        )
+        if has_stremthru:
+            logger.info(
+                f"Search: Using reduced cache expiration ({settings.stream_cache_stremthru_soft_ttl}s) for StremThru"
+            )
+            return settings.stream_cache_stremthru_soft_ttl
+        return settings.stream_cache_soft_ttl
+
+    async def get_search_results(self, media):
+        config = self.config
+        http_session = self.http_session
+        search_results = []
+        torrent_service = TorrentService(config, self.torrent_dao, http_session)
+
+        async def _fetch_c411_raw():
+            c411_service = C411Service(config, session=http_session)
+            raw = await c411_service.search(media)
+            return [
+                C411SearchResult().from_api_item(item, media)
+                for item in raw
+                if getattr(item, "info_hash", None) and len(item.info_hash) == 40
+            ] if raw else []
+
+        async def _fetch_torr9_raw():
+            torr9_service = Torr9Service(config, session=http_session)
+            raw = await torr9_service.search(media)
+            return [
+                Torr9SearchResult().from_api_item(item, media)
+                for item in raw
+                if getattr(item, "info_hash", None) and len(item.info_hash) == 40
+            ] if raw else []
+
+        async def _fetch_yggflix_raw():
+            yggflix_service = YggflixService(config)
+            raw = await asyncio.to_thread(yggflix_service.search, media)
+            return raw if raw else []
+
+        async def _fetch_public_cache_raw():
+            raw = await asyncio.to_thread(search_public, media)
+            if raw:
+                raw = RawPrefilter(media).select(
+                    raw,
+                    lambda torrent: torrent.get("title") if isinstance(torrent, dict) else None,
+                    source="Public cache",
+                )
+            return [
+                JackettResult().from_cached_item(torrent, media)
+                for torrent in raw
+                if isinstance(torrent, dict) and len(torrent.get("hash", "")) == 40
+            ] if raw else []
+
+        async def _fetch_zilean_raw():
+            zilean_service = ZileanService(config, session=http_session)
+            raw = RawPrefilter(media).select(
+                await zilean_service.search(media),
+                lambda torrent: getattr(torrent, "raw_title", None),
+                seasons=lambda torrent: getattr(torrent, "seasons", ()),
+                episodes=lambda torrent: getattr(torrent, "episodes", ()),
+                source="Zilean",
+            )
+            await title_cache.warm(getattr(torrent, "raw_title", None) for torrent in raw or [])
+            return [
+                ZileanResult().from_api_cached_item(torrent, media)
+                for torrent in raw
+                if len(getattr(torrent, "info_hash", "")) == 40
+            ] if raw else []
+
+        async def _fetch_sharewood_raw():
+            sharewood_service = SharewoodService(config, session=http_session)
+            return await sharewood_service.search(media)
+
+        async def _fetch_jackett_raw():
+            jackett_service = JackettService(config, session=http_session)
+            return await jackett_service.search(media)
+
+        # Les indexeurs privés sont toujours attendus, les autres sont annulés
+        # dès que minCachedResults est atteint.
+        sources = []
+        if config.get("c411"):
+            sources.append(SearchSource("C411", _fetch_c411_raw, essential=True))
+        if config.get("torr9"):
+            sources.append(SearchSource("Torr9", _fetch_torr9_raw, essential=True))
+        if config.get("yggflix"):
+            sources.append(SearchSource("Yggflix", _fetch_yggflix_raw, essential=True))
+        if config["cache"]:
+            sources.append(SearchSource("Public cache", _fetch_public_cache_raw))
+        if config["zilean"]:
+            sources.append(SearchSource("Zilean", _fetch_zilean_raw))
+        if config["sharewood"]:
+            sources.append(SearchSource("Sharewood", _fetch_sharewood_raw))
+        if config["jackett"]:
+            sources.append(SearchSource("Jackett", _fetch_jackett_raw))
+
+        async def _merge_source_results(source_name, raw_results):
+            nonlocal search_results
+            processed = await torrent_service.convert_and_process(raw_results)
+            logger.success(f"Search: Found {len(processed)} results from {source_name}")
+            search_results = merge_items(search_results, processed)
+            return len(search_results)
+
+        fan_out = SearchFanOut(
+            budget=settings.search_time_budget,
+            min_results=int(config["minCachedResults"]),
+        )
+        search_outcome = await fan_out.run(sources, _merge_source_results)
+        return search_results, search_outcome
+
+    @staticmethod
+    def external_cache_soft_ttl(search_outcome: FanOutOutcome) -> int:
+        # Des résultats partiels doivent être rafraîchis rapidement
+        if search_outcome.partial:
+            logger.info(
+                f"Search: Partial results marked stale after {settings.search_partial_expiration}s "
+                f"(cut off: {', '.join(search_outcome.cut_off)})"
+            )
+            return settings.search_partial_expiration
+        return settings.media_cache_soft_ttl
+
+    async def search_external_results(self, media, cache_key):
+        # Un seul worker interroge les indexeurs pour un même média,
+        # les autres relisent le résultat qu'il a mis en cache.
+        async def search_and_cache():
+            external_results, search_outcome = await self.get_search_results(media)
+            await self.redis_cache.set_swr(
+                cache_key,
+                encode_items(external_results),
+                soft_ttl=self.external_cache_soft_ttl(search_outcome),
+                hard_ttl=settings.redis_expiration,
+                raw=True,
+            )
+            return external_results
+
+        async def load_shared_results():
+            cached_results, _ = await self.redis_cache.get_swr(cache_key, metric=None, raw=True)
+            return decode_items(cached_results)
+
+        return await self.single_flight.do(f"media:{cache_key}", search_and_cache, load_shared_results)
+
+    async def get_and_filter_results(self, media, allow_stale: bool = True):
+        config = self.config
+        # Postgres acts as a local cache for private indexers (Yggtorrent, C411, Torr9)
+        # and is always queried directly, bypassing Redis
+        postgres_results = []
+        if hasattr(media, 'tmdb_id') and media.tmdb_id:
+            try:
+                postgres_items = await self.torrent_dao.search_by_tmdb_id(int(media.tmdb_id))
+                if postgres_items:
+                    logger.success(
+                        f"Search: Found {len(postgres_items)} results from Postgres (local cache) for TMDB ID {media.tmdb_id}"
+                    )
+                    for db_item in postgres_items:
+                        if db_item.indexer in ['Yggtorrent - API', 'C411 - API', 'Torr9 - API']:
+                            torrent_item = db_item.to_torrent_item()
+                            postgres_results.append(torrent_item)
+            except Exception as pg_error:
+                logger.error(f"Search: Postgres search failed: {str(pg_error)}")
+
+        cache_key = self.media_cache_key(media)
+        cached_results, is_stale = await self.redis_cache.get_swr(cache_key, metric="cache.media", raw=True)
+        external_results = decode_items(cached_results)
+
+        searched = False
+        if external_results is None or (is_stale and not allow_stale):
+            logger.info("Search: No fresh external sources in Redis cache. Performing new search.")
+            external_results = await self.search_external_results(media, cache_key)
+            searched = True
+            logger.success(
+                f"Search: Cached {len(external_results)} external results in Redis (Sharewood/Zilean/Jackett)"
+            )
+        else:
+            logger.success(
+                f"Search: Retrieved {len(external_results)} {'stale' if is_stale else 'fresh'} external results from Redis cache"
+            )
+            if is_stale:
+                await self._schedule_refresh(
+                    cache_key,
+                    lambda search: search.search_external_results(media, cache_key),
+                )
+
+        all_results = merge_items(postgres_results, external_results)
+        logger.info(f"Search: Merged Postgres ({len(postgres_results)}) + External ({len(external_results)}) = {len(all_results)} total results")
+
+        filtered_results = await filter_items_batched(all_results, media, config=config)
+
+        min_results = int(config.get("minCachedResults", 8))
+        external_filtered = await filter_items_batched(external_results, media, config=config)
+        low_yield = LowYieldTracker(self.redis_cache)
+        # Un média obscur n'est recherché à nouveau qu'une fois son backoff écoulé
+        if (
+            len(external_filtered) < min_results
+            and not searched
+            and await low_yield.should_retry(media.id, cache_key)
+        ):
+            logger.warning(
+                f"Search: Insufficient external results ({len(external_filtered)} < {min_results}). Recreating external cache."
+            )
+            external_results = await self.search_external_results(media, cache_key)
+            searched = True
+            logger.success(
+                f"Search: Recreated external cache with {len(external_results)} results"
+            )
+            all_results = merge_items(postgres_results, external_results)
+            filtered_results = await filter_items_batched(all_results, media, config=config)
+            external_filtered = await filter_items_batched(external_results, media, config=config)
+
+        if searched:
+            await low_yield.record(media.id, cache_key, len(external_filtered), min_results)
+
+        logger.success(
+            f"Search: Final number of filtered results: {len(filtered_results)}"
+        )
+        return filtered_results
+
+    async def compute_candidates(self, media, allow_stale: bool = True, preferred=None):
+        raw_search_results = await self.get_and_filter_results(media, allow_stale=allow_stale)
+        logger.debug(f"Search: Filtered search results: {len(raw_search_results)}")
+        if preferred is not None:
+            raw_search_results = preferred.promote(raw_search_results)
+        candidates = ResultsPerQualityFilter(self.config).filter(raw_search_results)
+        logger.info(f"Search: Filtered search results per quality: {len(candidates)}")
+        return candidates
+
+    async def get_candidates(self, media, allow_stale: bool = True, preferred=None):
+        """Filtered results shared by every user with the same filter config."""
+        if preferred is not None:
+            # L'ordre dépend de la source en cours de lecture, il n'est pas partageable
+            return await self.compute_candidates(media, allow_stale=allow_stale, preferred=preferred)
+
+        cache_key = self.candidate_cache_key(media)
+
+        async def compute_and_cache():
+            candidates = await self.compute_candidates(media, allow_stale=allow_stale)
+            await self.redis_cache.set_swr(
+                cache_key,
+                encode_items(candidates),
+                soft_ttl=settings.candidate_cache_soft_ttl,
+                hard_ttl=settings.stream_cache_hard_ttl,
+                raw=True,
+            )
+            return candidates
+
+        async def load_shared_candidates():
+            cached, _ = await self.redis_cache.get_swr(cache_key, metric=None, raw=True)
+            return decode_items(cached)
+
+        cached, is_stale = await self.redis_cache.get_swr(cache_key, metric="cache.candidates", raw=True)
+        cached = decode_items(cached)
+        if cached is None or (is_stale and not allow_stale):
+            return await self.single_flight.do(f"candidates:{cache_key}", compute_and_cache, load_shared_candidates)
+
+        logger.success(f"Search: Retrieved {len(cached)} {'stale' if is_stale else 'fresh'} shared candidates from Redis cache")
+        if is_stale:
+            await self._schedule_refresh(
+                cache_key,
+                lambda search: search.get_candidates(media, allow_stale=False),
+            )
+        return cached
+
+    async def check_availability(self, candidates, media) -> TorrentSmartContainer:
+        """Apply this debrid account's availability to the candidates.
+
+        Results already checked for the account are read from its overlay in
+        Redis, only the remaining hashes are sent to the debrid services.
+        """
+        config = self.config
+        torrent_smart_container = TorrentSmartContainer(candidates, media)
+        if not config["debrid"]:
+            return torrent_smart_container
+
+        items_by_hash = {item.info_hash: item for item in torrent_smart_container.get_items()}
+        overlay_key = self.availability_cache_key(media)
+        overlay = await self.redis_cache.get_fields(overlay_key, list(items_by_hash))
+        # Une entrée écrite sans tous les champs est vérifiée à nouveau
+        overlay = {
+            info_hash: state for info_hash, state in overlay.items()
+            if all(field_name in state for field_name in AVAILABILITY_STATE_FIELDS)
+        }
+        for info_hash, state in overlay.items():
+            for field_name in AVAILABILITY_STATE_FIELDS:
+                setattr(items_by_hash[info_hash], field_name, state[field_name])
+
+        unchecked = [info_hash for info_hash in items_by_hash if info_hash not in overlay]
+        logger.info(
+            f"Search: Availability overlay has {len(overlay)} of {len(items_by_hash)} results, "
+            f"checking {len(unchecked)} with debrid"
+        )
+        if not unchecked:
+            return torrent_smart_container
+
+        pending = set(unchecked)
+        hashes = [h for h in torrent_smart_container.get_unaviable_hashes() if h in pending]
+        # Tous les services sont interrogés en même temps, chacun avec son propre délai
+        results = await asyncio.gather(
+            *(self._get_debrid_availability(debrid, hashes) for debrid in self.debrid_services)
+        ) if hashes else []
+
+        responses = []
+        unanswered = set()
+        for debrid, (result, missed) in zip(self.debrid_services, results):
+            unanswered |= missed
+            if result:
+                count = len(result.items()) if isinstance(result, dict) else len(result)
+                logger.info(
+                    f"Search: Checked availability for {count} items with {type(debrid).__name__}"
+                )
+                responses.append((type(debrid), result))
+            elif result is not None:
+                logger.warning(
+                    "Search: No availability results found in debrid service"
+                )
+        # Fusion dans l'ordre des services, quel que soit l'ordre des réponses
+        torrent_smart_container.merge_availability(responses, media)
+
+        if any(result is None for result, _ in results):
+            # Un service manquant rendrait l'overlay faux jusqu'à son expiration
+            logger.warning("Search: Availability overlay not updated, a debrid service did not answer")
+        else:
+            # Les hashes restés sans réponse d'un service seront vérifiés à nouveau
+            answered = [info_hash for info_hash in unchecked if info_hash not in unanswered]
+            if len(answered) < len(unchecked):
+                logger.warning(
+                    f"Search: Availability overlay not updated for {len(unchecked) - len(answered)} hashes without an answer"
+                )
+            await self.redis_cache.set_fields(
+                overlay_key,
+                {
+                    info_hash: {
+                        field_name: getattr(items_by_hash[info_hash], field_name)
+                        for field_name in AVAILABILITY_STATE_FIELDS
+                    }
+                    for info_hash in answered
+                },
+                expiration=self.stream_cache_soft_ttl(),
+            )
+
+        if config["cache"]:
+            torrent_smart_container.cache_container_items()
+        return torrent_smart_container
+
+    async def _get_debrid_availability(self, debrid, hashes):
+        """The availability response of one debrid service, None if it failed or timed out, and the hashes it did not answer."""
+        name = type(debrid).__name__
+        timeout = settings.debrid_availability_timeout
+        started = asyncio.get_running_loop().time()
+        try:
+            result, unanswered = await asyncio.wait_for(
+                availability_cache.get_availability_bulk(debrid, hashes, self.client_ip), timeout
+            )
+        except asyncio.TimeoutError:
+            metrics.incr("debrid.availability.timeout")
+            logger.warning(f"Search: {name} availability check timed out after {timeout:.1f}s")
+            return None, set(hashes)
+        except Exception as e:
+            metrics.incr("debrid.availability.failed")
+            logger.warning(f"Search: {name} availability check failed: {str(e)}")
+            return None, set(hashes)
+
+        if result is None:
+            metrics.incr("debrid.availability.failed")
+            logger.warning(f"Search: {name} did not answer")
+            return None, unanswered
+        if unanswered:
+            metrics.incr("debrid.availability.partial")
+            logger.warning(f"Search: {name} did not answer for {len(unanswered)} of {len(hashes)} hashes")
+
+        elapsed = asyncio.get_running_loop().time() - started
+        logger.debug(f"Search: {name} checked {len(hashes)} hashes in {elapsed:.2f}s")
+        return result, unanswered
+
+    async def render_streams(self, torrent_smart_container: TorrentSmartContainer, media):
+        best_matching_results = torrent_smart_container.get_best_matching()
+        logger.info(f"Search: Found {len(best_matching_results)} best matching results")
+        # Seuls les maxResults premiers sont rendus : pas besoin de trier les autres
+        best_matching_results = RankingEngine(self.config).top(
+            best_matching_results, int(self.config["maxResults"])
+        )
+
+        parser = StreamParser(self.config)
+        stream_list = await parser.parse_to_stremio_streams(best_matching_results, media)
+        logger.success(f"Search: Processed {len(stream_list)} streams for Stremio")
+
+        return stream_list
+
+    async def compute_streams(self, media, allow_stale: bool = True, preferred=None):
+        from stream_fusion.web.root.search.schemas import Stream
+
+        # Candidats partagés -> disponibilité du compte debrid -> streams de l'utilisateur
+        candidates = await self.get_candidates(media, allow_stale=allow_stale, preferred=preferred)
+        torrent_smart_container = await self.check_availability(candidates, media)
+        stream_list = await self.render_streams(torrent_smart_container, media)
+        streams = [Stream(**stream) for stream in stream_list]
+
+        await self.redis_cache.set_swr(
+            self.stream_cache_key(media),
+            streams,
+            soft_ttl=self.stream_cache_soft_ttl(),
+            hard_ttl=settings.stream_cache_hard_ttl,
+        )
+        return streams
+
+    async def get_cached_streams(self, media, metric: str | None = "cache.stream"):
+        """Return the cached streams for media and whether they are stale."""
+        return await self.redis_cache.get_swr(self.stream_cache_key(media), metric=metric)
+
+    async def refresh_stale_streams(self, media) -> None:
+        # Le rafraîchissement ignore aussi les résultats externes périmés
+        await self._schedule_refresh(
+            self.stream_cache_key(media),
+            lambda search: search.compute_streams(media, allow_stale=False),
+        )
+
+    async def get_streams(self, media):
+        async def load_shared_streams():
+            streams, _ = await self.redis_cache.get_swr(self.stream_cache_key(media), metric=None)
+            return streams
+
+        return await self.single_flight.do(
+            f"stream:{self.stream_cache_key(media)}",
+            lambda: self.compute_streams(media),
+            load_shared_streams,
+        )
@@ -1,31 +1,14 @@
-import asyncio
 import aiohttp
 from typing import Optional
 
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
-
-
-class AsyncRateLimiter:
-    """Rate limiter async pour contrôler le débit des requêtes."""
-
-    def __init__(self, calls_per_second: float = 1.0):
-        self.min_interval = 1.0 / calls_per_second
-        self.last_call = 0.0
-        self._lock = asyncio.Lock()
-
-    async def acquire(self):
-        """Attend le temps nécessaire avant d'autoriser une nouvelle requête."""
-        async with self._lock:
-            import time
-            now = time.time()
-            time_since_last_call = now - self.last_call
-            if time_since_last_call < self.min_interval:
-                await asyncio.sleep(self.min_interval - time_since_last_call)
-            self.last_call = time.time()
+from stream_fusion.utils.rate_limiter import RateLimit, rate_limiter, retry_after_seconds
 
 
 class SharewoodAPI:
+    RATE_LIMIT = RateLimit(capacity=1, per_second=1)
+
     def __init__(
         self,
         sharewood_passkey: str,
@@ -37,7 +20,6 @@ class SharewoodAPI:
             raise ValueError("Sharewood passkey must be 32 characters long")
         self.sharewood_passkey = sharewood_passkey
         self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self.rate_limiter = AsyncRateLimiter(calls_per_second=1)
 
         self._external_session = session is not None
         self._session = session
@@ -54,16 +36,27 @@ class SharewoodAPI:
         if self._session and not self._external_session and not self._session.closed:
             await self._session.close()
 
+    async def _acquire(self) -> bool:
+        return await rate_limiter.acquire("sharewood", self.sharewood_passkey, self.RATE_LIMIT)
+
+    async def _raise_for_status(self, response):
+        if response.status == 429:
+            await rate_limiter.penalize(
+                "sharewood", self.sharewood_passkey, self.RATE_LIMIT, retry_after_seconds(response.headers, 5)
+            )
+        response.raise_for_status()
+
     async def _make_request(self, method: str, endpoint: str, params: dict = None):
         """Effectue une requête HTTP async avec rate limiting."""
-        await self.rate_limiter.acquire()
+        if not await self._acquire():
+            return None
 
         url = f"{self.base_url}/{self.sharewood_passkey}/{endpoint}"
         session = await self._get_session()
 
         try:
             async with session.request(method, url, params=params) as response:
-                response.raise_for_status()
+                await self._raise_for_status(response)
                 return await response.json()
         except aiohttp.ClientError as e:
             logger.error(f"An error occurred during the request: {e}")
@@ -119,14 +112,15 @@ class SharewoodAPI:
 
     async def download_torrent(self, torrent_id: int) -> bytes:
         """Download a specific torrent file."""
-        await self.rate_limiter.acquire()
+        if not await self._acquire():
+            return None
 
         url = f"{self.base_url}/{self.sharewood_passkey}/{torrent_id}/download"
         session = await self._get_session()
 
         try:
             async with session.get(url) as response:
-                response.raise_for_status()
+                await self._raise_for_status(response)
                 return await response.read()
         except aiohttp.ClientError as e:
             logger.error(f"An error occurred while downloading the torrent: {e}")
@@ -2,11 +2,11 @@ import re
 import urllib.parse
 import aiohttp
 from typing import List, Union, Optional
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title, title_cache
 
 from stream_fusion.logging_config import logger
-from stream_fusion.utils.detection import detect_languages
 from stream_fusion.utils.sharewood.sharewood_result import SharewoodResult
+from stream_fusion.utils.filter.prefilter import RawPrefilter
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
 from stream_fusion.settings import settings
@@ -44,6 +44,8 @@ class SharewoodService:
         else:
             raise TypeError("Only Movie and Series types are allowed as media!")
 
+        results = RawPrefilter(media).select(results, lambda result: result.get("name"), source="Sharewood")
+        await title_cache.warm(result.get("name") for result in results or [])
         return self.__post_process_results(results, media)
 
     def __convert_size(self, size):
@@ -227,9 +229,9 @@ class SharewoodService:
             item.indexer = "Sharewood - API"
             item.seeders = result.get("seeders", 0)
             item.privacy = "private"
-            item.languages = detect_languages(item.raw_title, default_language="fr")
+            item.languages = analyze_title(item.raw_title).detected_languages("fr")
             item.type = media.type
-            item.parsed_data = parse(item.raw_title)
+            item.parsed_data = parse_title(item.raw_title)
 
             items.append(item)
 
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.rate_limiter import RateLimit, rate_limiter, retry_after_seconds
 
 
 class Torr9RawResult:
@@ -21,6 +22,7 @@ class Torr9RawResult:
 
 class Torr9API:
     TORZNAB_NS = {"torznab": "http://torznab.com/schemas/2015/feed"}
+    RATE_LIMIT = RateLimit(capacity=10, per_second=2)
 
     def __init__(self, session: Optional[aiohttp.ClientSession] = None, api_key: Optional[str] = None):
         self.base_url = settings.torr9_url.rstrip("/") + "/api/v1/torznab"
@@ -40,12 +42,18 @@ class Torr9API:
             logger.warning("Torr9: API key not configured (TORR9_API_KEY), skipping request")
             return None
         params["apikey"] = self.api_key
+        if not await rate_limiter.acquire("torr9", self.api_key, self.RATE_LIMIT):
+            return None
         session = await self._get_session()
         try:
             async with session.get(
                 self.base_url, params=params, allow_redirects=True,
                 timeout=aiohttp.ClientTimeout(sock_read=2, total=5)
             ) as response:
+                if response.status == 429:
+                    await rate_limiter.penalize(
+                        "torr9", self.api_key, self.RATE_LIMIT, retry_after_seconds(response.headers, 5)
+                    )
                 response.raise_for_status()
                 return await response.text()
         except aiohttp.ClientError as e:
@@ -1,8 +1,7 @@
 
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
-from stream_fusion.utils.detection import detect_languages
 from urllib.parse import quote
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
@@ -24,7 +23,7 @@ class Torr9Result:
         self.torrent_download = None
 
     def convert_to_torrent_item(self):
-        parsed_data = self.parsed_data or parse(self.raw_title)
+        parsed_data = self.parsed_data or parse_title(self.raw_title)
         return TorrentItem(
             raw_title=self.raw_title,
             size=self.size,
@@ -46,7 +45,7 @@ class Torr9Result:
         if not self.info_hash or len(self.info_hash) != 40:
             raise ValueError(f"Invalid info_hash: {self.info_hash}")
 
-        parsed = parse(api_item.raw_title)
+        parsed = parse_title(api_item.raw_title)
         self.raw_title = parsed.raw_title
         self.parsed_data = parsed
         self.size = api_item.size or "0"
@@ -55,7 +54,7 @@ class Torr9Result:
         self.link = self.magnet
         self.seeders = api_item.seeders or 0
         self.privacy = api_item.privacy or "public"
-        self.languages = detect_languages(self.raw_title, default_language="fr")
+        self.languages = analyze_title(self.raw_title).detected_languages("fr")
         self.type = media.type
         self.tmdb_id = getattr(media, 'tmdb_id', None)
         self.torrent_download = getattr(api_item, 'torrent_download', None) or api_item.link
@@ -7,6 +7,7 @@ from stream_fusion.utils.torr9.torr9_api import Torr9API
 from stream_fusion.utils.torr9.torr9_result import Torr9Result
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.parser.title_cache import title_cache
 
 
 class Torr9Service:
@@ -39,6 +40,7 @@ class Torr9Service:
 
         raw = await self.api.search_movie(imdb_id=imdb_id)
         logger.info(f"Torr9: {len(raw)} raw results for movie '{media.titles[0]}'")
+        await title_cache.warm(getattr(item, "raw_title", None) for item in raw or [])
         return self._build_results(raw, media)
 
     async def _search_series(self, media: Series) -> List[Torr9Result]:
@@ -52,6 +54,7 @@ class Torr9Service:
         # Recherche globale (sans saison/épisode) pour tout stocker en Postgres
         raw = await self.api.search_series(imdb_id=imdb_id)
         logger.info(f"Torr9: {len(raw)} raw results for '{media.titles[0]}' (global)")
+        await title_cache.warm(getattr(item, "raw_title", None) for item in raw or [])
         return self._build_results(raw, media)
 
     def _build_results(self, raw_results, media) -> List[Torr9Result]:
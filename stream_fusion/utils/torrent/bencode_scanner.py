@@ -0,0 +1,191 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+_DICT = ord("d")
+_LIST = ord("l")
+_INT = ord("i")
+_END = ord("e")
+_ZERO = ord("0")
+_NINE = ord("9")
+
+
+class BencodeError(ValueError):
+    pass
+
+
+@dataclass
+class TorrentMetadata:
+    """The parts of a .torrent that TorrentService uses."""
+
+    info_hash: Optional[str] = None
+    name: Optional[str] = None
+    length: Optional[int] = None
+    files: Optional[List[dict]] = None  # None for single-file torrents
+    announce: List[str] = field(default_factory=list)
+    announce_list: List[str] = field(default_factory=list)
+
+    @property
+    def trackers(self) -> List[str]:
+        return list(set(self.announce) | set(self.announce_list))
+
+
+class _Scanner:
+    """Walks a bencoded buffer, decoding only what a handler asks for.
+
+    Skipped values (piece hashes, unknown keys) are jumped over without being
+    copied, and the span of a dictionary can be hashed straight from the
+    memoryview.
+    """
+
+    __slots__ = ("data", "view")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.view = memoryview(data)
+
+    def string_span(self, pos: int) -> tuple[int, int]:
+        colon = self.data.index(b":", pos)
+        start = colon + 1
+        end = start + int(self.data[pos:colon])
+        if end > len(self.data):
+            raise BencodeError(f"string at {pos} runs past the end of the data")
+        return start, end
+
+    def text(self, pos: int) -> tuple[Optional[str], int]:
+        if not _ZERO <= self.data[pos] <= _NINE:
+            return None, self.skip(pos)
+        start, end = self.string_span(pos)
+        raw = self.view[start:end]
+        try:
+            return str(raw, "utf-8"), end
+        except UnicodeDecodeError:
+            return str(raw, "latin-1"), end
+
+    def integer(self, pos: int) -> tuple[Optional[int], int]:
+        if self.data[pos] != _INT:
+            return None, self.skip(pos)
+        end = self.data.index(b"e", pos)
+        return int(self.data[pos + 1:end]), end + 1
+
+    def skip(self, pos: int) -> int:
+        depth = 0
+        while True:
+            token = self.data[pos]
+            if token == _DICT or token == _LIST:
+                depth += 1
+                pos += 1
+            elif token == _END:
+                if depth == 0:
+                    raise BencodeError(f"unexpected end marker at {pos}")
+                depth -= 1
+                pos += 1
+            elif token == _INT:
+                pos = self.data.index(b"e", pos) + 1
+            elif _ZERO <= token <= _NINE:
+                pos = self.string_span(pos)[1]
+            else:
+                raise BencodeError(f"invalid token {chr(token)!r} at {pos}")
+            if depth == 0:
+                return pos
+
+    def dictionary(self, pos: int, handlers: Dict[bytes, Callable[[int], int]]) -> int:
+        if self.data[pos] != _DICT:
+            return self.skip(pos)
+        pos += 1
+        while self.data[pos] != _END:
+            key_start, key_end = self.string_span(pos)
+            handler = handlers.get(self.data[key_start:key_end])
+            pos = handler(key_end) if handler else self.skip(key_end)
+        return pos + 1
+
+    def items(self, pos: int, item: Callable[[int], int]) -> int:
+        if self.data[pos] != _LIST:
+            return self.skip(pos)
+        pos += 1
+        while self.data[pos] != _END:
+            pos = item(pos)
+        return pos + 1
+
+    def text_list(self, pos: int, into: List[str]) -> int:
+        def append(item_pos):
+            if self.data[item_pos] == _LIST:
+                # announce-list est une liste de tiers, parfois une liste plate
+                return self.text_list(item_pos, into)
+            value, end = self.text(item_pos)
+            if value:
+                into.append(value)
+            return end
+
+        return self.items(pos, append)
+
+
+def scan_torrent(data: bytes) -> TorrentMetadata:
+    """Extract the info hash, name, files and trackers of a .torrent file.
+
+    The info hash is the SHA-1 of the raw ``info`` dictionary bytes, so it is
+    correct even for torrents whose encoding is not canonical.
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    scanner = _Scanner(data)
+    metadata = TorrentMetadata()
+
+    def set_name(pos):
+        metadata.name, end = scanner.text(pos)
+        return end
+
+    def set_length(pos):
+        metadata.length, end = scanner.integer(pos)
+        return end
+
+    def add_file(pos):
+        entry = {"path": [], "length": 0}
+
+        def set_file_length(value_pos):
+            length, end = scanner.integer(value_pos)
+            entry["length"] = length or 0
+            return end
+
+        end = scanner.dictionary(pos, {
+            b"length": set_file_length,
+            b"path": lambda value_pos: scanner.text_list(value_pos, entry["path"]),
+        })
+        metadata.files.append(entry)
+        return end
+
+    def set_files(pos):
+        metadata.files = []
+        return scanner.items(pos, add_file)
+
+    def set_info(pos):
+        if data[pos] != _DICT:
+            raise BencodeError("the info of a torrent must be a bencoded dictionary")
+        end = scanner.dictionary(pos, {b"name": set_name, b"length": set_length, b"files": set_files})
+        metadata.info_hash = hashlib.sha1(scanner.view[pos:end]).hexdigest()
+        return end
+
+    def set_announce(pos):
+        if data[pos] == _LIST:
+            return scanner.text_list(pos, metadata.announce)
+        announce, end = scanner.text(pos)
+        if announce:
+            metadata.announce.append(announce)
+        return end
+
+    try:
+        if not data or data[0] != _DICT:
+            raise BencodeError("a .torrent file must be a bencoded dictionary")
+        scanner.dictionary(0, {
+            b"info": set_info,
+            b"announce": set_announce,
+            b"announce-list": lambda pos: scanner.text_list(pos, metadata.announce_list),
+        })
+    except (IndexError, ValueError) as e:
+        if isinstance(e, BencodeError):
+            raise
+        raise BencodeError(f"not a valid bencoded torrent: {e}") from e
+
+    if metadata.info_hash is None:
+        raise BencodeError("no info dictionary in torrent")
+    return metadata
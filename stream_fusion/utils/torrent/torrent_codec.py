@@ -0,0 +1,104 @@
+from typing import List, Optional
+
+import jsonpickle
+import orjson
+from RTN.models import ParsedData
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+MAGIC = b"SFTI"
+CODEC_VERSION = 1
+
+# Colonnes écrites par encode_items. L'en-tête contient leurs noms : une colonne
+# inconnue est ignorée au décodage et une colonne absente garde sa valeur par défaut.
+ITEM_FIELDS = (
+    "raw_title", "size", "magnet", "info_hash", "link", "seeders", "languages", "indexer",
+    "type", "privacy", "tmdb_id", "file_name", "file_entries", "torrent_download", "trackers",
+    "file_index", "full_index", "availability", "language_priority", "parsed_data",
+)
+INIT_FIELDS = (
+    "raw_title", "size", "magnet", "info_hash", "link", "seeders", "languages", "indexer",
+    "privacy", "type", "torrent_download", "tmdb_id",
+)
+
+
+def _parsed_data_row(item: TorrentItem) -> Optional[dict]:
+    parsed_data = item.parsed_data_if_loaded
+    if parsed_data is None:
+        return None
+    return parsed_data.model_dump() if isinstance(parsed_data, ParsedData) else parsed_data
+
+
+def encode_items(items: List[TorrentItem]) -> bytes:
+    """Serialise TorrentItems into the versioned columnar format read by decode_items."""
+    rows = []
+    for item in items:
+        row = []
+        for name in ITEM_FIELDS:
+            if name == "parsed_data":
+                row.append(_parsed_data_row(item))
+            elif name == "language_priority":
+                row.append(getattr(item, "language_priority", None))
+            else:
+                row.append(getattr(item, name))
+        rows.append(row)
+    return MAGIC + bytes([CODEC_VERSION]) + orjson.dumps({"fields": ITEM_FIELDS, "items": rows})
+
+
+def _construct_parsed_data(value: Optional[dict]) -> Optional[ParsedData]:
+    if not value:
+        return None
+    # Les données ont été validées à l'écriture : pas de nouvelle validation pydantic
+    known = ParsedData.model_fields
+    return ParsedData.model_construct(**{key: field for key, field in value.items() if key in known})
+
+
+def _decode_rows(payload: dict) -> List[TorrentItem]:
+    fields = payload["fields"]
+    init_positions = [(name, fields.index(name)) for name in INIT_FIELDS if name in fields]
+    other_positions = [
+        (name, position) for position, name in enumerate(fields)
+        if name in ITEM_FIELDS and name not in INIT_FIELDS
+    ]
+
+    items = []
+    for row in payload["items"]:
+        kwargs = dict.fromkeys(INIT_FIELDS)
+        kwargs.update((name, row[position]) for name, position in init_positions)
+        item = TorrentItem(**kwargs)
+        for name, position in other_positions:
+            value = row[position]
+            if name == "parsed_data":
+                item.parsed_data = _construct_parsed_data(value)
+            elif name == "language_priority":
+                if value is not None:
+                    item.language_priority = value
+            else:
+                setattr(item, name, value)
+        items.append(item)
+    return items
+
+
+def decode_items(data) -> Optional[List[TorrentItem]]:
+    """Rebuild the TorrentItems written by encode_items.
+
+    Lists written with jsonpickle and to_dict() before this codec existed are
+    still read. Returns None when the data cannot be decoded, so that callers
+    treat it as a cache miss.
+    """
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        if data[:len(MAGIC)] != MAGIC:
+            return [TorrentItem.from_dict(item) for item in jsonpickle.decode(data)]
+        version = data[len(MAGIC)]
+        if version > CODEC_VERSION:
+            logger.warning(f"TorrentCodec: Unsupported codec version {version}, ignoring cached items")
+            return None
+        return _decode_rows(orjson.loads(data[len(MAGIC) + 1:]))
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        logger.warning(f"TorrentCodec: Failed to decode cached items: {e}")
+        return None
@@ -0,0 +1,132 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+@dataclass
+class DownloadResult:
+    status: Optional[int] = None
+    content: Optional[bytes] = None
+    magnet: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None or self.magnet is not None
+
+
+class HostLimiter:
+    """Concurrency and politeness limits for a single host.
+
+    At most ``concurrency`` downloads run at once, and two downloads never start
+    less than ``interval`` seconds apart.
+    """
+
+    def __init__(self, concurrency: int, interval: float):
+        self.interval = interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                delay = self._next_start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = loop.time() + self.interval
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+
+class TorrentDownloader:
+    """Non-blocking .torrent downloads shared by every request of the worker.
+
+    Limits are kept per host so a slow tracker cannot starve the others, and
+    redirects are followed by hand because indexers often answer with a
+    redirect to a magnet link that aiohttp cannot follow.
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _host_settings(self, host: str) -> tuple[int, float]:
+        # Sharewood limite son API à une requête par seconde
+        if settings.sharewood_url and host == urlparse(settings.sharewood_url).netloc:
+            return 1, 1.0
+        if settings.yggflix_url and host == urlparse(settings.yggflix_url).netloc:
+            return settings.torrent_download_host_concurrency, 0.1
+        return settings.torrent_download_host_concurrency, 0.2
+
+    def _limiter(self, host: str) -> HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(*self._host_settings(host))
+            self._limiters[host] = limiter
+        return limiter
+
+    def _get_session(self, session: Optional[aiohttp.ClientSession]) -> aiohttp.ClientSession:
+        if session is not None and not session.closed:
+            return session
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def fetch(
+        self,
+        url: str,
+        timeout: float,
+        session: Optional[aiohttp.ClientSession] = None,
+        max_redirects: int = 5,
+    ) -> DownloadResult:
+        """Download url, following redirects until a torrent or a magnet link is found."""
+        client = self._get_session(session)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        for _ in range(max_redirects + 1):
+            async with self._limiter(urlparse(url).netloc):
+                try:
+                    async with client.get(url, allow_redirects=False, timeout=client_timeout) as response:
+                        if response.status in REDIRECT_STATUSES:
+                            location = response.headers.get("Location", "")
+                        elif response.status == 200:
+                            return DownloadResult(response.status, await response.read())
+                        else:
+                            return DownloadResult(response.status)
+                except asyncio.TimeoutError:
+                    logger.error(f"Timeout while processing url: {url}")
+                    return DownloadResult()
+                except aiohttp.ClientError as e:
+                    logger.error(f"Error while processing url: {url} ({str(e)})")
+                    return DownloadResult()
+
+            if location.startswith("magnet:"):
+                return DownloadResult(response.status, magnet=location)
+            if not location:
+                return DownloadResult(response.status)
+            url = urljoin(url, location)
+
+        logger.error(f"Too many redirects while processing url: {url}")
+        return DownloadResult()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+torrent_downloader = TorrentDownloader()
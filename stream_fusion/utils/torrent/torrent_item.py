@@ -1,17 +1,30 @@
-from RTN import parse
 from RTN.models import ParsedData
 from urllib.parse import quote
 
 from stream_fusion.utils.models.media import Media
 from stream_fusion.utils.models.series import Series
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.parser.title_cache import parse_title
 
 
 class TorrentItem:
+    # Des milliers d'items sont en mémoire pendant une recherche : pas de __dict__ par instance
+    __slots__ = (
+        "raw_title", "size", "magnet", "info_hash", "link", "seeders", "languages", "indexer",
+        "type", "privacy", "tmdb_id", "file_name", "_files", "torrent_download", "trackers",
+        "file_index", "_full_index", "availability", "language_priority", "torrent_file_path",
+        "_parsed_data", "_rank_key",
+    )
+
+    # Attributs publics, dans l'ordre de to_dict() (language_priority n'existe qu'une fois trié)
+    FIELDS = (
+        "raw_title", "size", "magnet", "info_hash", "link", "seeders", "languages", "indexer",
+        "type", "privacy", "tmdb_id", "file_name", "files", "torrent_download", "trackers",
+        "file_index", "full_index", "availability", "torrent_file_path", "parsed_data",
+    )
+
     def __init__(self, raw_title, size, magnet, info_hash, link, seeders, languages, indexer,
                  privacy, type=None, parsed_data=None, torrent_download=None, tmdb_id=None):
-        self.logger = logger
-
         self.raw_title = raw_title  # Raw title of the torrent
         self.size = size  # Size of the video file inside the torrent - it may be updated during __process_torrent()
         self.magnet = magnet  # Magnet to torrent
@@ -25,18 +38,72 @@ class TorrentItem:
         self.tmdb_id = tmdb_id  # TMDB ID for linking with metadata
 
         self.file_name = None  # it may be updated during __process_torrent()
-        self.files = None  # The files inside of the torrent. If it's None, it means that there is only one file inside of the torrent
+        self._files = None  # The files inside of the torrent. If it's None, it means that there is only one file inside of the torrent
         self.torrent_download = torrent_download  # The torrent jackett download url if its None, it means that there is only a magnet link provided by Jackett. It also means, that we cant do series file filtering before debrid.
         self.trackers = []  # Trackers of the torrent
         self.file_index = None  # Index of the file inside of the torrent - it may be updated durring __process_torrent() and update_availability(). If the index is None and torrent is not None, it means that the series episode is not inside of the torrent.
-        self.full_index = None  # Case where we cannot call RD to get the full index. Else None
+        self._full_index = None  # Case where we cannot call RD to get the full index. Else None
         self.availability = False  # If it's instantly available on the debrid service
+        self.torrent_file_path = None  # Location of the .torrent in the blob store
+
+        # Parsed on first access when not provided
+        self._parsed_data = parsed_data  # Ranked result
+        self._rank_key = None  # (signature, clé) posée par RankingEngine
+
+    @property
+    def parsed_data(self) -> ParsedData:
+        if self._parsed_data is None:
+            self._parsed_data = parse_title(self.raw_title)
+        return self._parsed_data
+
+    @parsed_data.setter
+    def parsed_data(self, value):
+        self._parsed_data = value
+
+    @property
+    def parsed_data_if_loaded(self):
+        """parsed_data without triggering a parse."""
+        return self._parsed_data
+
+    @property
+    def files(self):
+        if self._files is None:
+            return None
+        return [{"path": list(path), "length": length} for path, length in self._files]
 
-        # Ensure parsed_data is always set (parse if not provided)
-        if parsed_data is None:
-            from RTN import parse
-            parsed_data = parse(raw_title)
-        self.parsed_data: ParsedData = parsed_data  # Ranked result
+    @files.setter
+    def files(self, value):
+        # Gardés sous forme de tuples (chemin, taille), les dicts ne sont recréés qu'à la lecture
+        if value is None:
+            self._files = None
+        else:
+            self._files = tuple(
+                (tuple(entry.get("path") or ()), entry.get("length") or 0) for entry in value
+            )
+
+    @property
+    def file_entries(self):
+        """The files as stored, a tuple of (path, length) pairs."""
+        return self._files
+
+    @file_entries.setter
+    def file_entries(self, value):
+        self._files = tuple((tuple(path), length) for path, length in value) if value is not None else None
+
+    @property
+    def full_index(self):
+        return self._full_index
+
+    @full_index.setter
+    def full_index(self, value):
+        self._full_index = tuple(value) if value is not None else None
+
+    def attributes(self) -> dict:
+        """The public attributes of the item, as __dict__ returned them before __slots__."""
+        attributes = {name: getattr(self, name) for name in self.FIELDS}
+        if hasattr(self, "language_priority"):
+            attributes["language_priority"] = self.language_priority
+        return attributes
 
     def to_debrid_stream_query(self, media: Media) -> dict:
         return {
@@ -51,16 +118,14 @@ class TorrentItem:
         }
     
     def to_dict(self):
-        resolution = getattr(self.parsed_data, 'resolution', 'UNKNOWN') if self.parsed_data else 'NONE'
-        logger.debug(f"TorrentItem.to_dict(): '{self.raw_title[:60]}' → resolution='{resolution}' (caching)")
-
-        # Convert parsed_data to dict if it exists
+        # Convert parsed_data to dict if it exists (an unparsed title stays unparsed)
         parsed_data_dict = None
-        if self.parsed_data:
-            if isinstance(self.parsed_data, ParsedData):
-                parsed_data_dict = self.parsed_data.model_dump()
+        parsed_data = self.parsed_data_if_loaded
+        if parsed_data:
+            if isinstance(parsed_data, ParsedData):
+                parsed_data_dict = parsed_data.model_dump()
             else:
-                parsed_data_dict = self.parsed_data
+                parsed_data_dict = parsed_data
 
         return {
             'raw_title': self.raw_title,
@@ -79,8 +144,9 @@ class TorrentItem:
             'torrent_download': self.torrent_download,
             'trackers': self.trackers,
             'file_index': self.file_index,
-            'full_index': self.full_index,
+            'full_index': list(self.full_index) if self.full_index is not None else None,
             'availability': self.availability,
+            'language_priority': getattr(self, 'language_priority', None),
             'parsed_data': parsed_data_dict,
         }
     
@@ -111,28 +177,14 @@ class TorrentItem:
         instance.file_index = data['file_index']
         instance.full_index = data['full_index']
         instance.availability = data['availability']
+        if data.get('language_priority') is not None:
+            instance.language_priority = data['language_priority']
 
-        # Use cached parsed_data if available, otherwise parse raw_title
+        # Use cached parsed_data if available, otherwise parse raw_title on first access
         if data.get('parsed_data'):
             try:
-                # Try to reconstruct ParsedData from dict
-                reconstructed = ParsedData(**data['parsed_data'])
-                logger.debug(f"TorrentItem.from_dict(): Reconstructed ParsedData: {reconstructed}, resolution={getattr(reconstructed, 'resolution', 'UNKNOWN')}")
-                # Validate that reconstruction was successful (not an empty/default object)
-                if reconstructed is not None:
-                    instance.parsed_data = reconstructed
-                else:
-                    logger.warning(f"TorrentItem.from_dict(): Reconstructed ParsedData is None, will re-parse")
-                    instance.parsed_data = parse(instance.raw_title)
+                instance.parsed_data = ParsedData(**data['parsed_data'])
             except Exception as e:
                 logger.warning(f"Failed to reconstruct ParsedData from cache: {e}, will re-parse")
-                instance.parsed_data = parse(instance.raw_title)
-        else:
-            # Fallback to parsing if no cached parsed_data
-            logger.debug(f"TorrentItem.from_dict(): No parsed_data in cache dict, will parse")
-            instance.parsed_data = parse(instance.raw_title)
-
-        resolution = getattr(instance.parsed_data, 'resolution', 'UNKNOWN') if instance.parsed_data else 'NONE'
-        logger.debug(f"TorrentItem.from_dict(): '{instance.raw_title[:60]}' → resolution='{resolution}'")
 
         return instance
@@ -1,36 +1,33 @@
+import asyncio
 import hashlib
 import os
-import time
 import urllib.parse
 from typing import List
-import pathlib
 import json
 
-import bencodepy
-import requests
-from RTN import parse
+import aiohttp
 from RTN.models import ParsedData
 
 from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
+from stream_fusion.utils.blobstore import get_blob_store
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.sharewood.sharewood_result import SharewoodResult
 from stream_fusion.utils.zilean.zilean_result import ZileanResult
 from stream_fusion.utils.yggfilx.yggflix_result import YggflixResult
+from stream_fusion.utils.parser.title_cache import parse_title, title_cache
+from stream_fusion.utils.torrent.bencode_scanner import BencodeError, TorrentMetadata, scan_torrent
+from stream_fusion.utils.torrent.torrent_downloader import torrent_downloader
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.utils.general import get_info_hash_from_magnet
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
 class TorrentService:
-    TORRENT_CACHE_DIR = pathlib.Path("/var/cache/torrents")
-
-    def __init__(self, config, torrent_dao: TorrentItemDAO):
+    def __init__(self, config, torrent_dao: TorrentItemDAO, http_session: aiohttp.ClientSession = None):
         self.config = config
         self.torrent_dao = torrent_dao
         self.logger = logger
-        self.__session = requests.Session()
-        # Ensure cache directory exists
-        self.TORRENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.__http_session = http_session
 
     @staticmethod
     def __generate_unique_id(raw_title: str, indexer: str = "cached") -> str:
@@ -70,6 +67,23 @@ class TorrentService:
             else:
                 self.logger.error(f"TorrentService: Error caching torrent {unique_id}: {str(e)}")
 
+    async def cache_torrents(self, torrent_items: List[TorrentItem]):
+        """Store new torrents with a single INSERT ... ON CONFLICT DO NOTHING."""
+        rows = []
+        for torrent_item in torrent_items:
+            # C411/Torr9 sans tmdb_id → orphelins, jamais retrouvés → on skip
+            if torrent_item.indexer in ['C411 - API', 'Torr9 - API'] and not torrent_item.tmdb_id:
+                self.logger.debug(f"TorrentService: Skipping {torrent_item.indexer} torrent without tmdb_id: {torrent_item.raw_title}")
+                continue
+            rows.append((self.__generate_unique_id(torrent_item.raw_title, torrent_item.indexer), torrent_item))
+        if not rows:
+            return
+        try:
+            inserted = await self.torrent_dao.create_torrent_items(rows)
+            self.logger.debug(f"TorrentService: Cached {inserted} new torrents out of {len(rows)}")
+        except Exception as e:
+            self.logger.error(f"TorrentService: Error caching {len(rows)} torrents: {str(e)}")
+
     async def _update_cached_item(self, cached_item: TorrentItem, new_item: TorrentItem):
         """Update cached item with new data (tmdb_id, torrent_file_path) if available"""
         try:
@@ -103,161 +117,158 @@ class TorrentService:
             skip_yggflix_download: If True, don't download .torrent files from Yggflix (just update metadata)
                                   Used during search to avoid heavy downloads. Set to False for actual playback.
         """
-        torrent_items_result = []
-
-        for result in results:
-            torrent_item = result.convert_to_torrent_item()
-
-            cached_item = await self.get_cached_torrent(torrent_item.raw_title, torrent_item.indexer)
-            if cached_item:
+        torrent_items = [result.convert_to_torrent_item() for result in results]
+        unique_ids = [self.__generate_unique_id(item.raw_title, item.indexer) for item in torrent_items]
+        # Une seule requête pour tous les torrents déjà connus
+        try:
+            cached_models = await self.torrent_dao.get_torrent_items_by_ids(list(set(unique_ids)))
+        except Exception as e:
+            self.logger.error(f"Error getting cached torrents: {e}")
+            cached_models = {}
+
+        cached_items = {}
+        new_items = {}
+        for torrent_item, unique_id in zip(torrent_items, unique_ids):
+            cached_model = cached_models.get(unique_id)
+            if cached_model:
+                if unique_id not in cached_items:
+                    # to_torrent_item() automatically reprout parsed_data from raw_title
+                    cached_items[unique_id] = cached_model.to_torrent_item()
+                cached_item = cached_items[unique_id]
                 # Pour Yggflix: mettre à jour les seeders frais en mémoire (sans écriture DB)
                 if torrent_item.indexer == "Yggtorrent - API":
                     cached_item.seeders = torrent_item.seeders
                     self.logger.debug(f"Updated seeders in memory for {torrent_item.raw_title}: {torrent_item.seeders}")
-
                 # Don't update - causes DB contention with concurrent requests
                 # tmdb_id will only be set for NEW torrents, not existing ones
-                # await self._update_cached_item(cached_item, torrent_item)
-                torrent_items_result.append(cached_item)
-                continue
-
-            # If skip_yggflix_download is True and this is a Yggflix URL, just cache without downloading
-            if skip_yggflix_download and settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
-                # Don't process, just cache the raw item (without .torrent file and info_hash)
-                # The info_hash will be set to None, magnet will be empty
-                await self.cache_torrent(torrent_item)
-                torrent_items_result.append(torrent_item)
-                continue
-
-            if torrent_item.link.startswith("magnet:"):
-                processed_torrent_item = self.__process_magnet(torrent_item)
-            elif settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
-                processed_torrent_item = self.__process_sharewood_web_url(torrent_item)
-            elif settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
-                processed_torrent_item = self.__process_ygg_api_url(torrent_item)
             else:
-                processed_torrent_item = self.__process_web_url(torrent_item)
-
-            await self.cache_torrent(processed_torrent_item)
-            torrent_items_result.append(processed_torrent_item)
-
+                # Un torrent présent deux fois dans la réponse n'est traité qu'une fois
+                new_items.setdefault(unique_id, torrent_item)
+
+        # Les téléchargements se font en parallèle, limités par hôte dans le downloader
+        processed = await asyncio.gather(
+            *(self.__process_new_item(torrent_item, skip_yggflix_download) for torrent_item in new_items.values())
+        )
+        processed_items = dict(zip(new_items.keys(), processed))
+
+        torrent_items_result = [
+            cached_items[unique_id] if unique_id in cached_items else processed_items[unique_id]
+            for unique_id in unique_ids
+        ]
+        await self.cache_torrents(list(processed_items.values()))
         return torrent_items_result
         
-    def __process_sharewood_web_url(self, result: TorrentItem):
+    async def __process_new_item(self, torrent_item: TorrentItem, skip_yggflix_download: bool) -> TorrentItem:
+        # If skip_yggflix_download is True and this is a Yggflix URL, just cache without downloading
+        if skip_yggflix_download and settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
+            # Don't process, just cache the raw item (without .torrent file and info_hash)
+            # The info_hash will be set to None, magnet will be empty
+            return torrent_item
+        if torrent_item.link.startswith("magnet:"):
+            return self.__process_magnet(torrent_item)
+        if settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
+            return await self.__process_sharewood_web_url(torrent_item)
+        if settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
+            return await self.__process_ygg_api_url(torrent_item)
+        return await self.__process_web_url(torrent_item)
+
+    async def __process_sharewood_web_url(self, result: TorrentItem):
         if not self.config["sharewood"]:
             logger.error("Sharewood is not enabled in the config. Skipping processing of Sharewood URL.")
-        
-        try:
-            time.sleep(1) # API limit 1 request per second
-            response = self.__session.get(result.link, allow_redirects=True, timeout=5)
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
-            self.logger.error(f"Timeout while processing url: {result.link}")
-            return result
-        
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        else:
-            self.logger.error(f"Error code {response.status_code} while processing sharewood url: {result.link}")
+
+        # API limit 1 request per second, enforced by the downloader
+        response = await torrent_downloader.fetch(result.link, timeout=5, session=self.__http_session)
+        if response.content is not None:
+            return await self.__process_torrent_file(result, response.content)
+        elif response.magnet is not None:
+            result.magnet = response.magnet
+            return self.__process_magnet(result)
+        elif response.status is not None:
+            self.logger.error(f"Error code {response.status} while processing sharewood url: {result.link}")
 
         return result
 
 
-    def __process_ygg_api_url(self, result: TorrentItem): 
+    async def __process_ygg_api_url(self, result: TorrentItem):
         if not self.config["yggflix"]:
             logger.error("Yggflix is not enabled in the config. Skipping processing of Yggflix URL.")
-        try:
-            response = self.__session.get(result.link, timeout=10)
-            time.sleep(0.1) # Add a delay of 0.1 seconds between requests faire usage for small VPS
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
-            self.logger.error(f"Timeout while processing url: {result.link}")
-            return result
-        
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 422:
+
+        response = await torrent_downloader.fetch(result.link, timeout=10, session=self.__http_session)
+        if response.content is not None:
+            return await self.__process_torrent_file(result, response.content)
+        elif response.status == 422:
             self.logger.info(f"Not aviable torrent on yggflix: {result.file_name}")
-        else:
-            self.logger.error(f"Error code {response.status_code} while processing ygg url: {result.link}")
+        elif response.status is not None:
+            self.logger.error(f"Error code {response.status} while processing ygg url: {result.link}")
 
         return result
 
-    def __process_web_url(self, result: TorrentItem):
-        try:
-            time.sleep(0.2)
-            response = self.__session.get(result.link, allow_redirects=False, timeout=40) # flaresolverr and Jackett timeouts
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
-            self.logger.error(f"Timeout while processing url: {result.link}")
-            return result
-
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 302:
-            result.magnet = response.headers['Location']
+    async def __process_web_url(self, result: TorrentItem):
+        # flaresolverr and Jackett timeouts
+        response = await torrent_downloader.fetch(result.link, timeout=40, session=self.__http_session)
+        if response.content is not None:
+            return await self.__process_torrent_file(result, response.content)
+        elif response.magnet is not None:
+            result.magnet = response.magnet
             return self.__process_magnet(result)
-        else:
-            self.logger.error(f"Error code {response.status_code} while processing url: {result.link}")
+        elif response.status is not None:
+            self.logger.error(f"Error code {response.status} while processing url: {result.link}")
 
         return result
 
-    def __process_torrent(self, result: TorrentItem, torrent_file):
+    async def __process_torrent_file(self, result: TorrentItem, torrent_file: bytes):
         try:
-            metadata = bencodepy.decode(torrent_file)
-        except Exception as e:
-            try:
-                from bencodepy import Decoder
-                decoder = Decoder(encoding='latin-1')
-                metadata = decoder.decode(torrent_file)
-            except Exception as inner_e:
-                logger.error(f"Impossible de décoder le fichier torrent: {str(e)} puis {str(inner_e)}")
-                result.torrent_download = result.link
-                result.trackers = []
-                result.info_hash = ""
-                result.magnet = ""
-                return result
+            # Seuls les champs utilisés sont décodés, l'info hash est calculé sur les octets bruts
+            metadata = scan_torrent(torrent_file)
+        except BencodeError as e:
+            logger.error(f"Impossible de décoder le fichier torrent: {str(e)}")
+            result.torrent_download = result.link
+            result.trackers = []
+            result.info_hash = ""
+            result.magnet = ""
+            result.torrent_file_path = None
+            return result
 
-        result.torrent_download = result.link
-        # Save .torrent file to disk instead of PostgreSQL
+        if result.type == "series" and metadata.files:
+            # Les noms de fichiers déjà analysés par un autre worker sont chargés en une fois
+            await title_cache.warm(name for entry in metadata.files for name in entry["path"])
+        result = self.__process_torrent(result, metadata)
+        result.torrent_file_path = None
+        if not result.info_hash:
+            return result
+        # Stockage par info hash, partagé entre les nœuds avec le backend S3
+        blob_store = get_blob_store()
         try:
-            # Use info_hash as filename if available, otherwise generate one
-            filename = f"{result.info_hash if result.info_hash else hashlib.sha256(torrent_file).hexdigest()}.torrent"
-            filepath = self.TORRENT_CACHE_DIR / filename
-            with open(filepath, 'wb') as f:
-                f.write(torrent_file)
-            result.torrent_file_path = str(filepath)
-            self.logger.debug(f"Saved .torrent to disk: {filepath}")
+            await blob_store.put(result.info_hash, torrent_file)
+            result.torrent_file_path = blob_store.location(result.info_hash)
+            self.logger.debug(f"Stored .torrent in blob store: {result.torrent_file_path}")
         except Exception as e:
-            self.logger.error(f"Error saving .torrent to disk: {e}")
-            result.torrent_file_path = None
+            self.logger.error(f"Error storing .torrent in blob store: {e}")
+        return result
+
+    def __process_torrent(self, result: TorrentItem, metadata: TorrentMetadata):
+        result.torrent_download = result.link
 
         try:
-            result.trackers = self.__get_trackers_from_torrent(metadata)
-            result.info_hash = self.__convert_torrent_to_hash(metadata["info"])
-            result.magnet = self.__build_magnet(result.info_hash, metadata["info"]["name"], result.trackers)
+            result.trackers = metadata.trackers
+            result.info_hash = metadata.info_hash
+            result.magnet = self.__build_magnet(result.info_hash, metadata.name, result.trackers)
         except Exception as e:
             logger.error(f"Erreur lors du traitement des métadonnées du torrent: {str(e)}")
             result.trackers = []
             result.info_hash = ""
             result.magnet = ""
 
-        if "files" not in metadata["info"]:
+        if metadata.files is None:
             result.file_index = 1
             return result
 
-        result.files = metadata["info"]["files"]
+        result.files = metadata.files
 
         if result.type == "series":
             # Ensure we have parsed_data from raw_title
             if not result.parsed_data:
-                result.parsed_data = parse(result.raw_title)
+                result.parsed_data = parse_title(result.raw_title)
 
             # Only try to find episode file if we have valid parsed_data
             if result.parsed_data and isinstance(result.parsed_data, ParsedData):
@@ -292,11 +303,6 @@ class TorrentService:
 
         return result
 
-    def __convert_torrent_to_hash(self, torrent_contents):
-        hashcontents = bencodepy.encode(torrent_contents)
-        hexHash = hashlib.sha1(hashcontents).hexdigest()
-        return hexHash.lower()
-
     def __build_magnet(self, hash, display_name, trackers):
         magnet_base = "magnet:?xt=urn:btih:"
         magnet = f"{magnet_base}{hash}&dn={display_name}"
@@ -306,28 +312,6 @@ class TorrentService:
 
         return magnet
 
-    def __get_trackers_from_torrent(self, torrent_metadata):
-        # Sometimes list, sometimes string
-        announce = torrent_metadata["announce"] if "announce" in torrent_metadata else []
-        # Sometimes 2D array, sometimes 1D array
-        announce_list = torrent_metadata["announce-list"] if "announce-list" in torrent_metadata else []
-
-        trackers = set()
-        if isinstance(announce, str):
-            trackers.add(announce)
-        elif isinstance(announce, list):
-            for tracker in announce:
-                trackers.add(tracker)
-
-        for announce_list_item in announce_list:
-            if isinstance(announce_list_item, list):
-                for tracker in announce_list_item:
-                    trackers.add(tracker)
-            if isinstance(announce_list_item, str):
-                trackers.add(announce_list_item)
-
-        return list(trackers)
-
     def __get_trackers_from_magnet(self, magnet: str):
         url_parts = urllib.parse.urlparse(magnet)
         query_parts = urllib.parse.parse_qs(url_parts.query)
@@ -349,7 +333,7 @@ class TorrentService:
         for files in file_structure:
             for file in files["path"]:
 
-                parsed_file = parse(file)
+                parsed_file = parse_title(file)
 
                 if season[0] in parsed_file.seasons and episode[0] in parsed_file.episodes:
                     episode_files.append({
@@ -386,7 +370,7 @@ class TorrentService:
             _, file_extension = os.path.splitext(file_name.lower())
             
             if file_extension in video_formats:
-                parsed_file = parse(file_name)
+                parsed_file = parse_title(file_name)
                 if len(parsed_file.seasons) == 0 or len(parsed_file.episodes) == 0:
                     self.logger.debug(f"Skipping file without season or episode parsed: {file_name}")
                     continue
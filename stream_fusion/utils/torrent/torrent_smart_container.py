@@ -2,7 +2,6 @@ import os
 import threading
 
 from typing import List, Dict
-from RTN import parse
 
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
 from stream_fusion.utils.debrid.premiumize import Premiumize
@@ -12,8 +11,12 @@ from stream_fusion.utils.debrid.stremthru import StremThru
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.utils.cache.cache import cache_public
 from stream_fusion.utils.general import season_episode_in_filename
+from stream_fusion.utils.parser.title_cache import parse_title
 from stream_fusion.logging_config import logger
 
+# Champs d'un TorrentItem écrits par update_availability, aussi gardés dans l'overlay de disponibilité
+AVAILABILITY_STATE_FIELDS = ("availability", "file_index", "file_name", "size", "raw_title")
+
 
 class TorrentSmartContainer:
     def __init__(self, torrent_items: List[TorrentItem], media):
@@ -120,8 +123,7 @@ class TorrentSmartContainer:
                 self.logger.debug(
                     f"TorrentSmartContainer.get_best_matching: Item '{item.raw_title[:60]}' missing parsed_data, parsing now"
                 )
-                from RTN import parse
-                item.parsed_data = parse(item.raw_title)
+                item.parsed_data = parse_title(item.raw_title)
 
         self.logger.success(
             f"TorrentSmartContainer: Found {len(best_matching)} best matching items"
@@ -237,6 +239,29 @@ class TorrentSmartContainer:
                 f"TorrentSmartContainer: Debrid type {debrid_type.__name__} not implemented"
             )
 
+    def merge_availability(self, responses, media):
+        """Apply the responses of several debrid services, in service order.
+
+        An item keeps the file details of the first service that has it
+        cached, as when the services were queried one after another.
+        """
+        for debrid_type, debrid_response in responses:
+            claimed = {
+                info_hash: {field: getattr(item, field) for field in AVAILABILITY_STATE_FIELDS}
+                for info_hash, item in self.__itemsDict.items()
+                if item.availability
+            }
+            try:
+                self.update_availability(debrid_response, debrid_type, media)
+            except Exception as e:
+                # Une réponse inattendue d'un service ne doit pas priver l'utilisateur des autres
+                self.logger.error(
+                    f"TorrentSmartContainer: Failed to apply {debrid_type.__name__} availability", exc_info=e
+                )
+            for info_hash, state in claimed.items():
+                for field, value in state.items():
+                    setattr(self.__itemsDict[info_hash], field, value)
+
     def _update_availability_realdebrid(self, response, media):
         self.logger.info("TorrentSmartContainer: Updating availability for RealDebrid")
         for info_hash, details in response.items():
@@ -399,7 +424,7 @@ class TorrentSmartContainer:
                     if is_available:
                         if item.type == "series":
                             # Pour les séries, vérifier si le fichier sélectionné correspond à l'épisode
-                            if "full_index" in item.__dict__ and item.full_index:
+                            if item.full_index:
                                 # Si nous avons l'index complet des fichiers, l'utiliser
                                 matching_files = []
                                 for file_info in item.full_index:
@@ -617,7 +642,7 @@ class TorrentSmartContainer:
                         file["e"], files, file_index, type, media
                     )
                     continue
-                parsed_file = parse(file["n"])
+                parsed_file = parse_title(file["n"])
                 clean_season = media.season.replace("S", "")
                 clean_episode = media.episode.replace("E", "")
                 numeric_season = int(clean_season)
@@ -1,8 +1,7 @@
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import parse_title
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
-from stream_fusion.utils.detection import detect_languages
 
 
 class YggflixResult:
@@ -22,7 +21,7 @@ class YggflixResult:
         self.parsed_data = None
 
     def convert_to_torrent_item(self):
-        parsed_data = self.parsed_data or parse(self.raw_title)
+        parsed_data = self.parsed_data or parse_title(self.raw_title)
         logger.debug(f"YggflixResult.convert_to_torrent_item(): '{self.raw_title[:60]}' → resolution='{getattr(parsed_data, 'resolution', 'UNKNOWN')}'")
         return TorrentItem(
             raw_title=self.raw_title,
@@ -1,10 +1,9 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Union
 from urllib.parse import quote
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title
 
 from stream_fusion.logging_config import logger
-from stream_fusion.utils.detection import detect_languages
 from stream_fusion.utils.yggfilx.yggflix_result import YggflixResult
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -109,9 +108,9 @@ class YggflixService:
                 item.indexer = "Yggtorrent - API"
                 item.seeders = result.get("seeders", 0)
                 item.privacy = "private"
-                item.languages = detect_languages(item.raw_title, default_language="fr")
+                item.languages = analyze_title(item.raw_title).detected_languages("fr")
                 item.type = media.type
-                item.parsed_data = parse(item.raw_title)
+                item.parsed_data = parse_title(item.raw_title)
                 item.tmdb_id = media.tmdb_id
                 items.append(item)
                 logger.trace(f"Yggflix result: {item}")
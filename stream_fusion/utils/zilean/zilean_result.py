@@ -1,8 +1,7 @@
-from RTN import parse
+from stream_fusion.utils.parser.title_cache import analyze_title, parse_title
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
-from stream_fusion.utils.detection import detect_languages
 from stream_fusion.utils.zilean.zilean_api import DMMTorrentInfo
 
 
@@ -47,13 +46,13 @@ class ZileanResult:
         if len(self.info_hash) != 40:
             raise ValueError(f"The hash '{self.info_hash}' does not have the expected length of 40 characters.")
 
-        parsed_result = parse(api_cached_item.raw_title)
+        parsed_result = parse_title(api_cached_item.raw_title)
 
         self.raw_title = parsed_result.raw_title
         self.indexer = "DMM - API"
         self.magnet = "magnet:?xt=urn:btih:" + self.info_hash
         self.link = self.magnet
-        self.languages = detect_languages(self.raw_title)
+        self.languages = analyze_title(self.raw_title).detected_languages()
         self.seeders = 0
         self.size = api_cached_item.size
         self.type = media.type
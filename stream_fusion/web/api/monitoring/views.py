@@ -1,4 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from stream_fusion.services.redis.redis_config import get_background_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.low_yield import LowYieldTracker
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.security import secret_based_security
 
 router = APIRouter()
 
@@ -10,3 +16,41 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(secret_based_security)],
+    include_in_schema=settings.security_hide_docs,
+)
+async def get_metrics() -> dict:
+    """
+    Returns the counters aggregated across all workers.
+    """
+    return await metrics.snapshot()
+
+
+@router.get(
+    "/low-yield",
+    dependencies=[Depends(secret_based_security)],
+    include_in_schema=settings.security_hide_docs,
+)
+async def list_low_yield_media(media_id: str = "") -> list:
+    """
+    Lists the media whose searches are backed off for returning too few results.
+    """
+    return await LowYieldTracker(get_background_redis_cache()).list_records(media_id)
+
+
+@router.post(
+    "/low-yield/{media_id}/refresh",
+    dependencies=[Depends(secret_based_security)],
+    include_in_schema=settings.security_hide_docs,
+)
+async def force_low_yield_refresh(media_id: str) -> dict:
+    """
+    Clears the backoff and cached results of a media (or all episodes of a series),
+    so its next request runs a full search.
+    """
+    refreshed = await LowYieldTracker(get_background_redis_cache()).force_refresh(media_id)
+    return {"refreshed": refreshed}
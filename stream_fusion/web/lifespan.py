@@ -1,3 +1,6 @@
+import asyncio
+import contextlib
+
 import aiohttp
 
 from yarl import URL
@@ -12,6 +15,16 @@ from stream_fusion.logging_config import configure_logging
 from stream_fusion.services.postgresql.base import Base
 from stream_fusion.services.postgresql.models import load_all_models
 from stream_fusion.settings import settings
+from stream_fusion.utils.blobstore import get_blob_store
+from stream_fusion.utils.debrid.availability_cache import availability_cache
+from stream_fusion.utils.debrid.client_registry import debrid_clients
+from stream_fusion.utils.filter.batch_filter import filter_pool
+from stream_fusion.utils.filter.title_matcher import title_match_cache
+from stream_fusion.utils.metrics import metrics
+from stream_fusion.utils.parser.title_cache import title_cache
+from stream_fusion.utils.prefetch.scheduler import PrefetchScheduler
+from stream_fusion.utils.rate_limiter import rate_limiter
+from stream_fusion.utils.torrent.torrent_downloader import torrent_downloader
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -72,9 +85,38 @@ async def lifespan_setup(
         host=settings.redis_host, port=settings.redis_port, db=settings.redis_db, max_connections=200
     )
 
+    app.state.metrics_flusher = asyncio.create_task(metrics.run_flusher())
+    app.state.title_cache_flusher = asyncio.create_task(title_cache.run_flusher())
+    app.state.title_match_flusher = asyncio.create_task(title_match_cache.run_flusher())
+    app.state.debrid_client_evictor = asyncio.create_task(debrid_clients.run_evictor())
+    app.state.prefetch_scheduler = PrefetchScheduler()
+    app.state.prefetch_scheduler.start()
+
     yield
 
     # Shutdown actions
+    await app.state.prefetch_scheduler.stop()
+    app.state.metrics_flusher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.metrics_flusher
+    await metrics.close()
+    app.state.title_cache_flusher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.title_cache_flusher
+    await title_cache.close()
+    app.state.title_match_flusher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.title_match_flusher
+    await title_match_cache.close()
+    app.state.debrid_client_evictor.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.debrid_client_evictor
+    await debrid_clients.close()
+    await availability_cache.close()
+    await rate_limiter.close()
+    await torrent_downloader.close()
+    filter_pool.close()
+    await get_blob_store().close()
     if app.state.http_session:
         await app.state.http_session.close()
     if app.state.debrid_session:
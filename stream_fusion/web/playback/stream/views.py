@@ -23,6 +23,7 @@ from stream_fusion.utils.debrid.torbox import Torbox
 from stream_fusion.utils.debrid.debrid_exceptions import DebridError
 from stream_fusion.utils.debrid.status_video import build_status_video_response, get_status_video_url
 from stream_fusion.utils.parse_config import parse_config
+from stream_fusion.utils.prefetch.lookahead import record_playback
 from stream_fusion.utils.string_encoding import decodeb64
 from stream_fusion.utils.security import check_api_key
 from stream_fusion.web.playback.stream.schemas import (
@@ -297,6 +298,8 @@ async def get_stream_link(
             "indexer": query.get("indexer", "")
         }
         await redis_cache.set(current_source_key, source_info, expiration=1200)
+        if stream_id and query.get("type") == "series":
+            await record_playback(redis_cache, cache_user_identifier, stream_id, service)
         logger.debug(f"Playback: Stored current source for binge group: {magnet[:50] if magnet else info_hash}")
 
     cached_link = await redis_cache.get(cache_key)